@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 访问者分派微基准 / Visitor Dispatch Microbenchmark
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+"""
+Measure the per-node cost of `Interpreter.visit` dispatch.
+测量 `Interpreter.visit` 每个节点的分派开销。
+
+"before" is the original `getattr(self, 'visit_' + type(node).__name__)`
+lookup, "after" is the precomputed dispatch table. Both run the same program
+on the tree-walking engine, and the raw lookups are also timed on their own.
+“before” 是原来的 `getattr(self, 'visit_' + type(node).__name__)` 查找，
+“after” 是预先计算的分派表。两者都在语法树遍历引擎上运行同一个程序，并单独计时原始查找。
+
+Usage / 用法:
+    python benchmarks/bench_dispatch.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+from src.ast import AST
+from src.config import Config
+
+PROGRAM = """
+func fib(n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+var total = 0;
+for (var i = 0; i < 2000; i = i + 1) {
+    total = total + i * 2 - i / 2;
+}
+fib(16);
+"""
+
+
+class GetattrInterpreter(Interpreter):
+    """Interpreter with the original string-building dispatch / 使用原始字符串拼接分派的解释器"""
+
+    def visit(self, node):
+        method_name = 'visit_' + type(node).__name__
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+
+class CountingInterpreter(Interpreter):
+    """Count visited nodes through an instrumented table / 通过插桩的分派表统计访问的节点"""
+
+    def __init__(self, engine='tree'):
+        super().__init__(engine=engine)
+        self.count = 0
+
+    def visit(self, node):
+        self.count += 1
+        return self.dispatch[node.__class__](node)
+
+
+def parse(source):
+    return Parser(Lexer(source)).parse()
+
+
+def run(interpreter_class, repeat):
+    """Best wall time of `repeat` runs / `repeat` 次运行中的最佳耗时"""
+    best = None
+    for _ in range(repeat):
+        interpreter = interpreter_class(engine='tree')
+        tree = parse(PROGRAM)
+        start = time.perf_counter()
+        interpreter.execute(tree)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def collect(node, nodes):
+    """All nodes of a tree / 语法树中的所有节点"""
+    nodes.append(node)
+    for value in vars(node).values():
+        children = value if isinstance(value, list) else [value]
+        for child in children:
+            if isinstance(child, AST):
+                collect(child, nodes)
+    return nodes
+
+
+def lookups(nodes, repeat):
+    """Time the bare handler lookups / 计时单纯的处理方法查找"""
+    interpreter = Interpreter(engine='tree')
+    dispatch = interpreter.dispatch
+    generic = interpreter.generic_visit
+    rounds = 200
+
+    def legacy():
+        for node in nodes:
+            getattr(interpreter, 'visit_' + type(node).__name__, generic)
+
+    def table():
+        for node in nodes:
+            dispatch[node.__class__]
+
+    results = []
+    for lookup in (legacy, table):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                lookup()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results.append(best / (rounds * len(nodes)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evil Lang visitor dispatch microbenchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    # Measure the tree walker alone, without promoting hot code / 只测量语法树遍历器，不提升热点代码
+    Config.TIERED_EXECUTION = False
+
+    counter = CountingInterpreter()
+    counter.execute(parse(PROGRAM))
+    visits = counter.count
+
+    before = run(GetattrInterpreter, args.repeat)
+    after = run(Interpreter, args.repeat)
+    print(f"Program: {visits} node visits")
+    print(f"  getattr dispatch : {before * 1000:8.2f} ms  ({before / visits * 1e9:6.1f} ns/visit)")
+    print(f"  dispatch table   : {after * 1000:8.2f} ms  ({after / visits * 1e9:6.1f} ns/visit)")
+    print(f"  saved per visit  : {(before - after) / visits * 1e9:6.1f} ns")
+
+    legacy, table = lookups(collect(parse(PROGRAM), []), args.repeat)
+    print("Handler lookup only:")
+    print(f"  getattr dispatch : {legacy * 1e9:6.1f} ns/node")
+    print(f"  dispatch table   : {table * 1e9:6.1f} ns/node")
+
+
+if __name__ == '__main__':
+    main()
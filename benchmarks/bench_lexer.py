@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 词法分析基准 / Lexer Benchmark
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+"""
+Measure tokenization speed on a large generated source, the memory held by
+the tokens of a large data literal, and how the symbol table shares
+identifier and string values.
+测量在大型生成源码上的标记化速度、大型数据字面量的标记占用的内存，以及符号表对标识符和字符串值的共享。
+
+The source repeats a block of declarations, loops, strings with escapes and
+comments until it reaches the requested size. It is tokenized through the
+`Lexer` wrapper, one `get_next_token` call at a time as the parser does, and
+in bulk with `tokenize`.
+源码重复一段包含声明、循环、带转义的字符串和注释的代码，直到达到指定大小。分别通过 `Lexer`
+包装器（像解析器一样每次调用一次 `get_next_token`）和 `tokenize` 批量进行标记化。
+
+For memory, "before" is one Token object with a `__dict__` per lexeme, as
+the lexer used to create, "after" is the packed `TokenBuffer`.
+内存方面，“before” 是每个词素一个带 `__dict__` 的Token对象（原来词法分析器的做法），
+“after” 是紧凑的 `TokenBuffer`。
+
+For sharing, the identifier and string values of the generated source are
+counted as distinct objects, and dict lookups with them are timed against
+lookups with fresh copies of the same texts, as unshared values would be.
+共享方面，统计生成源码中标识符和字符串值的不同对象数，并将用它们进行的字典查找与使用相同文本的
+新副本（即未共享的值）进行的查找计时比较。
+
+Usage / 用法:
+    python benchmarks/bench_lexer.py [--size MB] [--repeat N] [--items N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.lexer import Lexer, TokenBuffer, TokenType, TOKEN_TYPES, tokenize
+
+BLOCK = """
+// 计算总和 Compute a running total
+func accumulate_%d(values, scale) {
+    var total = 0;
+    for (var i = 0; i < values.length; i++) {
+        total += values[i] * scale;
+    }
+    return total >= 100 && total != 42 ? total : -1;
+}
+var message_%d = "line one\\nline two \\"quoted\\" 中文";
+var result_%d = accumulate_%d([1, 2, 3.5, 40], 2);
+"""
+
+
+class DictToken:
+    """The original Token, with a per-object `__dict__` / 原来带 `__dict__` 的Token"""
+
+    def __init__(self, token_type, value, line, column):
+        self.type = token_type
+        self.value = value
+        self.line = line
+        self.column = column
+
+
+def data_literal(count):
+    """A declaration of an array with `count` numbers and strings / 含 `count` 个数字和字符串的数组声明"""
+    items = ', '.join(f'{i * 7}, "item {i}"' for i in range(count // 2))
+    return f"var data = [{items}];\n"
+
+
+def token_memory(source):
+    """Bytes held by Token objects and by the packed buffer / Token对象和紧凑缓冲区占用的字节数"""
+    buffer = TokenBuffer(source)
+    tracemalloc.start()
+    tokens = []
+    for index in range(len(buffer)):
+        token = buffer.token(index)
+        tokens.append(DictToken(token.type, token.value, token.line, token.column))
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tokens
+
+    tracemalloc.start()
+    buffer = TokenBuffer(source)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(buffer), before, after
+
+
+def shared_values(source):
+    """Identifier and string values of a source, as the parser gets them / 解析器得到的源码标识符和字符串值"""
+    buffer = TokenBuffer(source)
+    return [buffer.value(index) for index in range(len(buffer))
+            if TOKEN_TYPES[buffer.types[index]] in (TokenType.IDENTIFIER, TokenType.STRING)]
+
+
+def lookups(keys, table, repeat):
+    """Best time to look every key up in a dict / 在字典中查找所有键的最佳耗时"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for key in keys:
+            table[key]
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def generate(size):
+    """Source of about `size` characters / 约 `size` 个字符的源码"""
+    parts = []
+    length = 0
+    number = 0
+    while length < size:
+        part = BLOCK % (number, number, number, number)
+        parts.append(part)
+        length += len(part)
+        number += 1
+    return ''.join(parts)
+
+
+def lex(source):
+    """Pull every token through the Lexer wrapper / 通过Lexer包装器取出所有标记"""
+    lexer = Lexer(source)
+    count = 1
+    while lexer.get_next_token().type is not TokenType.EOF:
+        count += 1
+    return count
+
+
+def best(fn, source, repeat):
+    """Best wall time of `repeat` runs and the token count / `repeat` 次运行中的最佳耗时及标记数"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(source)
+        times.append(time.perf_counter() - start)
+    count = result if isinstance(result, int) else len(result)
+    return min(times), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lexer benchmark')
+    parser.add_argument('--size', type=float, default=2.0, help='source size in MB (default: 2)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement (default: 3)')
+    parser.add_argument('--items', type=int, default=50000, help='elements of the data literal (default: 50000)')
+    args = parser.parse_args()
+
+    source = generate(int(args.size * 1_000_000))
+    print(f"source: {len(source) / 1_000_000:.1f} MB, best of {args.repeat}:")
+    for name, fn in (('Lexer.get_next_token', lex), ('tokenize', tokenize)):
+        elapsed, count = best(fn, source, args.repeat)
+        print(f"  {name:22} {elapsed * 1000:8.1f} ms  {count / elapsed / 1e6:5.2f} M tokens/s")
+
+    count, before, after = token_memory(data_literal(args.items))
+    print(f"memory for the {count} tokens of a data literal with {args.items} elements:")
+    print(f"  before (Token objects): {before / count:8.1f} bytes/token")
+    print(f"  after  (TokenBuffer):   {after / count:8.1f} bytes/token")
+    print(f"  saved: {100 * (before - after) / before:.1f}%")
+
+    values = shared_values(source)
+    table = {value: None for value in values}
+    copies = [''.join(list(value)) for value in values]  # 相同文本的新副本 Fresh copies of the texts
+    shared = lookups(values, table, args.repeat)
+    unshared = lookups(copies, table, args.repeat)
+    print(f"identifier and string values: {len(values)} occurrences, {len({id(v) for v in values})} distinct objects")
+    print(f"  dict lookups: {shared * 1000:.1f} ms shared, {unshared * 1000:.1f} ms with fresh copies")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 对象内存与属性访问基准 / Object Memory and Property Access Benchmark
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+"""
+Measure the memory held by instances and the cost of property access.
+测量实例占用的内存和属性访问的开销。
+
+"before" is the original instance layout, a per-instance `fields` dict,
+"after" is the shape-based layout where instances of a class share one
+field layout and store their values in a list. A program that creates many
+objects of the same class is also timed on every engine.
+“before” 是原来的实例布局（每个实例一个 `fields` 字典），“after” 是基于布局（Shape）的实现：
+同类实例共享字段布局，值存放在列表中。另外在每个引擎上计时一个创建大量同类对象的程序。
+
+Usage / 用法:
+    python benchmarks/bench_objects.py [--count N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+from src.class_system import EvilClass, EvilInstance
+
+PROGRAM = """
+class Particle {
+    constructor(x, y) {
+        this.x = x;
+        this.y = y;
+        this.vx = 1;
+        this.vy = 2;
+    }
+    step() {
+        this.x = this.x + this.vx;
+        this.y = this.y + this.vy;
+        return this.x + this.y;
+    }
+}
+
+var particles = [];
+var total = 0;
+for (var i = 0; i < %d; i = i + 1) {
+    var p = new Particle(i, i);
+    particles[i] = p;
+    total = total + p.step();
+}
+var result = total;
+"""
+
+FIELDS = ('x', 'y', 'vx', 'vy')
+
+
+class DictInstance:
+    """The original dict-backed instance / 原来基于字典的实例"""
+
+    def __init__(self, evil_class):
+        self.evil_class = evil_class
+        self.fields = {}
+
+    def set(self, name, value):
+        self.fields[name] = value
+
+
+def allocated(instance_class, count):
+    """Bytes held by `count` instances with four fields / `count` 个四字段实例占用的字节数"""
+    evil_class = EvilClass('Particle')
+    tracemalloc.start()
+    instances = []
+    for i in range(count):
+        instance = instance_class(evil_class)
+        for name in FIELDS:
+            instance.set(name, i)
+        instances.append(instance)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def run(engine, count, repeat):
+    """Best wall time of `repeat` runs / `repeat` 次运行中的最佳耗时"""
+    best = None
+    for _ in range(repeat):
+        interpreter = Interpreter(engine=engine)
+        tree = Parser(Lexer(PROGRAM % count)).parse()
+        start = time.perf_counter()
+        interpreter.interpret(tree)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Object memory and property access benchmark')
+    parser.add_argument('--count', type=int, default=20000, help='number of objects (default: 20000)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per engine (default: 3)')
+    args = parser.parse_args()
+
+    before = allocated(DictInstance, args.count)
+    after = allocated(EvilInstance, args.count)
+    print(f"memory for {args.count} instances with {len(FIELDS)} fields:")
+    print(f"  before (dict per instance): {before / args.count:8.1f} bytes/instance")
+    print(f"  after  (shared shapes):     {after / args.count:8.1f} bytes/instance")
+    print(f"  saved: {100 * (before - after) / before:.1f}%")
+
+    print(f"program creating {args.count} objects, best of {args.repeat}:")
+    for engine in Interpreter.ENGINES:
+        print(f"  {engine:8} {run(engine, args.count, args.repeat) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 分层执行基准 / Tiered Execution Benchmark
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+"""
+Measure what tiered execution saves on the tree-walking engine.
+测量分层执行在语法树遍历引擎上节省的时间。
+
+"before" runs the tree walker alone, "after" lets it compile functions and
+loops to closures once they get hot. A short script is timed as well, to
+show that code that never gets hot runs as before.
+“before” 只使用语法树遍历器，“after” 允许它在函数和循环变热后将其编译为闭包。
+另外计时一个短脚本，以表明从未变热的代码与之前一样运行。
+
+Usage / 用法:
+    python benchmarks/bench_tiering.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+from src.config import Config
+
+LONG_PROGRAM = """
+func fib(n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+class Counter {
+    constructor() {
+        this.count = 0;
+    }
+    add(n) {
+        this.count = this.count + n;
+    }
+}
+
+var counter = new Counter();
+for (var i = 0; i < 100000; i = i + 1) {
+    counter.add(i * 2 - i / 2);
+}
+var result = fib(20);
+"""
+
+SHORT_PROGRAM = """
+func square(n) {
+    return n * n;
+}
+
+var total = 0;
+for (var i = 0; i < 50; i = i + 1) {
+    total = total + square(i);
+}
+"""
+
+
+def run(source, tiered, repeat):
+    """Best wall time of `repeat` runs / `repeat` 次运行中的最佳耗时"""
+    Config.TIERED_EXECUTION = tiered
+    best = None
+    for _ in range(repeat):
+        interpreter = Interpreter(engine='tree')
+        tree = Parser(Lexer(source)).parse()
+        start = time.perf_counter()
+        interpreter.interpret(tree)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiered execution benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement (default: 3)')
+    args = parser.parse_args()
+
+    for name, source in (('long-running program', LONG_PROGRAM), ('short script', SHORT_PROGRAM)):
+        before = run(source, False, args.repeat)
+        after = run(source, True, args.repeat)
+        print(f"{name}, best of {args.repeat}:")
+        print(f"  before (tree walker only): {before * 1000:8.2f} ms")
+        print(f"  after  (tiered):           {after * 1000:8.2f} ms")
+        print(f"  speedup: {before / after:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
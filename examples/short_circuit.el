@@ -0,0 +1,94 @@
+// Short-circuit Evaluation Examples
+// 短路求值示例
+
+// Counts how often the right operand runs
+// 记录右操作数被执行的次数
+var calls = 0;
+
+func touch(value) {
+    calls = calls + 1;
+    return value;
+}
+
+func explode() {
+    throw "right operand should not run";
+}
+
+func check(name, passed) {
+    if (passed) {
+        print("PASS: " + name);
+    } else {
+        print("FAIL: " + name);
+    }
+}
+
+print("=== && and || ===");
+
+// false && ... skips the right operand
+// false && ... 跳过右操作数
+calls = 0;
+var result = false && touch(true);
+check("false && x skips x", calls == 0 && result == false);
+
+// true || ... skips the right operand
+// true || ... 跳过右操作数
+calls = 0;
+result = true || touch(false);
+check("true || x skips x", calls == 0 && result == true);
+
+// The right operand still runs when it decides the result
+// 右操作数决定结果时仍会执行
+calls = 0;
+result = true && touch(false);
+check("true && x runs x", calls == 1 && result == false);
+
+calls = 0;
+result = false || touch(true);
+check("false || x runs x", calls == 1 && result == true);
+
+// A skipped right operand may even throw
+// 被跳过的右操作数即使会抛出异常也不会执行
+try {
+    result = false && explode();
+    result = true || explode();
+    check("skipped operands never throw", true);
+} catch (e) {
+    check("skipped operands never throw", false);
+}
+
+// Chains stop at the first deciding operand
+// 链式表达式在第一个决定结果的操作数处停止
+calls = 0;
+result = touch(false) && touch(true) && touch(true);
+check("a && b && c stops after a", calls == 1);
+
+calls = 0;
+result = touch(false) || touch(true) || touch(true);
+check("a || b || c stops after b", calls == 2);
+
+print("=== Guard patterns ===");
+
+// Null guard before a property access
+// 访问属性之前的空值保护
+var user = null;
+if (user != null && user.name == "admin") {
+    print("admin");
+} else {
+    print("No user, property access skipped");
+}
+
+user = {name: "admin"};
+if (user != null && user.name == "admin") {
+    print("Welcome, " + user.name);
+}
+
+// Bounds guard before an index access
+// 访问数组元素之前的边界保护
+var items = [1, 2, 3];
+var size = 3;
+var i = 5;
+if (i < size && items[i] > 0) {
+    print("positive");
+} else {
+    print("Index " + i + " out of range, element access skipped");
+}
@@ -4,6 +4,9 @@
 # Author: Evil0ctal
 # Date: 2025-05-04
 
+from .inline_cache import InlineCache
+
+
 class AST:
     """Base class for all AST nodes 所有AST节点的基类"""
     pass
@@ -11,17 +14,27 @@ class AST:
 
 class BinOp(AST):
     """Binary operation node 二元操作节点"""
-    def __init__(self, left, op, right):
+    def __init__(self, left, op, right, operate=None):
         self.left = left      # 左表达式 Left expression
         self.token = self.op = op  # 操作符 Operator token
         self.right = right    # 右表达式 Right expression
+        self.operate = operate  # 预绑定的运算函数 Pre-bound operation function
+
+
+class LogicalOp(AST):
+    """Short-circuit logical operation node (&&, ||) 短路逻辑运算节点"""
+    def __init__(self, left, op, right):
+        self.left = left      # 左表达式 Left expression
+        self.token = self.op = op  # 操作符 Operator token
+        self.right = right    # 右表达式，仅在左值不能决定结果时求值 Right expression, evaluated only when needed
 
 
 class UnaryOp(AST):
     """Unary operation node 一元操作节点"""
-    def __init__(self, op, expr):
+    def __init__(self, op, expr, operate=None):
         self.token = self.op = op  # 操作符 Operator token
         self.expr = expr           # 表达式 Expression
+        self.operate = operate     # 预绑定的运算函数 Pre-bound operation function
 
 
 class TernaryOp(AST):
@@ -71,6 +84,7 @@ class PropertyAccess(AST):
     def __init__(self, obj, prop):
         self.obj = obj    # 要访问的对象 Object to access
         self.prop = prop  # 属性名称 Property name
+        self.cache = InlineCache()  # 实例布局 -> 字段偏移 Instance shape -> field offset
 
 
 class Compound(AST):
@@ -87,11 +101,29 @@ class Assign(AST):
         self.right = right    # 右侧表达式 Right expression
 
 
+class CompoundAssign(AST):
+    """Compound assignment node (+=, -=, *=, /=, %=, ++, --) 复合赋值节点
+
+    The target is evaluated once: its current value is read, combined with
+    the right operand (1 for ++ and --) and stored back.
+    目标只求值一次：读取其当前值，与右操作数（++ 和 -- 为1）运算后写回。
+    """
+    def __init__(self, left, token, op, right, operate=None):
+        self.left = left        # 赋值目标 Assignment target
+        self.token = token      # 操作符标记 Operator token
+        self.op = op            # 对应的二元操作符 Binary operator, e.g. '+' for += and ++
+        self.right = right      # 右操作数 Right operand
+        self.operate = operate  # 预绑定的运算函数 Pre-bound operation function
+
+
 class Var(AST):
     """Variable node 变量节点"""
     def __init__(self, token):
         self.token = token
         self.value = token.value
+        self.depth = None  # 解析后的帧深度，None表示全局 Resolved frame depth, None for globals
+        self.slot = None   # 解析后的槽位 Resolved slot
+        self.cell = False  # 槽位是否保存共享单元 Whether the slot holds a shared cell
 
 
 class VarDecl(AST):
@@ -99,6 +131,8 @@ class VarDecl(AST):
     def __init__(self, var_node, value_node=None):
         self.var_node = var_node      # 变量节点 Variable node
         self.value_node = value_node  # 初始值节点 Initial value node
+        self.slot = None              # 当前帧中的槽位 Slot in the current frame
+        self.cell = False             # 槽位是否保存共享单元 Whether the slot holds a shared cell
 
 
 class If(AST):
@@ -114,6 +148,7 @@ class While(AST):
     def __init__(self, condition, body):
         self.condition = condition  # 条件 Condition
         self.body = body            # 循环体 Loop body
+        self.tail_calls = False     # 循环体中是否有尾调用 Whether the body returns tail calls
 
 
 class Print(AST):
@@ -141,6 +176,12 @@ class FuncDecl(AST):
         self.name = name    # 函数名 Function name
         self.params = params  # 参数列表 Parameter list
         self.body = body    # 函数体 Function body
+        self.slot = None    # 函数名在外层帧中的槽位 Slot of the name in the enclosing frame
+        self.cell = False   # 该槽位是否保存共享单元 Whether that slot holds a shared cell
+        self.frame_size = None  # 调用帧大小 Call frame size
+        self.captures = ()  # 从声明帧捕获的 (深度, 槽位) (depth, slot) pairs captured from the declaring frame
+        self.cells = ()     # 调用帧中被闭包捕获的槽位 Slots of the call frame captured by closures
+        self.tail_calls = False  # 函数体中是否有尾调用 Whether the body returns tail calls
 
 
 class FuncCall(AST):
@@ -149,6 +190,10 @@ class FuncCall(AST):
         self.name = name          # 函数名 Function name
         self.arguments = arguments  # 参数列表 Argument list
         self.token = token        # 保存位置信息 Save position info
+        self.depth = None         # 解析后的帧深度 Resolved frame depth
+        self.slot = None          # 解析后的槽位 Resolved slot
+        self.cell = False         # 槽位是否保存共享单元 Whether the slot holds a shared cell
+        self.tail = False         # 是否处于尾位置（由解析器标注） In tail position (set by the resolver)
 
 
 class MethodCall(AST):
@@ -157,6 +202,7 @@ class MethodCall(AST):
         self.obj = obj            # 对象 Object
         self.method = method      # 方法名 Method name
         self.arguments = arguments  # 参数列表 Argument list
+        self.cache = InlineCache()  # 实例布局 -> (方法, 所属类) Instance shape -> (method, owner)
 
 
 class Return(AST):
@@ -188,6 +234,37 @@ class For(AST):
         self.condition = condition      # 条件表达式 Condition expression
         self.update_stmt = update_stmt  # 更新语句 Update statement
         self.body = body                # 循环体 Loop body
+        self.tail_calls = False         # 循环体中是否有尾调用 Whether the body returns tail calls
+        self.counter = None             # 计数循环的描述（由解析器标注） CountedLoop, set by the resolver
+
+
+class CountedLoop:
+    """A for loop that steps an integer variable towards a bound the loop never changes
+    以整数变量向循环不改变的上界步进的for循环
+
+    `for (var i = 0; i < n; i = i + 1)` qualifies when nothing in the loop
+    assigns i or n; engines run such a loop over a Python range once they
+    see that i and n hold integers.
+    当循环中没有任何代码给 i 和 n 赋值时，`for (var i = 0; i < n; i = i + 1)` 符合条件；
+    引擎确认 i 和 n 为整数后，以Python的range执行该循环。
+    """
+
+    __slots__ = ('var', 'bound', 'step', 'inclusive')
+
+    def __init__(self, var, bound, step, inclusive):
+        self.var = var              # 条件中的循环变量节点 Loop variable in the condition
+        self.bound = bound          # 上界（数字或变量节点） Bound, a Number or Var node
+        self.step = step            # 每次迭代的步长 Step per iteration
+        self.inclusive = inclusive  # 条件是否包含上界（<= 或 >=） Whether the bound itself is included
+
+    def steps(self, start, bound):
+        """Values the variable takes, None unless both ends are integers
+        循环变量依次取的值，两端不都是整数时返回None"""
+        if start.__class__ is not int or bound.__class__ is not int:
+            return None
+        if self.inclusive:
+            bound += 1 if self.step > 0 else -1
+        return range(start, bound, self.step)
 
 
 class NoOp(AST):
@@ -198,9 +275,14 @@ class NoOp(AST):
 # 函数引用类，用于支持闭包 Function reference class for closure support
 class FuncRef:
     """Function reference with closure support 带闭包支持的函数引用"""
-    def __init__(self, func_node, lexical_scope=None):
+    def __init__(self, func_node, lexical_scope=None, globals=None):
         self.func_node = func_node        # 函数定义 Function definition
-        self.lexical_scope = lexical_scope  # 词法作用域，用于闭包 Lexical scope for closures
+        self.lexical_scope = lexical_scope  # 捕获的单元元组，用于闭包 Tuple of captured cells for closures
+        self.globals = globals            # 声明处的全局环境 Declaring global environment
+        self.code = None                  # 闭包后端编译的函数体 Body compiled by the closure backend
+
+    def __str__(self):
+        return f"<function {self.func_node.name}>"
 
 
 # 模块系统相关节点 Module system related nodes
@@ -240,6 +322,10 @@ class ClassDecl(AST):
         self.superclass = superclass  # 父类 Superclass (can be None)
         self.constructor = constructor # 构造函数 Constructor method
         self.methods = methods        # 方法列表 Methods list
+        self.slot = None              # 类名在外层帧中的槽位 Slot of the name in the enclosing frame
+        self.cell = False             # 该槽位是否保存共享单元 Whether that slot holds a shared cell
+        self.captures = ()            # 方法从声明帧捕获的 (深度, 槽位) (depth, slot) pairs its methods capture
+        self.super_methods = set()    # 方法中 super 调用的目标名称，None为父类构造函数 Names called through super, None for the constructor
 
 
 class MethodDecl(AST):
@@ -249,6 +335,9 @@ class MethodDecl(AST):
         self.params = params      # 参数列表 Parameters list
         self.body = body          # 方法体 Method body
         self.is_static = is_static # 是否是静态方法 Is static method
+        self.frame_size = None     # 调用帧大小 Call frame size
+        self.cells = ()            # 调用帧中被闭包捕获的槽位 Slots of the call frame captured by closures
+        self.tail_calls = False    # 方法体中是否有尾调用 Whether the body returns tail calls
 
 
 class NewExpr(AST):
@@ -262,6 +351,9 @@ class ThisExpr(AST):
     """This expression node this表达式节点"""
     def __init__(self, token):
         self.token = token
+        self.depth = None  # 解析后的帧深度 Resolved frame depth
+        self.slot = None   # 解析后的槽位 Resolved slot
+        self.cell = False  # 槽位是否保存共享单元 Whether the slot holds a shared cell
 
 
 class SuperExpr(AST):
@@ -270,6 +362,19 @@ class SuperExpr(AST):
         self.token = token
 
 
+class SuperCall(AST):
+    """Super call node: super(...) or super.method(...) super调用节点"""
+    def __init__(self, token, method, arguments):
+        self.token = token
+        self.method = method        # 方法名，None为父类构造函数 Method name, None for the superclass constructor
+        self.arguments = arguments  # 参数列表 Argument list
+        self.home = None            # 所在的类声明 Enclosing class declaration
+        self.depth = None           # this 的帧深度 Frame depth of this
+        self.slot = None            # this 的槽位 Slot of this
+        self.cell = False           # this 的槽位是否保存共享单元 Whether the slot of this holds a shared cell
+        self.cache = InlineCache()  # 实例布局 -> (方法, 所属类) Instance shape -> (method, owner)
+
+
 # 异常处理相关节点 Exception handling related nodes
 class TryStmt(AST):
     """Try statement node try语句节点"""
@@ -284,9 +389,26 @@ class CatchClause(AST):
     def __init__(self, param, body):
         self.param = param  # Variable name for the caught exception
         self.body = body
+        self.frame_size = None  # Frame size of the catch block
+        self.cells = ()         # 被闭包捕获的槽位 Slots captured by closures
 
 
 class ThrowStmt(AST):
     """Throw statement node throw语句节点"""
     def __init__(self, expr):
         self.expr = expr
+
+
+# Top-level statements whose value becomes the program result (REPL `_`)
+# 其值作为程序结果（REPL中的 `_`）的顶层语句
+VALUE_STATEMENTS = (VarDecl, Assign, CompoundAssign, FuncCall, MethodCall, FuncDecl, ClassDecl, NewExpr, Input)
+
+NO_POSITION = (None, None)
+
+
+def node_position(node):
+    """Line and column of a node, if it carries a token / 节点的行列位置（如果带有标记）"""
+    token = getattr(node, 'token', None)
+    if token is None:
+        return NO_POSITION
+    return token.line, token.column
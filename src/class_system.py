@@ -3,97 +3,269 @@ Evil Lang Class System
 类系统实现
 """
 
+import weakref
+
+from .environment import wrap_cells
+from .errors import RuntimeError, NameError
+
+# 方法表中不存在的方法
+NO_METHOD = (None, None)
+
+
+class Shape:
+    """实例字段布局：字段名到值列表下标的映射
+
+    添加字段会转移到一个子布局；转移被缓存，因此按相同顺序设置相同字段的实例共享同一个布局对象。
+    """
+
+    __slots__ = ('fields', 'transitions')
+
+    def __init__(self, fields=None):
+        self.fields = fields or {}  # 字段名 -> 下标
+        self.transitions = {}       # 新字段名 -> 子布局
+
+    def with_field(self, name):
+        """添加一个字段后的布局"""
+        shape = self.transitions.get(name)
+        if shape is None:
+            fields = dict(self.fields)
+            fields[name] = len(fields)
+            shape = self.transitions[name] = Shape(fields)
+        return shape
+
+
 class EvilClass:
-    """表示一个Evil Lang类"""
+    """表示一个Evil Lang类
+
+    每个类持有一张扁平化的方法表（方法名 -> (方法, 定义它的类)），包含继承的方法，
+    因此任意深度的继承链都只需一次字典查找。修改方法时该表及所有子类的表都会失效并在下次查找时重建。
+    构建方法表的同时也预先计算本类方法中 super 调用的目标。
+    """
     
-    def __init__(self, name, superclass=None, methods=None, constructor=None):
+    epoch = 0  # 方法表版本：已构建的方法表失效时递增，内联缓存据此清空
+    
+    def __init__(self, name, superclass=None, methods=None, constructor=None, closure=None, globals=None):
         self.name = name
         self.superclass = superclass
         self.methods = methods or {}
         self.constructor = constructor
+        self.closure = closure  # 方法捕获的自由变量单元
+        self.globals = globals  # 声明类时的全局环境
+        self.compiled = {}  # 后端编译的方法体：方法体节点 -> 可调用对象
+        self.shape = Shape()  # 新实例的空布局
+        self.table = None  # 扁平化方法表，失效时为None
+        self.supers = {}  # super 调用的目标：方法名（None为构造函数） -> (方法, 定义它的类)
+        self.declaration = None  # 类声明节点
+        self.subclasses = weakref.WeakSet()  # 直接子类，方法表失效时一并失效
         self.static_methods = {}
         self.static_fields = {}
+        if superclass is not None:
+            superclass.subclasses.add(self)
+    
+    def method_table(self):
+        """扁平化方法表（包括继承的方法），需要时构建"""
+        table = self.table
+        if table is None:
+            table = dict(self.superclass.method_table()) if self.superclass else {}
+            for name, method in self.methods.items():
+                table[name] = (method, self)
+            self.table = table
+            self.supers = self.super_targets()
+        return table
+    
+    def super_targets(self):
+        """预先计算本类方法中 super 调用的目标"""
+        supers = {}
+        if self.declaration is None or self.superclass is None:
+            return supers
+        for name in self.declaration.super_methods:
+            if name is not None:
+                supers[name] = self.superclass.find_method(name)
+                continue
+            # 构造函数不继承：使用最近的定义了构造函数的祖先类
+            ancestor = self.superclass
+            while ancestor is not None and ancestor.constructor is None:
+                ancestor = ancestor.superclass
+            supers[None] = (ancestor.constructor, ancestor) if ancestor else NO_METHOD
+        return supers
+    
+    def super_target(self, name):
+        """本类方法中 super 调用的目标 (方法, 定义它的类)；name 为 None 表示父类构造函数"""
+        self.method_table()
+        if self.superclass is None:
+            raise RuntimeError(f"Class '{self.name}' has no superclass, 'super' cannot be used")
+        target = self.supers[name]
+        if name is not None and target[0] is None:
+            raise NameError(f"Superclass '{self.superclass.name}' has no method '{name}'")
+        return target
+    
+    def home_of(self, declaration):
+        """本类或祖先类中由给定类声明创建的类"""
+        evil_class = self
+        while evil_class is not None and evil_class.declaration is not declaration:
+            evil_class = evil_class.superclass
+        if evil_class is None:
+            raise RuntimeError("'super' used on an instance of an unrelated class")
+        return evil_class
+    
+    def declare(self, declaration):
+        """根据类声明添加方法并构建方法表"""
+        self.declaration = declaration
+        return self.define_methods(declaration.methods)
+    
+    def define_methods(self, methods):
+        """添加方法声明并构建方法表"""
+        for method in methods:
+            self.methods[method.name] = method
+        self.invalidate()
+        return self.method_table()
+    
+    def add_method(self, method):
+        """添加或替换一个方法"""
+        self.methods[method.name] = method
+        self.invalidate()
+    
+    def invalidate(self):
+        """使本类及所有子类的方法表失效"""
+        if self.table is not None:
+            self.table = None
+            EvilClass.epoch += 1
+        for subclass in list(self.subclasses):
+            subclass.invalidate()
     
     def has_method(self, name):
         """检查类是否有指定方法"""
-        if name in self.methods:
-            return True
-        if self.superclass:
-            return self.superclass.has_method(name)
-        return False
+        return name in self.method_table()
     
     def get_method(self, name):
         """获取方法（包括继承的方法）"""
-        if name in self.methods:
-            return self.methods[name]
-        if self.superclass:
-            return self.superclass.get_method(name)
-        return None
+        return self.method_table().get(name, NO_METHOD)[0]
+    
+    def find_method(self, name):
+        """获取方法及定义它的类"""
+        return self.method_table().get(name, NO_METHOD)
+    
+    def empty_frame(self, method, instance):
+        """创建只绑定了 this 的方法调用帧，调用方将参数直接写入 frame[2:]，再包装被捕获的槽位"""
+        frame = [None] * method.frame_size
+        frame[0] = self.closure
+        frame[1] = instance
+        return frame
+    
+    def new_frame(self, method, instance, args):
+        """创建绑定了 this 和参数的方法调用帧"""
+        frame = self.empty_frame(method, instance)
+        frame[2:len(args) + 2] = args
+        if method.cells:
+            wrap_cells(frame, method.cells)
+        return frame
+    
+    def check_method_arguments(self, method, args):
+        """检查方法调用的参数数量"""
+        params = method.params
+        if len(args) != len(params):
+            raise ValueError(
+                f"Method '{method.name}' expects {len(params)} arguments, "
+                f"but {len(args)} were given"
+            )
+    
+    def check_constructor_arguments(self, args):
+        """检查构造函数调用的参数数量"""
+        params = self.constructor.params
+        if len(args) != len(params):
+            raise ValueError(
+                f"Constructor of '{self.name}' expects {len(params)} arguments, "
+                f"but {len(args)} were given"
+            )
+    
+    def method_frame(self, method, instance, args):
+        """检查参数数量并创建方法调用帧"""
+        self.check_method_arguments(method, args)
+        return self.new_frame(method, instance, args)
+    
+    def constructor_frame(self, instance, args):
+        """检查参数数量并创建构造函数调用帧"""
+        self.check_constructor_arguments(args)
+        return self.new_frame(self.constructor, instance, args)
     
     def instantiate(self, interpreter, args):
         """创建类的实例"""
         instance = EvilInstance(self)
         
-        # 如果有构造函数，调用它
+        # 如果有构造函数，创建包含 this 引用的新帧并执行它
         if self.constructor:
-            # 创建一个绑定了实例的环境
-            saved_scope = interpreter.global_scope.copy()
-            saved_functions = interpreter.functions.copy()
-            
-            # 创建新作用域，包含 this 引用
-            new_scope = saved_scope.copy()
-            new_scope['this'] = instance
-            
-            # 绑定构造函数参数
-            params = self.constructor.params
-            if len(args) != len(params):
-                raise ValueError(
-                    f"Constructor of '{self.name}' expects {len(params)} arguments, "
-                    f"but {len(args)} were given"
-                )
-            
-            for i, param in enumerate(params):
-                new_scope[param.value] = args[i]
-            
-            # 执行构造函数
-            interpreter.global_scope = new_scope
-            interpreter.functions = saved_functions
-            
-            try:
-                interpreter.visit(self.constructor.body)
-            finally:
-                # 恢复原作用域
-                interpreter.global_scope = saved_scope
-                interpreter.functions = saved_functions
+            frame = self.constructor_frame(instance, args)
+            interpreter.execute_body(self.constructor.body, frame, self.globals)
         
         return instance
 
 
+def super_frame(target, instance, args):
+    """创建 super 调用的帧；没有可调用的父类构造函数时返回None"""
+    method, owner = target
+    if method is None:
+        if args:
+            raise ValueError(f"Superclass constructor expects 0 arguments, but {len(args)} were given")
+        return None
+    if method is owner.constructor:
+        return owner.constructor_frame(instance, args)
+    return owner.method_frame(method, instance, args)
+
+
 class EvilInstance:
-    """表示一个Evil Lang对象实例"""
+    """表示一个Evil Lang对象实例
+
+    字段值按布局（Shape）给出的下标存放在列表中，同类实例共享布局，不再各自持有字典。
+    """
+    
+    __slots__ = ('evil_class', 'shape', 'values')
     
     def __init__(self, evil_class):
         self.evil_class = evil_class
-        self.fields = {}
+        self.shape = evil_class.shape
+        self.values = []
+    
+    @property
+    def fields(self):
+        """字段名到值的字典（副本）"""
+        return dict(zip(self.shape.fields, self.values))
     
     def get(self, name):
         """获取实例的字段或方法"""
         # 首先检查实例字段
-        if name in self.fields:
-            return self.fields[name]
+        index = self.shape.fields.get(name)
+        if index is not None:
+            return self.values[index]
         
         # 然后检查类方法
-        method = self.evil_class.get_method(name)
+        method, owner = self.evil_class.find_method(name)
         if method:
             # 返回绑定了 this 的方法
-            return BoundMethod(self, method)
+            return BoundMethod(self, method, owner)
         
         # 如果都没有，返回 None
         return None
     
+    def get_field(self, name, default=None):
+        """只获取实例字段，不查找方法"""
+        index = self.shape.fields.get(name)
+        if index is None:
+            return default
+        return self.values[index]
+    
+    def has_field(self, name):
+        """检查实例是否有指定字段"""
+        return name in self.shape.fields
+    
     def set(self, name, value):
         """设置实例字段"""
-        self.fields[name] = value
+        index = self.shape.fields.get(name)
+        if index is None:
+            # 新字段：转移到子布局并追加值
+            self.shape = self.shape.with_field(name)
+            self.values.append(value)
+        else:
+            self.values[index] = value
     
     def __str__(self):
         return f"<{self.evil_class.name} instance>"
@@ -105,46 +277,13 @@ class EvilInstance:
 class BoundMethod:
     """表示绑定了实例的方法"""
     
-    def __init__(self, instance, method):
+    def __init__(self, instance, method, owner=None):
         self.instance = instance
         self.method = method
+        self.owner = owner or instance.evil_class  # 定义该方法的类
     
     def call(self, interpreter, args):
         """调用绑定的方法"""
-        # 保存当前环境
-        saved_scope = interpreter.global_scope.copy()
-        saved_functions = interpreter.functions.copy()
-        
-        # 创建新作用域，包含 this 引用
-        new_scope = saved_scope.copy()
-        new_scope['this'] = self.instance
-        
-        # 绑定参数
-        params = self.method.params
-        if len(args) != len(params):
-            raise ValueError(
-                f"Method '{self.method.name}' expects {len(params)} arguments, "
-                f"but {len(args)} were given"
-            )
-        
-        for i, param in enumerate(params):
-            new_scope[param.value] = args[i]
-        
-        # 执行方法
-        interpreter.global_scope = new_scope
-        interpreter.functions = saved_functions
-        
-        try:
-            interpreter.visit(self.method.body)
-            return_value = None
-        except Exception as e:
-            if hasattr(e, 'value'):  # ReturnException
-                return_value = e.value
-            else:
-                raise
-        finally:
-            # 恢复原作用域
-            interpreter.global_scope = saved_scope
-            interpreter.functions = saved_functions
-        
-        return return_value
\ No newline at end of file
+        # 创建包含 this 引用的新帧并执行方法
+        frame = self.owner.method_frame(self.method, self.instance, args)
+        return interpreter.execute_body(self.method.body, frame, self.owner.globals)
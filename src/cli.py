@@ -10,10 +10,22 @@ from .config import Config, Colors
 from .lexer import Lexer
 from .parser import Parser
 from .interpreter import Interpreter
+from .compiler import Compiler, disassemble
 from .errors import EvilLangError
 from .repl import start_repl
 
 
+def positive_int(text):
+    """argparse type for an integer of at least 1 / 至少为1的整数的argparse类型"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
 def create_parser():
     """创建命令行参数解析器"""
     parser = argparse.ArgumentParser(
@@ -65,6 +77,26 @@ def create_parser():
         help='Show abstract syntax tree (implies --debug)'
     )
     
+    parser.add_argument(
+        '--show-bytecode',
+        action='store_true',
+        help='Show compiled bytecode (implies --debug)'
+    )
+    
+    parser.add_argument(
+        '--engine',
+        choices=Interpreter.ENGINES,
+        default='tree',
+        help='Execution engine: tree (AST walker), closure (compiled closures), vm (bytecode VM) or python (transpiled to Python)'
+    )
+    
+    parser.add_argument(
+        '--max-recursion-depth',
+        type=positive_int,
+        metavar='N',
+        help='Maximum depth of Evil Lang calls (default: 1000); the vm engine keeps call frames on the heap, so it can go up to 100000 and beyond'
+    )
+    
     parser.add_argument(
         '-q', '--quiet',
         action='store_true',
@@ -99,10 +131,8 @@ def execute_code(source_code, filename='<string>'):
         
         if Config.SHOW_TOKENS:
             print(Colors.debug("=== Lexical Tokens ==="))
-            # 创建一个新的词法分析器来显示标记
-            temp_lexer = Lexer(source_code)
-            while True:
-                token = temp_lexer.get_next_token()
+            # 从标记缓冲区中逐个创建标记来显示，词法错误由随后的语法分析报告
+            for token in lexer.buffer:
                 if token.type.name == 'EOF':
                     break
                 print(Colors.dim(str(token)))
@@ -117,8 +147,15 @@ def execute_code(source_code, filename='<string>'):
             print(Colors.dim(str(ast)))
             print()
         
-        # 解释执行
         interpreter = Interpreter(source_code, filename)
+        
+        if Config.SHOW_BYTECODE:
+            print(Colors.debug("=== Bytecode ==="))
+            interpreter.resolve(ast)
+            print(Colors.dim(disassemble(Compiler().compile_program(ast))))
+            print()
+        
+        # 解释执行
         result = interpreter.interpret(ast)
         
         if Config.DEBUG and result is not None:
@@ -160,6 +197,10 @@ def main():
         Config.SHOW_AST = True
         Config.DEBUG = True
     
+    if args.show_bytecode:
+        Config.SHOW_BYTECODE = True
+        Config.DEBUG = True
+    
     # 执行单个命令
     if args.command:
         exit_code = execute_code(args.command, '<command>')
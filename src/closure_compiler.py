@@ -0,0 +1,1095 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 闭包编译执行后端 / Closure-Compilation Backend
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+import builtins
+
+from .ast import *
+from .errors import EvilLangError, RuntimeError, NameError, TypeError, ValueError, EvilLangException
+from .class_system import EvilClass, EvilInstance, BoundMethod, super_frame
+from .environment import new_frame, wrap_cells, capture
+from .runtime import (get_property, get_index, check_index_store, store_index, binary_fallback,
+                      binary_type_error, zero_division_error, unary_type_error, BINARY_OPERATORS)
+from .inline_cache import cached_method, cached_field, cached_super
+
+# Statement closures return None on normal completion, or one of these signals.
+# A return is signalled with a one-element tuple holding the returned value.
+# 语句闭包正常完成时返回None，否则返回以下信号；return 以包含返回值的单元素元组表示。
+BREAK = object()
+CONTINUE = object()
+
+PyTypeError = builtins.TypeError
+
+# Nodes whose value is known at compile time / 编译期即可确定值的节点
+CONSTANT_NODES = (Number, String, Boolean, Null)
+
+
+class ClosureCompiler:
+    """Compile a resolved AST once into specialized Python closures
+    将已解析的语法树一次性编译为专用的Python闭包
+
+    Every expression becomes a closure ``fn(frame) -> value`` and every
+    statement a closure ``fn(frame) -> signal``, so execution calls closures
+    directly instead of dispatching on node types.
+    每个表达式编译为 ``fn(frame) -> value``，每个语句编译为 ``fn(frame) -> signal``，
+    执行时直接调用闭包，而不再按节点类型分派。
+    """
+
+    def __init__(self, interpreter, tiered=False):
+        self.interpreter = interpreter
+        self.tiered = tiered  # 是否为语法树遍历器编译热点代码 Compiling hot code for the tree walker
+        self.genv = None     # 正在编译的全局环境 Global environment being compiled for
+        self.bodies = {}     # 方法体节点 -> 编译后的闭包 Method body node -> compiled closure
+
+    # ------------------------------------------------------------------
+    # 入口 Entry points
+    # ------------------------------------------------------------------
+
+    def prepare(self, tree):
+        """Compile a resolved program into a callable that runs it / 将已解析的程序编译为运行它的可调用对象"""
+        self.genv = self.interpreter.globals
+        return self.compile_program(tree)
+
+    def run(self, tree):
+        """Compile and run a resolved program / 编译并运行已解析的程序"""
+        return self.prepare(tree)()
+
+    def execute_body(self, body, frame, globals=None):
+        """Run a compiled method body in the given frame / 在给定帧中运行已编译的方法体"""
+        signal = self.bodies[body](frame)
+        if signal.__class__ is tuple:
+            return signal[0]
+        return None
+
+    def code_for(self, func_ref):
+        """Compiled body of a function reference / 函数引用的已编译函数体"""
+        if func_ref.code is None:
+            func_ref.code = self.compile_in(func_ref.globals or self.interpreter.globals,
+                                            self.function_body, func_ref.func_node)
+        return func_ref.code
+
+    def body_for(self, method, owner):
+        """Compiled body of a method whose class was not declared by compiled code
+        类不是由编译后的代码声明时，方法的已编译方法体"""
+        code = self.bodies[method.body] = self.compile_in(owner.globals, self.stmt, method.body)
+        return code
+
+    def compile_in(self, genv, compile, node):
+        """Compile a node against the given global environment / 针对给定的全局环境编译节点"""
+        saved_genv = self.genv
+        self.genv = genv
+        try:
+            return compile(node)
+        finally:
+            self.genv = saved_genv
+
+    def function_body(self, node):
+        """Compiled body of a function declaration / 函数声明的已编译函数体
+
+        For the tree walker, a function that returns tail calls keeps running
+        on its trampoline, so tail recursion still takes constant stack.
+        为语法树遍历器编译时，返回尾调用的函数继续在其蹦床上运行，因此尾递归仍只占用常量的栈。
+        """
+        if not (self.tiered and node.tail_calls):
+            return self.stmt(node.body)
+
+        walk_body = self.interpreter.walk_body
+        body = node.body
+        genv = self.genv
+
+        def tree_function(frame):
+            return (walk_body(body, frame, genv),)
+
+        return tree_function
+
+    def compile_program(self, tree):
+        """Compile the top-level statement list / 编译顶层语句列表"""
+        children = tree.children if isinstance(tree, Compound) else [tree]
+        steps = []
+        for child in children:
+            if isinstance(child, NoOp):
+                continue
+            if isinstance(child, VALUE_STATEMENTS) or not self.is_statement(child):
+                steps.append((True, self.expr(child)))
+            else:
+                steps.append((False, self.stmt(child)))
+
+        def program():
+            result = None
+            for is_value, step in steps:
+                if is_value:
+                    result = step(None)
+                else:
+                    result = None
+                    if step(None) is not None:
+                        break
+            return result
+
+        return program
+
+    def is_statement(self, node):
+        return hasattr(self, 'stmt_' + type(node).__name__)
+
+    # ------------------------------------------------------------------
+    # 分派 Dispatch (compile time only / 仅在编译期)
+    # ------------------------------------------------------------------
+
+    def expr(self, node):
+        """Compile an expression node / 编译表达式节点"""
+        compiler = getattr(self, 'expr_' + type(node).__name__, None)
+        if compiler is None:
+            raise RuntimeError(f"No visit_{type(node).__name__} method implemented")
+        return compiler(node)
+
+    def stmt(self, node):
+        """Compile a statement node / 编译语句节点"""
+        compiler = getattr(self, 'stmt_' + type(node).__name__, None)
+        if compiler is not None:
+            return compiler(node)
+        return self.stmt_expression(node)
+
+    def stmt_expression(self, node):
+        """Expression statement: evaluate and complete normally / 表达式语句：求值后正常完成"""
+        fn = self.expr(node)
+
+        def expression_statement(frame):
+            fn(frame)
+
+        return expression_statement
+
+    def load(self, depth, slot, name, cell=False):
+        """Closure that reads a resolved variable, None if a global is missing
+        读取已解析变量的闭包，全局变量不存在时返回None"""
+        if depth is None:
+            gvals = self.genv.values
+            return lambda frame: gvals.get(name)
+        return self.load_slot(depth, slot, cell)
+
+    def load_slot(self, depth, slot, cell=False):
+        if cell:
+            return self.load_cell(depth, slot)
+        if depth == 0:
+            return lambda frame: frame[slot]
+        if depth == 1:
+            return lambda frame: frame[0][slot]
+        if depth == 2:
+            return lambda frame: frame[0][0][slot]
+
+        def load_deep(frame):
+            for _ in range(depth):
+                frame = frame[0]
+            return frame[slot]
+
+        return load_deep
+
+    def load_cell(self, depth, slot):
+        """Closure that reads a captured variable through its cell / 通过单元读取被捕获变量的闭包"""
+        if depth == 0:
+            return lambda frame: frame[slot].value
+        if depth == 1:
+            return lambda frame: frame[0][slot].value
+
+        def load_deep(frame):
+            for _ in range(depth):
+                frame = frame[0]
+            return frame[slot].value
+
+        return load_deep
+
+    # ------------------------------------------------------------------
+    # 表达式 Expressions
+    # ------------------------------------------------------------------
+
+    def expr_Number(self, node):
+        value = node.value
+        return lambda frame: value
+
+    expr_String = expr_Number
+    expr_Boolean = expr_Number
+
+    def expr_Null(self, node):
+        return lambda frame: None
+
+    def expr_Var(self, node):
+        if node.depth is not None:
+            return self.load_slot(node.depth, node.slot, node.cell)
+
+        gvals = self.genv.values
+        name = node.value
+        line, column = node_position(node)
+
+        def load_global(frame):
+            try:
+                return gvals[name]
+            except KeyError:
+                raise NameError(f"Variable '{name}' is not declared", line, column)
+
+        return load_global
+
+    def expr_BinOp(self, node):
+        fn = self.binary_operator(node)
+
+        # Fold operations on two literals into a single constant closure
+        # 将两个字面量之间的运算折叠为一个常量闭包
+        if isinstance(node.left, CONSTANT_NODES) and isinstance(node.right, CONSTANT_NODES):
+            try:
+                value = fn(None)
+            except EvilLangError:
+                return fn
+            return lambda frame: value
+        return fn
+
+    def binary_operator(self, node):
+        left = self.expr(node.left)
+        right = self.expr(node.right)
+        op = node.op.value
+        line, column = node_position(node)
+
+        if op == '+':
+            def add(frame):
+                a = left(frame)
+                b = right(frame)
+                try:
+                    return a + b
+                except PyTypeError as e:
+                    # String concatenation and errors / 字符串连接与错误处理
+                    return binary_fallback(e, op, a, b, line, column)
+            return add
+
+        if op == '/':
+            def divide(frame):
+                a = left(frame)
+                b = right(frame)
+                if b == 0:
+                    raise zero_division_error(op, line, column)
+                try:
+                    return a / b
+                except PyTypeError:
+                    raise binary_type_error(op, a, b, line, column)
+            return divide
+
+        if op == '%':
+            def modulo(frame):
+                a = left(frame)
+                b = right(frame)
+                if b == 0:
+                    raise zero_division_error(op, line, column)
+                try:
+                    return a % b
+                except PyTypeError:
+                    raise binary_type_error(op, a, b, line, column)
+            return modulo
+
+        operator_fn = BINARY_OPERATORS[op]
+
+        def binary(frame):
+            a = left(frame)
+            b = right(frame)
+            try:
+                return operator_fn(a, b)
+            except PyTypeError:
+                raise binary_type_error(op, a, b, line, column)
+
+        return binary
+
+    def expr_LogicalOp(self, node):
+        left = self.expr(node.left)
+        right = self.expr(node.right)
+
+        # The right operand only runs when the left one does not decide the result
+        # 只有左操作数不能决定结果时才执行右操作数
+        if node.op.value == '&&':
+            return lambda frame: left(frame) and right(frame)
+        return lambda frame: left(frame) or right(frame)
+
+    def expr_UnaryOp(self, node):
+        operand = self.expr(node.expr)
+        op = node.op.value
+        line, column = node_position(node)
+
+        if op == '!':
+            fn = lambda frame: not operand(frame)
+        else:
+            sign = -1 if op == '-' else 1
+
+            def fn(frame):
+                value = operand(frame)
+                try:
+                    return -value if sign < 0 else +value
+                except PyTypeError:
+                    raise unary_type_error(op, line, column)
+
+        if isinstance(node.expr, CONSTANT_NODES):
+            try:
+                value = fn(None)
+            except EvilLangError:
+                return fn
+            return lambda frame: value
+        return fn
+
+    def expr_TernaryOp(self, node):
+        condition = self.expr(node.condition)
+        true_expr = self.expr(node.true_expr)
+        false_expr = self.expr(node.false_expr)
+        return lambda frame: true_expr(frame) if condition(frame) else false_expr(frame)
+
+    def expr_ObjectLiteral(self, node):
+        pairs = [(key, self.expr(value)) for key, value in node.pairs.items()]
+        return lambda frame: {key: value(frame) for key, value in pairs}
+
+    def expr_Array(self, node):
+        elements = [self.expr(element) for element in node.elements]
+        return lambda frame: [element(frame) for element in elements]
+
+    def expr_PropertyAccess(self, node):
+        obj = self.expr(node.obj)
+        prop = node.prop
+        line, column = node_position(node.obj)
+        cache = node.cache
+
+        def property_access(frame):
+            value = obj(frame)
+            # Instance fields: read the value at the cached offset / 实例字段：按缓存的偏移读取值
+            if value.__class__ is EvilInstance:
+                index = cached_field(cache, value, prop)
+                if index is not None:
+                    field = value.values[index]
+                    if field is not None:
+                        return field
+            return get_property(value, prop, line, column)
+
+        return property_access
+
+    def expr_ArrayAccess(self, node):
+        array = self.expr(node.array)
+        index = self.expr(node.index)
+        line, column = node_position(node.array)
+        return lambda frame: get_index(array(frame), index(frame), line, column)
+
+    def expr_Input(self, node):
+        if node.prompt is None:
+            return lambda frame: input("")
+        prompt = self.expr(node.prompt)
+        return lambda frame: input(prompt(frame))
+
+    def expr_ThisExpr(self, node):
+        if node.depth is None:
+            def no_this(frame):
+                raise RuntimeError("'this' can only be used inside a class method")
+            return no_this
+        return self.load_slot(node.depth, node.slot, node.cell)
+
+    def expr_SuperExpr(self, node):
+        line, column = node_position(node)
+
+        def super_expr(frame):
+            raise RuntimeError("'super' must be called: use super(...) or super.method(...)", line, column)
+        return super_expr
+
+    def expr_SuperCall(self, node):
+        line, column = node_position(node)
+        if node.depth is None:
+            def no_this(frame):
+                raise RuntimeError("'super' can only be used inside a class method", line, column)
+            return no_this
+
+        this = self.load_slot(node.depth, node.slot, node.cell)
+        arguments = [self.expr(arg) for arg in node.arguments]
+        bodies = self.bodies
+        body_for = self.body_for
+        cache = node.cache
+        is_constructor = node.method is None
+
+        def super_call(frame):
+            instance = this(frame)
+            # Targets were computed when the class was declared / 目标在类声明时已计算
+            target = cached_super(cache, instance, node)
+            callee = super_frame(target, instance, [arg(frame) for arg in arguments])
+            if callee is None:
+                return None
+            method, owner = target
+            signal = (bodies.get(method.body) or body_for(method, owner))(callee)
+            if signal.__class__ is tuple and not is_constructor:
+                return signal[0]
+            return None
+
+        return super_call
+
+    def expr_NewExpr(self, node):
+        interpreter = self.interpreter
+        class_name = node.class_name
+        arguments = [self.expr(arg) for arg in node.arguments]
+
+        bodies = self.bodies
+        body_for = self.body_for
+        argc = len(arguments)
+
+        def new(frame):
+            evil_class = interpreter.classes.get(class_name)
+            if evil_class is None:
+                raise NameError(f"Class '{class_name}' is not defined")
+
+            # Run the constructor directly, arguments go straight into its frame
+            # 直接运行构造函数，参数直接写入其调用帧
+            constructor = evil_class.constructor
+            if constructor is not None and len(constructor.params) == argc:
+                instance = EvilInstance(evil_class)
+                callee = evil_class.empty_frame(constructor, instance)
+                slot = 2
+                for arg in arguments:
+                    callee[slot] = arg(frame)
+                    slot += 1
+                if constructor.cells:
+                    wrap_cells(callee, constructor.cells)
+                (bodies.get(constructor.body) or body_for(constructor, evil_class))(callee)
+                return instance
+
+            return evil_class.instantiate(interpreter, [arg(frame) for arg in arguments])
+
+        return new
+
+    def expr_FuncCall(self, node):
+        interpreter = self.interpreter
+        name = node.name
+        line, column = node_position(node)
+        load = self.load(node.depth, node.slot, name, node.cell)
+        arguments = [self.expr(arg) for arg in node.arguments]
+        code_for = self.code_for
+
+        def call(frame):
+            try:
+                arg_values = [arg(frame) for arg in arguments]
+                func = load(frame)
+
+                # User-defined function or closure / 用户定义的函数或闭包
+                if func.__class__ is FuncRef:
+                    func_node = func.func_node
+                    count = len(arg_values)
+                    if count != len(func_node.params):
+                        raise ValueError(
+                            f"Function '{name}' requires {len(func_node.params)} arguments, "
+                            f"but {count} were given",
+                            line, column
+                        )
+                    callee = [None] * func_node.frame_size
+                    callee[0] = func.lexical_scope
+                    callee[1:count + 1] = arg_values
+                    if func_node.cells:
+                        wrap_cells(callee, func_node.cells)
+                    signal = (func.code or code_for(func))(callee)
+                    if signal.__class__ is tuple:
+                        return signal[0]
+                    return None
+
+                # Method stored in a variable / 存储在变量中的方法
+                if isinstance(func, BoundMethod):
+                    return func.call(interpreter, arg_values)
+
+                # Built-in function / 内置函数
+                if callable(func):
+                    try:
+                        return func(arg_values)
+                    except EvilLangError:
+                        raise
+                    except Exception as e:
+                        raise RuntimeError(str(e), line, column)
+
+                raise NameError(f"Undefined function: {name}", line, column)
+            except EvilLangError as e:
+                e.add_stack_frame(name, line, column)
+                raise
+
+        return call
+
+    def expr_MethodCall(self, node):
+        interpreter = self.interpreter
+        method_name = node.method
+        obj_fn = self.expr(node.obj)
+        arguments = [self.expr(arg) for arg in node.arguments]
+        code_for = self.code_for
+        bodies = self.bodies
+        body_for = self.body_for
+        cache = node.cache
+        argc = len(arguments)
+
+        def method_call(frame):
+            obj = obj_fn(frame)
+
+            # Cache hit: evaluate the arguments straight into the callee frame and
+            # run the method body, with no argument list or bound method
+            # 缓存命中：参数直接求值到被调用帧中并运行方法体，不创建参数列表或绑定方法
+            if obj.__class__ is EvilInstance:
+                entry = cached_method(cache, obj, method_name)
+                if entry is not None and len(entry[0].params) == argc:
+                    method, owner = entry
+                    shape = obj.shape
+                    callee = owner.empty_frame(method, obj)
+                    slot = 2
+                    for arg in arguments:
+                        callee[slot] = arg(frame)
+                        slot += 1
+                    # An argument may have added a field that shadows the method
+                    # 参数求值可能添加了遮蔽该方法的字段
+                    if obj.shape is not shape and method_name in obj.shape.fields:
+                        return call_method(obj, callee[2:slot])
+                    if method.cells:
+                        wrap_cells(callee, method.cells)
+                    signal = (bodies.get(method.body) or body_for(method, owner))(callee)
+                    if signal.__class__ is tuple:
+                        return signal[0]
+                    return None
+
+            return call_method(obj, [arg(frame) for arg in arguments])
+
+        def call_method(obj, arg_values):
+            if isinstance(obj, EvilInstance):
+                # Bound method stored in a field / 字段中存储的绑定方法
+                if obj.has_field(method_name):
+                    method = obj.get_field(method_name)
+                    if method is None:
+                        raise NameError(f"Instance has no method '{method_name}'")
+                    if isinstance(method, BoundMethod):
+                        return method.call(interpreter, arg_values)
+                    raise TypeError(f"'{method_name}' is not a callable method")
+
+                method, owner = obj.evil_class.find_method(method_name)
+                if method is None:
+                    raise NameError(f"Instance has no method '{method_name}'")
+                callee = owner.method_frame(method, obj, arg_values)
+                signal = (bodies.get(method.body) or body_for(method, owner))(callee)
+                if signal.__class__ is tuple:
+                    return signal[0]
+                return None
+
+            elif isinstance(obj, dict) and method_name in obj:
+                method = obj[method_name]
+                if isinstance(method, FuncRef):
+                    func_node = method.func_node
+                    count = len(arg_values)
+                    if count != len(func_node.params):
+                        raise ValueError(
+                            f"Function '{method_name}' requires {len(func_node.params)} arguments, "
+                            f"but {count} were given"
+                        )
+                    callee = [None] * func_node.frame_size
+                    callee[0] = method.lexical_scope
+                    callee[1:count + 1] = arg_values
+                    if func_node.cells:
+                        wrap_cells(callee, func_node.cells)
+                    signal = (method.code or code_for(method))(callee)
+                    if signal.__class__ is tuple:
+                        return signal[0]
+                    return None
+                raise TypeError(f"'{method_name}' is not a callable method")
+
+            raise NameError(f"Object has no method '{method_name}'")
+
+        return method_call
+
+    def expr_Assign(self, node):
+        target = node.left
+        right = self.expr(node.right)
+        line, column = node_position(target)
+
+        if isinstance(target, Var):
+            name = target.value
+            depth = target.depth
+            slot = target.slot
+
+            if depth is None:
+                gvals = self.genv.values
+
+                def assign_global(frame):
+                    if name not in gvals:
+                        raise NameError(f"Variable '{name}' is not declared", line, column)
+                    value = gvals[name] = right(frame)
+                    return value
+                return assign_global
+
+            if target.cell:
+                def assign_cell(frame):
+                    value = right(frame)
+                    for _ in range(depth):
+                        frame = frame[0]
+                    frame[slot].value = value
+                    return value
+                return assign_cell
+
+            if depth == 0:
+                def assign_local(frame):
+                    value = frame[slot] = right(frame)
+                    return value
+                return assign_local
+
+            def assign_outer(frame):
+                value = right(frame)
+                for _ in range(depth):
+                    frame = frame[0]
+                frame[slot] = value
+                return value
+            return assign_outer
+
+        if isinstance(target, ArrayAccess):
+            array_fn = self.expr(target.array)
+            index_fn = self.expr(target.index)
+
+            def assign_element(frame):
+                array = array_fn(frame)
+                index = index_fn(frame)
+                check_index_store(array, index, line, column)
+                return store_index(array, index, right(frame))
+            return assign_element
+
+        if isinstance(target, PropertyAccess):
+            obj_fn = self.expr(target.obj)
+            prop = target.prop
+
+            def assign_property(frame):
+                obj = obj_fn(frame)
+                if isinstance(obj, dict):
+                    value = obj[prop] = right(frame)
+                    return value
+                elif isinstance(obj, EvilInstance):
+                    value = right(frame)
+                    index = obj.shape.fields.get(prop)
+                    if index is not None:
+                        obj.values[index] = value
+                    else:
+                        obj.set(prop, value)
+                    return value
+                raise TypeError(f"Cannot set property on non-object type", line, column)
+            return assign_property
+
+        raise TypeError(f"Unsupported assignment target type: {type(target)}", line, column)
+
+    def expr_CompoundAssign(self, node):
+        target = node.left
+        right = self.expr(node.right)
+        operate = node.operate
+        op = node.op
+        token = node.token
+
+        def combine(a, b):
+            try:
+                return operate(a, b)
+            except (PyTypeError, ZeroDivisionError) as e:
+                return binary_fallback(e, op, a, b, token.line, token.column)
+
+        if isinstance(target, Var):
+            name = target.value
+            depth = target.depth
+            slot = target.slot
+
+            if depth is None:
+                gvals = self.genv.values
+                line, column = node_position(target)
+
+                def update_global(frame):
+                    if name not in gvals:
+                        raise NameError(f"Variable '{name}' is not declared", line, column)
+                    value = gvals[name] = combine(gvals[name], right(frame))
+                    return value
+                return update_global
+
+            if depth == 0 and not target.cell:
+                # Fast path for locals: the operation is inlined / 局部变量快速路径：内联运算
+                if isinstance(node.right, CONSTANT_NODES):
+                    amount = node.right.value
+
+                    def update_local_constant(frame):
+                        try:
+                            value = frame[slot] = operate(frame[slot], amount)
+                        except (PyTypeError, ZeroDivisionError) as e:
+                            value = frame[slot] = binary_fallback(e, op, frame[slot], amount, token.line, token.column)
+                        return value
+                    return update_local_constant
+
+                def update_local(frame):
+                    current = frame[slot]
+                    b = right(frame)
+                    try:
+                        value = frame[slot] = operate(current, b)
+                    except (PyTypeError, ZeroDivisionError) as e:
+                        value = frame[slot] = binary_fallback(e, op, current, b, token.line, token.column)
+                    return value
+                return update_local
+
+            cell = target.cell
+
+            def update_outer(frame):
+                scope = frame
+                for _ in range(depth):
+                    scope = scope[0]
+                if cell:
+                    box = scope[slot]
+                    value = box.value = combine(box.value, right(frame))
+                else:
+                    value = scope[slot] = combine(scope[slot], right(frame))
+                return value
+            return update_outer
+
+        if isinstance(target, ArrayAccess):
+            array_fn = self.expr(target.array)
+            index_fn = self.expr(target.index)
+            line, column = node_position(target.array)
+
+            def update_element(frame):
+                array = array_fn(frame)
+                index = index_fn(frame)
+                current = get_index(array, index, line, column)
+                return store_index(array, index, combine(current, right(frame)))
+            return update_element
+
+        obj_fn = self.expr(target.obj)
+        prop = target.prop
+        line, column = node_position(target.obj)
+        cache = target.cache
+
+        def update_property(frame):
+            obj = obj_fn(frame)
+            # Instance fields: update the value at the cached offset / 实例字段：按缓存的偏移更新值
+            if obj.__class__ is EvilInstance:
+                index = cached_field(cache, obj, prop)
+                if index is not None and obj.values[index] is not None:
+                    value = obj.values[index] = combine(obj.values[index], right(frame))
+                    return value
+            value = combine(get_property(obj, prop, line, column), right(frame))
+            if isinstance(obj, dict):
+                obj[prop] = value
+            elif isinstance(obj, EvilInstance):
+                obj.set(prop, value)
+            else:
+                raise TypeError(f"Cannot set property on non-object type", line, column)
+            return value
+        return update_property
+
+    def expr_VarDecl(self, node):
+        value_fn = self.expr(node.value_node) if node.value_node is not None else (lambda frame: None)
+        slot = node.slot
+
+        if slot is None:
+            gvals = self.genv.values
+            name = node.var_node.value
+
+            def declare_global(frame):
+                value = gvals[name] = value_fn(frame)
+                return value
+            return declare_global
+
+        if node.cell:
+            def declare_cell(frame):
+                value = frame[slot].value = value_fn(frame)
+                return value
+            return declare_cell
+
+        def declare_local(frame):
+            value = frame[slot] = value_fn(frame)
+            return value
+        return declare_local
+
+    def expr_FuncDecl(self, node):
+        interpreter = self.interpreter
+        genv = self.genv
+        body = self.function_body(node)
+        slot = node.slot
+        cell = node.cell
+        name = node.name
+        captures = node.captures
+
+        def declare_function(frame):
+            interpreter.functions[name] = node
+            func_ref = FuncRef(node, capture(frame, captures), genv)
+            func_ref.code = body
+            if slot is None:
+                genv.values[name] = func_ref
+            elif cell:
+                frame[slot].value = func_ref
+            else:
+                frame[slot] = func_ref
+            return func_ref
+
+        return declare_function
+
+    def expr_ClassDecl(self, node):
+        interpreter = self.interpreter
+        genv = self.genv
+        slot = node.slot
+        cell = node.cell
+
+        # Compile the method bodies once / 方法体只编译一次
+        if node.constructor is not None:
+            self.bodies[node.constructor.body] = self.stmt(node.constructor.body)
+        for method in node.methods:
+            self.bodies[method.body] = self.stmt(method.body)
+
+        def declare_class(frame):
+            superclass = None
+            if node.superclass:
+                if node.superclass not in interpreter.classes:
+                    raise NameError(f"Superclass '{node.superclass}' is not defined")
+                superclass = interpreter.classes[node.superclass]
+
+            evil_class = EvilClass(node.name, superclass, {}, node.constructor,
+                                   capture(frame, node.captures), genv)
+            evil_class.declare(node)
+
+            interpreter.classes[node.name] = evil_class
+            if slot is None:
+                genv.values[node.name] = evil_class
+            elif cell:
+                frame[slot].value = evil_class
+            else:
+                frame[slot] = evil_class
+            return evil_class
+
+        return declare_class
+
+    # ------------------------------------------------------------------
+    # 语句 Statements
+    # ------------------------------------------------------------------
+
+    def stmt_Compound(self, node):
+        statements = [self.stmt(child) for child in node.children if not isinstance(child, NoOp)]
+
+        if not statements:
+            return lambda frame: None
+        if len(statements) == 1:
+            return statements[0]
+        if len(statements) == 2:
+            first, second = statements
+
+            def block2(frame):
+                signal = first(frame)
+                if signal is not None:
+                    return signal
+                return second(frame)
+            return block2
+
+        def block(frame):
+            for statement in statements:
+                signal = statement(frame)
+                if signal is not None:
+                    return signal
+            return None
+
+        return block
+
+    def stmt_Assign(self, node):
+        target = node.left
+        if not isinstance(target, Var) or target.depth != 0 or target.cell:
+            return self.stmt_expression(node)
+
+        # Fast path for locals: no value is passed back / 局部变量快速路径：不回传值
+        right = self.expr(node.right)
+        slot = target.slot
+
+        def assign_local(frame):
+            frame[slot] = right(frame)
+
+        return assign_local
+
+    def stmt_VarDecl(self, node):
+        if node.slot is None or node.value_node is None or node.cell:
+            return self.stmt_expression(node)
+
+        value_fn = self.expr(node.value_node)
+        slot = node.slot
+
+        def declare_local(frame):
+            frame[slot] = value_fn(frame)
+
+        return declare_local
+
+    def stmt_NoOp(self, node):
+        return lambda frame: None
+
+    def stmt_If(self, node):
+        condition = self.expr(node.condition)
+        if_body = self.stmt(node.if_body)
+
+        if node.else_body is None:
+            def if_stmt(frame):
+                if condition(frame):
+                    return if_body(frame)
+            return if_stmt
+
+        else_body = self.stmt(node.else_body)
+
+        def if_else(frame):
+            if condition(frame):
+                return if_body(frame)
+            return else_body(frame)
+
+        return if_else
+
+    def stmt_While(self, node):
+        return self.loop(node)
+
+    def stmt_For(self, node):
+        init = self.stmt(node.init_stmt)
+        loop = self.loop(node)
+
+        def for_loop(frame):
+            init(frame)
+            return loop(frame)
+
+        return for_loop
+
+    def loop(self, node):
+        """The iterations of a while or for loop, without the for initializer
+        while或for循环的迭代部分（不含for的初始化语句）"""
+        condition = self.expr(node.condition)
+        body = self.stmt(node.body)
+
+        if isinstance(node, While):
+            def while_loop(frame):
+                while condition(frame):
+                    signal = body(frame)
+                    if signal is not None:
+                        if signal is BREAK:
+                            break
+                        if signal is CONTINUE:
+                            continue
+                        return signal
+                return None
+
+            return while_loop
+
+        update = self.stmt(node.update_stmt)
+
+        def for_loop(frame):
+            while condition(frame):
+                signal = body(frame)
+                if signal is not None:
+                    if signal is BREAK:
+                        break
+                    if signal is not CONTINUE:
+                        return signal
+                update(frame)
+            return None
+
+        if node.counter is None:
+            return for_loop
+        return self.counted_loop(node.counter, body, for_loop)
+
+    def counted_loop(self, counter, body, for_loop):
+        """A counted for loop over a range, falling back to `for_loop` unless both ends are integers
+        以range执行的计数for循环，两端不都是整数时退回到 `for_loop`"""
+        var = counter.var
+        start = self.expr(var)
+        bound = self.expr(counter.bound)
+        steps = counter.steps
+        step = counter.step
+        gvals = self.genv.values
+        key = var.value if var.depth is None else var.slot
+
+        def counted(frame):
+            values = steps(start(frame), bound(frame))
+            if values is None:
+                return for_loop(frame)
+            scope = gvals if var.depth is None else frame
+            for value in values:
+                scope[key] = value
+                signal = body(frame)
+                if signal is not None:
+                    if signal is BREAK:
+                        return None
+                    if signal is not CONTINUE:
+                        return signal
+            scope[key] = values.start + len(values) * step
+            return None
+
+        return counted
+
+    def stmt_Print(self, node):
+        expr = self.expr(node.expr)
+
+        def print_stmt(frame):
+            print(expr(frame))
+
+        return print_stmt
+
+    def stmt_Return(self, node):
+        if node.expr is None:
+            return lambda frame: (None,)
+        expr = self.expr(node.expr)
+        return lambda frame: (expr(frame),)
+
+    def stmt_Break(self, node):
+        return lambda frame: BREAK
+
+    def stmt_Continue(self, node):
+        return lambda frame: CONTINUE
+
+    def stmt_ImportStmt(self, node):
+        interpreter = self.interpreter
+
+        def import_stmt(frame):
+            interpreter.visit_ImportStmt(node)
+
+        return import_stmt
+
+    def stmt_ExportStmt(self, node):
+        interpreter = self.interpreter
+        genv = self.genv
+        items = [(item.name, self.stmt(item.value) if item.value else None) for item in node.items]
+
+        def export_stmt(frame):
+            if not hasattr(interpreter, 'module_exports'):
+                interpreter.module_exports = {}
+            for name, declaration in items:
+                if declaration is not None:
+                    declaration(frame)
+                if name not in genv.values:
+                    raise NameError(f"Cannot export undefined variable '{name}'")
+                interpreter.module_exports[name] = genv.values[name]
+
+        return export_stmt
+
+    def stmt_TryStmt(self, node):
+        try_block = self.stmt(node.try_block)
+        finally_block = self.stmt(node.finally_block) if node.finally_block else None
+        catch_body = None
+        if node.catch_clause is not None:
+            catch_body = self.stmt(node.catch_clause.body)
+            catch_size = node.catch_clause.frame_size
+            catch_cells = node.catch_clause.cells
+
+        def try_stmt(frame):
+            try:
+                signal = try_block(frame)
+            except EvilLangException as e:
+                caught = e
+            except EvilLangError as e:
+                caught = EvilLangException(str(e))
+            except Exception as e:
+                caught = EvilLangException(str(e))
+            else:
+                caught = None
+
+            try:
+                if caught is not None:
+                    if catch_body is None:
+                        raise caught
+                    catch_frame = new_frame(frame, catch_size)
+                    catch_frame[1] = caught.value
+                    wrap_cells(catch_frame, catch_cells)
+                    signal = catch_body(catch_frame)
+            finally:
+                if finally_block is not None:
+                    final_signal = finally_block(frame)
+                    if final_signal is not None:
+                        signal = final_signal
+            return signal
+
+        return try_stmt
+
+    def stmt_ThrowStmt(self, node):
+        expr = self.expr(node.expr)
+
+        def throw_stmt(frame):
+            raise EvilLangException(expr(frame))
+
+        return throw_stmt
@@ -0,0 +1,801 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 字节码编译器 / Bytecode Compiler
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+from array import array
+
+from .ast import *
+
+# ----------------------------------------------------------------------
+# 操作码 Opcodes
+# Every instruction is two words: an opcode and an operand, which is an
+# index into the constant pool, the name pool, a frame slot or a jump target.
+# 每条指令占两个字：操作码和操作数；操作数是常量池、名称池、帧槽位或跳转目标的索引。
+# ----------------------------------------------------------------------
+
+OPCODES = [
+    'LOAD_CONST',         # 压入常量 consts[arg]
+    'LOAD_LOCAL',         # 压入当前帧槽位 frame[arg]
+    'LOAD_DEREF',         # 压入外层帧槽位，arg = depth << 16 | slot
+    'LOAD_GLOBAL',        # 压入全局变量 names[arg]
+    'STORE_LOCAL',        # 弹出并存入当前帧槽位
+    'STORE_DEREF',        # 弹出并存入外层帧槽位
+    'LOAD_CELL',          # 压入被捕获变量的单元值，arg = depth << 16 | slot
+    'STORE_CELL',         # 弹出并存入被捕获变量的单元
+    'MAKE_CELL',          # 将当前帧槽位 frame[arg] 装入单元
+    'STORE_GLOBAL',       # 弹出并赋值给已声明的全局变量
+    'DEFINE_GLOBAL',      # 弹出并声明全局变量
+    'POP',                # 弹出栈顶
+    'DUP',                # 复制栈顶
+    'DUP_TWO',            # 复制栈顶的两个值
+    'BINARY_ADD',
+    'BINARY_SUB',
+    'BINARY_MUL',
+    'BINARY_DIV',
+    'BINARY_MOD',
+    'COMPARE_EQ',
+    'COMPARE_NE',
+    'COMPARE_LT',
+    'COMPARE_GT',
+    'COMPARE_LE',
+    'COMPARE_GE',
+    'UNARY_POS',
+    'UNARY_NEG',
+    'UNARY_NOT',
+    'JUMP',               # 跳转到 arg
+    'POP_JUMP_IF_FALSE',  # 弹出，为假时跳转
+    'POP_JUMP_IF_TRUE',   # 弹出，为真时跳转
+    'JUMP_IF_FALSE_OR_POP',  # 栈顶为假时保留并跳转，否则弹出（&&）
+    'JUMP_IF_TRUE_OR_POP',   # 栈顶为真时保留并跳转，否则弹出（||）
+    'BUILD_ARRAY',        # 用栈顶 arg 个值构建数组
+    'BUILD_OBJECT',       # 用 consts[arg] 中的键构建对象
+    'GET_PROPERTY',       # 读取属性 names[arg]
+    'SET_PROPERTY',       # 设置属性 names[arg]，压入值
+    'GET_INDEX',          # 读取数组元素
+    'CHECK_INDEX',        # 校验元素赋值目标（不出栈）
+    'SET_INDEX',          # 设置数组元素，压入值
+    'CALL',               # 调用函数，consts[arg] = (name, argc, depth, slot, cell)
+    'CALL_METHOD',        # 调用方法，consts[arg] = (name, argc, inline cache)
+    'NEW',                # 创建实例，consts[arg] = (class_name, argc)
+    'CALL_SUPER',         # super 调用，consts[arg] = (method name or None, argc, SuperCall)
+    'MAKE_FUNCTION',      # 创建函数引用，consts[arg] = (FuncDecl, CodeObject)
+    'MAKE_CLASS',         # 创建类，consts[arg] = ClassDecl
+    'LOAD_THIS',          # 在类方法之外使用 this（报错）
+    'LOAD_SUPER',         # 误用 super（报错），arg 为1表示在类方法之外调用
+    'RETURN_VALUE',       # 从函数返回栈顶
+    'PRINT',              # 弹出并打印
+    'INPUT',              # 读取输入，arg 表示是否有提示
+    'THROW',              # 弹出并作为用户异常抛出
+    'SETUP_TRY',          # 注册异常处理器，处理器位于 arg
+    'POP_TRY',            # 注销最内层异常处理器
+    'ENTER_CATCH',        # 弹出异常，压入大小为 arg 的 catch 帧
+    'EXIT_SCOPE',         # 弹出 catch 帧
+    'WRAP_EXCEPTION',     # 将栈顶异常转换为用户异常
+    'RERAISE',            # 弹出并重新抛出异常
+    'IMPORT',             # 执行导入，consts[arg] = ImportStmt
+    'EXPORT',             # 导出全局变量 names[arg]
+    'SET_RESULT',         # 弹出并保存为程序结果
+    'RETURN_RESULT',      # 结束程序并返回结果
+]
+
+for _number, _name in enumerate(OPCODES):
+    globals()[_name] = _number
+
+# 二元操作符到操作码的映射 Binary operator to opcode mapping
+BINARY_OPCODES = {
+    '+': BINARY_ADD,
+    '-': BINARY_SUB,
+    '*': BINARY_MUL,
+    '/': BINARY_DIV,
+    '%': BINARY_MOD,
+    '==': COMPARE_EQ,
+    '!=': COMPARE_NE,
+    '<': COMPARE_LT,
+    '>': COMPARE_GT,
+    '<=': COMPARE_LE,
+    '>=': COMPARE_GE,
+}
+
+UNARY_OPCODES = {
+    '+': UNARY_POS,
+    '-': UNARY_NEG,
+    '!': UNARY_NOT,
+}
+
+# 操作数为常量池索引的操作码 Opcodes whose operand indexes the constant pool
+CONST_OPERANDS = {LOAD_CONST, BUILD_OBJECT, CALL, CALL_METHOD, NEW, CALL_SUPER, MAKE_FUNCTION, MAKE_CLASS, IMPORT}
+# 操作数为名称池索引的操作码 Opcodes whose operand indexes the name pool
+NAME_OPERANDS = {LOAD_GLOBAL, STORE_GLOBAL, DEFINE_GLOBAL, GET_PROPERTY, SET_PROPERTY, EXPORT}
+# 操作数为跳转目标的操作码 Opcodes whose operand is a jump target
+JUMP_OPERANDS = {JUMP, POP_JUMP_IF_FALSE, POP_JUMP_IF_TRUE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, SETUP_TRY}
+# 带操作数的操作码 Opcodes that use their operand
+HAS_OPERAND = CONST_OPERANDS | NAME_OPERANDS | JUMP_OPERANDS | {
+    LOAD_LOCAL, LOAD_DEREF, STORE_LOCAL, STORE_DEREF, LOAD_CELL, STORE_CELL, MAKE_CELL,
+    BUILD_ARRAY, INPUT, ENTER_CATCH, LOAD_SUPER
+}
+
+
+def pack_slot(depth, slot):
+    """Pack a (depth, slot) pair into one operand / 将(深度, 槽位)打包为一个操作数"""
+    return depth << 16 | slot
+
+
+class CodeObject:
+    """Compiled instruction stream of a program or function body / 程序或函数体的已编译指令流"""
+
+    __slots__ = ('name', 'code', 'consts', 'names', 'positions', 'frame_size')
+
+    def __init__(self, name, code, consts, names, positions, frame_size):
+        self.name = name                # 代码名称 Code name
+        self.code = code                # 指令数组 array('i') of opcode/operand pairs
+        self.consts = consts            # 常量池 Constant pool
+        self.names = names              # 名称池 Name pool
+        self.positions = positions      # 每条指令的(行, 列) (line, column) per instruction
+        self.frame_size = frame_size    # 帧大小 Frame size
+
+    def __repr__(self):
+        return f"<code {self.name}>"
+
+
+class CodeBuilder:
+    """Accumulates the instructions and pools of one code object / 累积一个代码对象的指令与常量池"""
+
+    def __init__(self, name, frame_size, is_program=False):
+        self.name = name
+        self.frame_size = frame_size
+        self.is_program = is_program  # 是否为顶层程序 Whether this is the top-level program
+        self.code = []
+        self.positions = []
+        self.consts = []
+        self.const_index = {}
+        self.names = []
+        self.name_index = {}
+        self.blocks = []  # 控制流块栈 Control-flow block stack
+        self.position = NO_POSITION  # 正在编译的节点位置 Position of the node being compiled
+
+    def emit(self, op, arg=0, position=None):
+        """Append an instruction and return its offset / 追加一条指令并返回其偏移
+
+        Without an explicit position the instruction takes the position of
+        the node being compiled.
+        未显式指定位置时，指令使用正在编译的节点的位置。
+        """
+        self.code.append(op)
+        self.code.append(arg)
+        self.positions.append(self.position if position is None else position)
+        return len(self.code) - 2
+
+    def here(self):
+        """Offset of the next instruction / 下一条指令的偏移"""
+        return len(self.code)
+
+    def patch(self, offset, target=None):
+        """Point the jump at offset to target / 将偏移处的跳转指向目标"""
+        self.code[offset + 1] = self.here() if target is None else target
+
+    def add_const(self, value):
+        """Index of a value in the constant pool / 值在常量池中的索引"""
+        key = (type(value), value)
+        index = self.const_index.get(key)
+        if index is None:
+            index = self.const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return index
+
+    def add_name(self, name):
+        """Index of a name in the name pool / 名称在名称池中的索引"""
+        index = self.name_index.get(name)
+        if index is None:
+            index = self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def build(self):
+        return CodeObject(self.name, array('i', self.code), self.consts, self.names,
+                          self.positions, self.frame_size)
+
+
+class LoopBlock:
+    """Loop being compiled, collecting break and continue jumps / 正在编译的循环，收集break与continue跳转"""
+
+    def __init__(self):
+        self.breaks = []
+        self.continues = []
+
+
+class TryBlock:
+    """Protected region with an optional finally body / 带可选finally体的受保护区域"""
+
+    def __init__(self, finally_block):
+        self.finally_block = finally_block
+
+
+class ScopeBlock:
+    """Catch block running in its own frame / 在自己帧中运行的catch块"""
+    pass
+
+
+class Compiler:
+    """Lower a resolved AST into CodeObjects / 将已解析的语法树降级为代码对象"""
+
+    def __init__(self):
+        self.builder = None
+        self.bodies = {}  # 方法体节点 -> 代码对象 Method body node -> code object
+
+    # ------------------------------------------------------------------
+    # 入口 Entry points
+    # ------------------------------------------------------------------
+
+    def compile_program(self, tree):
+        """Compile a top-level program / 编译顶层程序"""
+        saved_builder = self.builder
+        self.builder = CodeBuilder('<main>', 0, is_program=True)
+        try:
+            children = tree.children if isinstance(tree, Compound) else [tree]
+            for child in children:
+                if isinstance(child, NoOp):
+                    continue
+                if isinstance(child, VALUE_STATEMENTS) or not self.is_statement(child):
+                    self.expr(child)
+                else:
+                    self.stmt(child)
+                    self.builder.emit(LOAD_CONST, self.builder.add_const(None))
+                self.builder.emit(SET_RESULT)
+            self.builder.emit(RETURN_RESULT)
+            return self.builder.build()
+        finally:
+            self.builder = saved_builder
+
+    def compile_function(self, name, body, frame_size):
+        """Compile a function or method body / 编译函数或方法体"""
+        saved_builder = self.builder
+        self.builder = CodeBuilder(name, frame_size)
+        try:
+            self.stmt(body)
+            self.builder.emit(LOAD_CONST, self.builder.add_const(None))
+            self.builder.emit(RETURN_VALUE)
+            return self.builder.build()
+        finally:
+            self.builder = saved_builder
+
+    def is_statement(self, node):
+        return hasattr(self, 'stmt_' + type(node).__name__)
+
+    def emit(self, op, arg=0, position=None):
+        return self.builder.emit(op, arg, position)
+
+    def expr(self, node):
+        """Compile code that pushes the node's value / 编译压入节点值的代码"""
+        compiler = getattr(self, 'expr_' + type(node).__name__, None)
+        if compiler is None:
+            raise RuntimeError(f"No visit_{type(node).__name__} method implemented")
+        self.at(node, compiler)
+
+    def stmt(self, node):
+        """Compile a stack-neutral statement / 编译栈平衡的语句"""
+        compiler = getattr(self, 'stmt_' + type(node).__name__, None)
+        if compiler is not None:
+            self.at(node, compiler)
+        else:
+            self.expr(node)
+            self.emit(POP)
+
+    def at(self, node, compiler):
+        """Compile a node, tagging its instructions with its position / 编译节点并以其位置标记指令"""
+        position = node_position(node)
+        if position is NO_POSITION:
+            compiler(node)
+            return
+        saved_position = self.builder.position
+        self.builder.position = position
+        try:
+            compiler(node)
+        finally:
+            self.builder.position = saved_position
+
+    # ------------------------------------------------------------------
+    # 变量访问 Variable access
+    # ------------------------------------------------------------------
+
+    def load(self, depth, slot, name, position, cell=False):
+        if depth is None:
+            self.emit(LOAD_GLOBAL, self.builder.add_name(name), position)
+        elif cell:
+            self.emit(LOAD_CELL, pack_slot(depth, slot), position)
+        elif depth == 0:
+            self.emit(LOAD_LOCAL, slot, position)
+        else:
+            self.emit(LOAD_DEREF, pack_slot(depth, slot), position)
+
+    def store(self, depth, slot, name, position, cell=False):
+        if depth is None:
+            self.emit(STORE_GLOBAL, self.builder.add_name(name), position)
+        elif cell:
+            self.emit(STORE_CELL, pack_slot(depth, slot), position)
+        elif depth == 0:
+            self.emit(STORE_LOCAL, slot, position)
+        else:
+            self.emit(STORE_DEREF, pack_slot(depth, slot), position)
+
+    def declare(self, slot, name, position=None, cell=False):
+        if slot is None:
+            self.emit(DEFINE_GLOBAL, self.builder.add_name(name), position)
+        elif cell:
+            self.emit(STORE_CELL, pack_slot(0, slot), position)
+        else:
+            self.emit(STORE_LOCAL, slot, position)
+
+    # ------------------------------------------------------------------
+    # 表达式 Expressions
+    # ------------------------------------------------------------------
+
+    def expr_Number(self, node):
+        self.emit(LOAD_CONST, self.builder.add_const(node.value))
+
+    expr_String = expr_Number
+    expr_Boolean = expr_Number
+
+    def expr_Null(self, node):
+        self.emit(LOAD_CONST, self.builder.add_const(None))
+
+    def expr_Var(self, node):
+        self.load(node.depth, node.slot, node.value, node_position(node), node.cell)
+
+    def expr_BinOp(self, node):
+        """Compile a binary or logical operation 编译二元或逻辑运算
+
+        Left-deep chains such as `a + b + c + ...` are compiled in a loop and
+        run on the VM's value stack, so a long generated expression needs no
+        Python recursion either to compile or to run.
+        `a + b + c + ...` 这样的左深链在循环中编译并在虚拟机的值栈上运行，因此长的生成表达式
+        无论编译还是运行都不需要Python递归。
+        """
+        chain = []
+        while node.__class__ is BinOp or node.__class__ is LogicalOp:
+            chain.append(node)
+            node = node.left
+        self.expr(node)
+        for node in reversed(chain):
+            if node.__class__ is BinOp:
+                self.expr(node.right)
+                self.emit(BINARY_OPCODES[node.op.value], 0, node_position(node))
+            else:
+                jump = self.emit(JUMP_IF_FALSE_OR_POP if node.op.value == '&&' else JUMP_IF_TRUE_OR_POP)
+                self.expr(node.right)
+                self.builder.patch(jump)
+
+    expr_LogicalOp = expr_BinOp
+
+    def expr_UnaryOp(self, node):
+        self.expr(node.expr)
+        self.emit(UNARY_OPCODES[node.op.value], 0, node_position(node))
+
+    def expr_TernaryOp(self, node):
+        self.expr(node.condition)
+        jump_false = self.emit(POP_JUMP_IF_FALSE)
+        self.expr(node.true_expr)
+        jump_end = self.emit(JUMP)
+        self.builder.patch(jump_false)
+        self.expr(node.false_expr)
+        self.builder.patch(jump_end)
+
+    def expr_ObjectLiteral(self, node):
+        for value in node.pairs.values():
+            self.expr(value)
+        self.emit(BUILD_OBJECT, self.builder.add_const(tuple(node.pairs.keys())))
+
+    def expr_Array(self, node):
+        for element in node.elements:
+            self.expr(element)
+        self.emit(BUILD_ARRAY, len(node.elements))
+
+    def expr_PropertyAccess(self, node):
+        self.expr(node.obj)
+        self.emit(GET_PROPERTY, self.builder.add_name(node.prop), node_position(node.obj))
+
+    def expr_ArrayAccess(self, node):
+        self.expr(node.array)
+        self.expr(node.index)
+        self.emit(GET_INDEX, 0, node_position(node.array))
+
+    def expr_Input(self, node):
+        if node.prompt is not None:
+            self.expr(node.prompt)
+            self.emit(INPUT, 1)
+        else:
+            self.emit(INPUT, 0)
+
+    def expr_ThisExpr(self, node):
+        if node.depth is None:
+            self.emit(LOAD_THIS, 0, node_position(node))
+        else:
+            self.load(node.depth, node.slot, 'this', node_position(node), node.cell)
+
+    def expr_SuperExpr(self, node):
+        self.emit(LOAD_SUPER, 0, node_position(node))
+
+    def expr_SuperCall(self, node):
+        if node.depth is None:
+            self.emit(LOAD_SUPER, 1, node_position(node))
+            return
+        self.load(node.depth, node.slot, 'this', node_position(node), node.cell)
+        for arg in node.arguments:
+            self.expr(arg)
+        self.emit(CALL_SUPER, self.builder.add_const((node.method, len(node.arguments), node)), node_position(node))
+        if node.method is None:
+            # super(...) evaluates to null / super(...) 的值为 null
+            self.emit(POP)
+            self.emit(LOAD_CONST, self.builder.add_const(None))
+
+    def expr_NewExpr(self, node):
+        for arg in node.arguments:
+            self.expr(arg)
+        self.emit(NEW, self.builder.add_const((node.class_name, len(node.arguments))))
+
+    def expr_FuncCall(self, node):
+        for arg in node.arguments:
+            self.expr(arg)
+        site = (node.name, len(node.arguments), node.depth, node.slot, node.cell)
+        self.emit(CALL, self.builder.add_const(site), node_position(node))
+
+    def expr_MethodCall(self, node):
+        self.expr(node.obj)
+        for arg in node.arguments:
+            self.expr(arg)
+        self.emit(CALL_METHOD, self.builder.add_const((node.method, len(node.arguments), node.cache)))
+
+    def expr_Assign(self, node):
+        self.assign(node, keep_value=True)
+
+    def assign(self, node, keep_value):
+        target = node.left
+        position = node_position(target)
+
+        if isinstance(target, Var):
+            self.expr(node.right)
+            if keep_value:
+                self.emit(DUP)
+            self.store(target.depth, target.slot, target.value, position, target.cell)
+            return
+
+        if isinstance(target, ArrayAccess):
+            self.expr(target.array)
+            self.expr(target.index)
+            self.emit(CHECK_INDEX, 0, position)
+            self.expr(node.right)
+            self.emit(SET_INDEX, 0, position)
+        elif isinstance(target, PropertyAccess):
+            self.expr(target.obj)
+            self.expr(node.right)
+            self.emit(SET_PROPERTY, self.builder.add_name(target.prop), position)
+        else:
+            raise TypeError(f"Unsupported assignment target type: {type(target)}")
+
+        if not keep_value:
+            self.emit(POP)
+
+    def expr_CompoundAssign(self, node):
+        self.compound_assign(node, keep_value=True)
+
+    def compound_assign(self, node, keep_value):
+        # The target's object and index are evaluated once and duplicated for the store
+        # 目标的对象和索引只求值一次，复制后用于写回
+        target = node.left
+        operation = BINARY_OPCODES[node.op]
+        position = node_position(node)
+
+        if isinstance(target, Var):
+            self.expr_Var(target)
+            self.expr(node.right)
+            self.emit(operation, 0, position)
+            if keep_value:
+                self.emit(DUP)
+            self.store(target.depth, target.slot, target.value, node_position(target), target.cell)
+            return
+
+        if isinstance(target, ArrayAccess):
+            self.expr(target.array)
+            self.expr(target.index)
+            self.emit(DUP_TWO)
+            self.emit(GET_INDEX, 0, node_position(target.array))
+            self.expr(node.right)
+            self.emit(operation, 0, position)
+            self.emit(SET_INDEX)
+        else:
+            self.expr(target.obj)
+            self.emit(DUP)
+            name = self.builder.add_name(target.prop)
+            self.emit(GET_PROPERTY, name, node_position(target.obj))
+            self.expr(node.right)
+            self.emit(operation, 0, position)
+            self.emit(SET_PROPERTY, name, node_position(target.obj))
+
+        if not keep_value:
+            self.emit(POP)
+
+    def expr_VarDecl(self, node):
+        self.var_decl(node, keep_value=True)
+
+    def var_decl(self, node, keep_value):
+        if node.value_node is not None:
+            self.expr(node.value_node)
+        else:
+            self.emit(LOAD_CONST, self.builder.add_const(None))
+        if keep_value:
+            self.emit(DUP)
+        self.declare(node.slot, node.var_node.value, node_position(node.var_node), node.cell)
+
+    def expr_FuncDecl(self, node):
+        self.func_decl(node, keep_value=True)
+
+    def func_decl(self, node, keep_value):
+        code = self.compile_function(node.name, node.body, node.frame_size)
+        self.emit(MAKE_FUNCTION, self.builder.add_const((node, code)))
+        if keep_value:
+            self.emit(DUP)
+        self.declare(node.slot, node.name, cell=node.cell)
+
+    def expr_ClassDecl(self, node):
+        self.class_decl(node, keep_value=True)
+
+    def class_decl(self, node, keep_value):
+        # Compile the method bodies once / 方法体只编译一次
+        methods = list(node.methods)
+        if node.constructor is not None:
+            methods.append(node.constructor)
+        for method in methods:
+            self.bodies[method.body] = self.compile_function(
+                f"{node.name}.{method.name}", method.body, method.frame_size)
+
+        self.emit(MAKE_CLASS, self.builder.add_const(node))
+        if keep_value:
+            self.emit(DUP)
+        self.declare(node.slot, node.name, cell=node.cell)
+
+    # ------------------------------------------------------------------
+    # 语句 Statements
+    # ------------------------------------------------------------------
+
+    def stmt_Compound(self, node):
+        for child in node.children:
+            self.stmt(child)
+
+    def stmt_NoOp(self, node):
+        pass
+
+    def stmt_Assign(self, node):
+        self.assign(node, keep_value=False)
+
+    def stmt_CompoundAssign(self, node):
+        self.compound_assign(node, keep_value=False)
+
+    def stmt_VarDecl(self, node):
+        self.var_decl(node, keep_value=False)
+
+    def stmt_FuncDecl(self, node):
+        self.func_decl(node, keep_value=False)
+
+    def stmt_ClassDecl(self, node):
+        self.class_decl(node, keep_value=False)
+
+    def stmt_If(self, node):
+        self.expr(node.condition)
+        jump_false = self.emit(POP_JUMP_IF_FALSE)
+        self.stmt(node.if_body)
+        if node.else_body is None:
+            self.builder.patch(jump_false)
+            return
+        jump_end = self.emit(JUMP)
+        self.builder.patch(jump_false)
+        self.stmt(node.else_body)
+        self.builder.patch(jump_end)
+
+    def stmt_While(self, node):
+        start = self.builder.here()
+        self.expr(node.condition)
+        jump_exit = self.emit(POP_JUMP_IF_FALSE)
+
+        loop = LoopBlock()
+        self.builder.blocks.append(loop)
+        self.stmt(node.body)
+        self.builder.blocks.pop()
+
+        self.emit(JUMP, start)
+        self.builder.patch(jump_exit)
+        for offset in loop.continues:
+            self.builder.patch(offset, start)
+        for offset in loop.breaks:
+            self.builder.patch(offset)
+
+    def stmt_For(self, node):
+        self.stmt(node.init_stmt)
+        start = self.builder.here()
+        self.expr(node.condition)
+        jump_exit = self.emit(POP_JUMP_IF_FALSE)
+
+        loop = LoopBlock()
+        self.builder.blocks.append(loop)
+        self.stmt(node.body)
+        self.builder.blocks.pop()
+
+        update = self.builder.here()
+        self.stmt(node.update_stmt)
+        self.emit(JUMP, start)
+        self.builder.patch(jump_exit)
+        for offset in loop.continues:
+            self.builder.patch(offset, update)
+        for offset in loop.breaks:
+            self.builder.patch(offset)
+
+    def stmt_Print(self, node):
+        self.expr(node.expr)
+        self.emit(PRINT)
+
+    def unwind(self, stop_at_loop):
+        """Emit the cleanup for leaving enclosing blocks / 生成离开外层块所需的清理代码
+
+        Returns the loop block reached, if any. Finally bodies are compiled
+        inline with the block stack cut back to their own level.
+        返回到达的循环块（如果有）；finally 体以其自身层级的块栈内联编译。
+        """
+        blocks = self.builder.blocks
+        for index in range(len(blocks) - 1, -1, -1):
+            block = blocks[index]
+            if isinstance(block, LoopBlock):
+                if stop_at_loop:
+                    return block
+            elif isinstance(block, ScopeBlock):
+                self.emit(EXIT_SCOPE)
+            elif isinstance(block, TryBlock):
+                self.emit(POP_TRY)
+                if block.finally_block is not None:
+                    self.builder.blocks = blocks[:index]
+                    try:
+                        self.stmt(block.finally_block)
+                    finally:
+                        self.builder.blocks = blocks
+        return None
+
+    def stmt_Return(self, node):
+        if self.builder.is_program:
+            # return 在顶层结束程序，结果为 null / A top-level return ends the program with a null result
+            if node.expr is not None:
+                self.stmt(node.expr)
+            self.unwind(stop_at_loop=False)
+            self.leave_code()
+            return
+        if node.expr is not None:
+            self.expr(node.expr)
+        else:
+            self.emit(LOAD_CONST, self.builder.add_const(None))
+        self.unwind(stop_at_loop=False)
+        self.emit(RETURN_VALUE)
+
+    def stmt_Break(self, node):
+        loop = self.unwind(stop_at_loop=True)
+        if loop is None:
+            self.leave_code()
+        else:
+            loop.breaks.append(self.emit(JUMP))
+
+    def stmt_Continue(self, node):
+        loop = self.unwind(stop_at_loop=True)
+        if loop is None:
+            self.leave_code()
+        else:
+            loop.continues.append(self.emit(JUMP))
+
+    def leave_code(self):
+        """break/continue outside a loop ends the current code / 循环外的break/continue结束当前代码"""
+        self.emit(LOAD_CONST, self.builder.add_const(None))
+        self.emit(RETURN_VALUE)
+
+    def stmt_ImportStmt(self, node):
+        self.emit(IMPORT, self.builder.add_const(node))
+
+    def stmt_ExportStmt(self, node):
+        for item in node.items:
+            if item.value is not None:
+                self.stmt(item.value)
+            self.emit(EXPORT, self.builder.add_name(item.name))
+
+    def stmt_ThrowStmt(self, node):
+        self.expr(node.expr)
+        self.emit(THROW)
+
+    def stmt_TryStmt(self, node):
+        builder = self.builder
+        finally_block = node.finally_block
+
+        # try 块 Protected try block
+        setup = self.emit(SETUP_TRY)
+        builder.blocks.append(TryBlock(finally_block))
+        self.stmt(node.try_block)
+        builder.blocks.pop()
+        self.emit(POP_TRY)
+        if finally_block is not None:
+            self.stmt(finally_block)
+        jumps_to_end = [self.emit(JUMP)]
+
+        # 异常处理器，栈顶为异常 Handler, exception on top of stack
+        builder.patch(setup)
+        if node.catch_clause is not None:
+            inner_setup = None
+            if finally_block is not None:
+                # finally 也要在 catch 体抛出异常时执行 finally also runs if the catch body raises
+                inner_setup = self.emit(SETUP_TRY)
+                builder.blocks.append(TryBlock(finally_block))
+            self.emit(ENTER_CATCH, node.catch_clause.frame_size)
+            for slot in node.catch_clause.cells:
+                self.emit(MAKE_CELL, slot)
+            builder.blocks.append(ScopeBlock())
+            self.stmt(node.catch_clause.body)
+            builder.blocks.pop()
+            self.emit(EXIT_SCOPE)
+            if inner_setup is not None:
+                builder.blocks.pop()
+                self.emit(POP_TRY)
+                self.stmt(finally_block)
+                jumps_to_end.append(self.emit(JUMP))
+                builder.patch(inner_setup)
+                self.stmt(finally_block)
+                self.emit(RERAISE)
+            else:
+                jumps_to_end.append(self.emit(JUMP))
+        else:
+            self.emit(WRAP_EXCEPTION)
+            self.stmt(finally_block)
+            self.emit(RERAISE)
+
+        for offset in jumps_to_end:
+            builder.patch(offset)
+
+
+def disassemble(code, nested=True):
+    """Render a code object as readable text / 将代码对象渲染为可读文本"""
+    lines = [f"Disassembly of {code.name} (frame size {code.frame_size}):"]
+    nested_codes = []
+    instructions = code.code
+    last_line = None
+
+    for offset in range(0, len(instructions), 2):
+        op = instructions[offset]
+        arg = instructions[offset + 1]
+        name = OPCODES[op]
+        line = code.positions[offset // 2][0]
+
+        if op in CONST_OPERANDS:
+            value = code.consts[arg]
+            if op == MAKE_FUNCTION:
+                detail = f"<function {value[0].name}>"
+                nested_codes.append(value[1])
+            elif op == MAKE_CLASS:
+                detail = f"<class {value.name}>"
+            elif op == IMPORT:
+                detail = repr(value.module_path)
+            elif op == CALL_METHOD or op == CALL_SUPER:
+                detail = repr(value[:2])
+            else:
+                detail = repr(value)
+        elif op in NAME_OPERANDS:
+            detail = code.names[arg]
+        elif op in JUMP_OPERANDS:
+            detail = f"to {arg}"
+        elif op in (LOAD_DEREF, STORE_DEREF, LOAD_CELL, STORE_CELL):
+            detail = f"depth {arg >> 16}, slot {arg & 0xFFFF}"
+        else:
+            detail = ''
+
+        line_text = f"{line:>4}" if line is not None and line != last_line else '    '
+        if line is not None:
+            last_line = line
+        arg_text = f"{arg:>5}" if op in HAS_OPERAND else ''
+        lines.append(f"{line_text} {offset:>6} {name:<18} {arg_text:>5} {detail}".rstrip())
+
+    text = '\n'.join(lines)
+    if nested:
+        for nested_code in nested_codes:
+            text += '\n\n' + disassemble(nested_code)
+    return text
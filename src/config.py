@@ -14,13 +14,14 @@ class Config:
     DEBUG = False
     SHOW_TOKENS = False
     SHOW_AST = False
+    SHOW_BYTECODE = False
     
     # 输出选项
     USE_COLORS = True
     COLOR_OUTPUT = sys.stdout.isatty()  # 检测是否在终端中运行
     
     # 语言限制
-    MAX_RECURSION_DEPTH = 1000
+    MAX_RECURSION_DEPTH = 1000     # Evil Lang调用深度上限（vm引擎在堆上保存调用帧，不受Python栈限制）
     MAX_LOOP_ITERATIONS = 1000000  # 防止无限循环
     MAX_STRING_LENGTH = 1048576    # 1MB
     MAX_ARRAY_SIZE = 100000
@@ -42,6 +43,10 @@ class Config:
     # 性能选项
     ENABLE_OPTIMIZATIONS = False
     CACHE_PARSED_FILES = False
+    ENGINE = 'tree'  # 执行引擎: tree（语法树遍历）、closure（闭包编译）、vm（字节码虚拟机）或 python（转译为Python）
+    TIERED_EXECUTION = True       # tree引擎将热点函数和循环编译为闭包
+    HOT_FUNCTION_THRESHOLD = 100  # 函数或方法被调用多少次后编译
+    HOT_LOOP_THRESHOLD = 1000     # 循环迭代多少次后编译
     
     @classmethod
     def load_from_args(cls, args):
@@ -63,17 +68,29 @@ class Config:
         if hasattr(args, 'quiet') and args.quiet:
             cls.SHOW_STACK_TRACE = False
             
+        if hasattr(args, 'engine') and args.engine:
+            cls.ENGINE = args.engine
+
+        if getattr(args, 'max_recursion_depth', None) is not None:
+            cls.MAX_RECURSION_DEPTH = args.max_recursion_depth
+            
     @classmethod
     def reset(cls):
         """重置所有配置为默认值"""
         cls.DEBUG = False
         cls.SHOW_TOKENS = False
         cls.SHOW_AST = False
+        cls.SHOW_BYTECODE = False
         cls.USE_COLORS = True
         cls.COLOR_OUTPUT = sys.stdout.isatty()
         cls.SHOW_STACK_TRACE = True
         cls.ENABLE_OPTIMIZATIONS = False
         cls.CACHE_PARSED_FILES = False
+        cls.ENGINE = 'tree'
+        cls.TIERED_EXECUTION = True
+        cls.HOT_FUNCTION_THRESHOLD = 100
+        cls.HOT_LOOP_THRESHOLD = 1000
+        cls.MAX_RECURSION_DEPTH = 1000
 
 
 class Colors:
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 访问者分派表 / Visitor Dispatch Table
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+
+class DispatchTable(dict):
+    """Map node classes to bound handlers, resolved once per class
+    将节点类映射到绑定的处理方法，每个类只解析一次
+
+    The first node of a class looks up `<prefix><ClassName>` on the owner
+    (so subclass overrides apply) and caches the result; later nodes of the
+    same class cost a single dictionary lookup. Handlers can be replaced per
+    owner with `register` without monkey-patching the class.
+    某类的第一个节点会在所有者上查找 `<前缀><类名>`（因此子类覆盖生效）并缓存结果；
+    之后同类节点只需一次字典查找。可以用 `register` 替换单个所有者的处理方法，无需猴子补丁。
+
+    The node classes overridden with `register` are kept in `overrides`.
+    The tree engine's tiering (`Tiering`) runs hot code as compiled closures
+    that do not go through this table, so it promotes nothing while any
+    override is registered.
+    用 `register` 覆盖的节点类保存在 `overrides` 中。tree引擎的分层执行（`Tiering`）以不经过
+    此表的编译后闭包运行热点代码，因此只要注册了任何覆盖，它就不会提升任何代码。
+    """
+
+    def __init__(self, owner, prefix='visit_', default=None):
+        super().__init__()
+        self.owner = owner
+        self.prefix = prefix
+        self.default = default
+        self.overrides = set()  # 用 register 覆盖的节点类 Node classes overridden with register
+
+    def __missing__(self, node_class):
+        handler = getattr(self.owner, self.prefix + node_class.__name__, self.default)
+        if handler is None:
+            raise KeyError(node_class)
+        self[node_class] = handler
+        return handler
+
+    def register(self, node_class, handler):
+        """Override the handler of a node class / 覆盖节点类的处理方法"""
+        self[node_class] = handler
+        self.overrides.add(node_class)
+        return handler
+
+    def handler(self, node_class):
+        """Current handler of a node class / 节点类当前的处理方法"""
+        return self[node_class]
+
+    def reset(self, node_class=None):
+        """Forget cached handlers so they are looked up again / 清除缓存的处理方法以便重新查找"""
+        if node_class is None:
+            self.clear()
+            self.overrides.clear()
+        else:
+            self.pop(node_class, None)
+            self.overrides.discard(node_class)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 词法环境 / Lexical Environment
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+
+class Environment:
+    """Name-keyed namespace of a program or module / 程序或模块的按名称索引的命名空间
+
+    Used for global and module namespaces, whose contents are only known at
+    runtime; the identity of the object tells compiled code which globals it
+    was compiled against. Function calls use the slot-indexed frames from
+    new_frame().
+    用于运行时才能确定内容的全局和模块命名空间；编译后的代码通过该对象的同一性判断其针对的全局环境。
+    函数调用使用 new_frame() 创建的按槽位索引的帧。
+    """
+
+    __slots__ = ('values',)
+
+    def __init__(self, values=None):
+        self.values = {} if values is None else values  # 名称 -> 值 Name -> value
+
+    def __repr__(self):
+        return f"<Environment {list(self.values)}>"
+
+
+def new_frame(parent, size):
+    """Allocate a slot-indexed call frame / 分配按槽位索引的调用帧
+
+    Function frames are plain lists laid out by the resolver: slot 0 links to
+    the captured cells (or, for a catch frame, the enclosing frame) and the
+    remaining slots hold parameters and locals.
+    函数帧是由解析器布局的普通列表：0号槽位链接捕获的单元（catch帧则链接外层帧），
+    其余槽位保存参数和局部变量。
+    """
+    frame = [None] * size
+    frame[0] = parent
+    return frame
+
+
+class Cell:
+    """Shared box for a variable captured by a closure / 被闭包捕获的变量的共享容器
+
+    The declaring frame and every closure that captures the variable hold the
+    same cell, so assignments on either side are seen by the other.
+    声明帧和所有捕获该变量的闭包持有同一个单元，因此任一方的赋值对另一方可见。
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def __repr__(self):
+        return f"<Cell {self.value!r}>"
+
+
+def wrap_cells(frame, slots):
+    """Box the captured slots of a new frame in cells / 将新帧中被捕获的槽位装入单元"""
+    for slot in slots:
+        frame[slot] = Cell(frame[slot])
+    return frame
+
+
+def capture(frame, captures):
+    """Collect the cells a closure captures from its declaring frame / 从声明帧收集闭包捕获的单元"""
+    cells = []
+    for depth, slot in captures:
+        outer = frame
+        for _ in range(depth):
+            outer = outer[0]
+        cells.append(outer[slot])
+    return tuple(cells)
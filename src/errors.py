@@ -138,24 +138,6 @@ class EvilLangError(Exception):
         return result
 
 
-class BreakException(Exception):
-    """Break statement exception / Break语句异常"""
-    pass
-
-
-class ContinueException(Exception):
-    """Continue statement exception / Continue语句异常"""
-    pass
-
-
-class ReturnException(Exception):
-    """Return statement with value / 带返回值的Return语句"""
-
-    def __init__(self, value=None):
-        self.value = value
-        super().__init__(str(value))
-
-
 class SyntaxError(EvilLangError):
     """Syntax error during parsing / 解析时的语法错误"""
     pass
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 内联缓存 / Inline Caches
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+from .class_system import EvilClass
+
+
+class InlineCache:
+    """Per-site cache from an instance shape to a lookup result
+    每个访问点的缓存：实例布局 -> 查找结果
+
+    Every class has its own root shape, so a shape identifies both the class
+    and the fields an instance has; the result of a property or method lookup
+    on an instance depends on nothing else. The first shape seen is kept in
+    two attributes (monomorphic); further shapes go to a small table that is
+    emptied when it fills up (megamorphic). Method entries are dropped
+    whenever a built method table is invalidated (`EvilClass.epoch`).
+    每个类都有自己的根布局，因此布局同时确定了类和实例拥有的字段，实例上的属性或方法查找结果
+    只取决于布局。第一个遇到的布局保存在两个属性中（单态）；之后的布局存入一个小表，表满时清空（超态）。
+    已构建的方法表失效时（`EvilClass.epoch`）方法条目会被丢弃。
+    """
+
+    __slots__ = ('shape', 'entry', 'table', 'epoch')
+
+    MEGAMORPHIC_SIZE = 8  # 超态表的最大条目数 Maximum entries of the megamorphic table
+
+    def __init__(self):
+        self.shape = None  # 单态布局 Monomorphic shape
+        self.entry = None  # 单态布局的查找结果 Lookup result for that shape
+        self.table = None  # 布局 -> 查找结果 Shape -> lookup result
+        self.epoch = EvilClass.epoch  # 填充时的方法表版本 Method table epoch when filled
+
+    def lookup(self, shape):
+        """Cached result for a shape, None on a miss / 布局的缓存结果，未命中时返回None"""
+        if shape is self.shape:
+            return self.entry
+        if self.table is not None:
+            return self.table.get(shape)
+        return None
+
+    def store(self, shape, entry):
+        """Remember the result for a shape / 记住布局的查找结果"""
+        if self.shape is None:
+            self.shape = shape
+            self.entry = entry
+        else:
+            if self.table is None:
+                self.table = {}
+            elif len(self.table) >= self.MEGAMORPHIC_SIZE:
+                self.table.clear()
+            self.table[shape] = entry
+        return entry
+
+    def clear(self):
+        self.shape = self.entry = self.table = None
+
+
+def cached_method(cache, instance, name):
+    """(method, owner class) called as `instance.name(...)`, through a site cache
+    通过访问点缓存查找 `instance.name(...)` 调用的 (方法, 定义它的类)
+
+    Returns None when a field shadows the method or the class has no such
+    method; callers then take the generic path.
+    字段遮蔽了方法或类没有该方法时返回None，调用方随后走通用路径。
+    """
+    if cache.epoch != EvilClass.epoch:
+        cache.clear()
+        cache.epoch = EvilClass.epoch
+    shape = instance.shape
+    entry = cache.lookup(shape)
+    if entry is None:
+        if name in shape.fields:
+            return None
+        method, owner = instance.evil_class.find_method(name)
+        if method is None:
+            return None
+        entry = cache.store(shape, (method, owner))
+    return entry
+
+
+def cached_super(cache, instance, node):
+    """(method, owner class) targeted by a super call site, through a site cache
+    通过访问点缓存查找 super 调用的 (方法, 定义它的类)
+
+    The targets are computed when the class is declared; the cache only
+    saves finding, from `this`, the class the calling method belongs to.
+    目标在类声明时计算；缓存只省去了从 `this` 找到调用方法所属类的过程。
+    """
+    if cache.epoch != EvilClass.epoch:
+        cache.clear()
+        cache.epoch = EvilClass.epoch
+    shape = instance.shape
+    entry = cache.lookup(shape)
+    if entry is None:
+        home = instance.evil_class.home_of(node.home)
+        entry = cache.store(shape, home.super_target(node.method))
+    return entry
+
+
+def cached_field(cache, instance, name):
+    """Offset of a field read as `instance.name`, through a site cache, None if absent
+    通过访问点缓存查找 `instance.name` 读取的字段偏移，不存在时返回None"""
+    shape = instance.shape
+    index = cache.lookup(shape)
+    if index is None:
+        index = shape.fields.get(name)
+        if index is not None:
+            cache.store(shape, index)
+    return index
@@ -4,29 +4,122 @@
 # Author: Evil0ctal
 # Date: 2025-05-04
 
+import builtins
+
 from .ast import *
-from .errors import EvilLangError, RuntimeError, NameError, TypeError, ValueError, IndexError, ReturnException, \
-    BreakException, ContinueException, EvilLangException
+from .errors import EvilLangError, RuntimeError, NameError, TypeError, ValueError, EvilLangException
 from .builtins import get_builtins
-from .class_system import EvilClass, EvilInstance, BoundMethod
+from .class_system import EvilClass, EvilInstance, BoundMethod, super_frame
+from .environment import Environment, new_frame, wrap_cells, capture
+from .resolver import Resolver
+from .runtime import to_string, get_property, get_index, check_index_store, store_index, binary_fallback, unary_error
+from .closure_compiler import ClosureCompiler
+from .vm import VirtualMachine
+from .transpiler import PythonBackend
+from .tiering import Tiering
+from .dispatch import DispatchTable
+from .inline_cache import cached_method, cached_field, cached_super
+from .config import Config
+
+PyTypeError = builtins.TypeError
+
+
+class Completion:
+    """Abrupt completion of a statement / 语句的非正常完成
+
+    Statements that complete normally return their value as before. return,
+    break and continue instead return a Completion, which every enclosing
+    statement passes up until a loop or function call consumes it, so no
+    Python exception is raised for control flow.
+    正常完成的语句照常返回其值；return、break 和 continue 则返回一个 Completion，
+    外层语句将其向上传递，直到被循环或函数调用消费，因此控制流不会抛出Python异常。
+    """
+
+    __slots__ = ('kind', 'value')
+
+    RETURN = 'return'
+    BREAK = 'break'
+    CONTINUE = 'continue'
+
+    def __init__(self, kind, value=None):
+        self.kind = kind    # 完成类型 Completion kind
+        self.value = value  # 返回值 Returned value
+
+    def __repr__(self):
+        return f"Completion({self.kind!r}, {self.value!r})"
+
+
+# break and continue carry no value, so one instance each is enough
+# break 和 continue 不携带值，各用一个实例即可
+BREAK = Completion(Completion.BREAK)
+CONTINUE = Completion(Completion.CONTINUE)
+
+
+class TailCall:
+    """A call in tail position, run by the enclosing call_function / 处于尾位置的调用，由外层的 call_function 执行"""
+
+    __slots__ = ('func_ref', 'args', 'node')
+
+    def __init__(self, func_ref, args, node):
+        self.func_ref = func_ref  # 被调用的函数 Called function
+        self.args = args          # 已求值的参数 Evaluated arguments
+        self.node = node          # 调用节点（用于错误位置） Call node (for error positions)
+
+
+def completion_value(result):
+    """Value a function body produces / 函数体产生的值
+
+    Only a return completion carries one; a body that falls off its end, or
+    stops at a stray break or continue, returns None.
+    只有return完成携带值；执行到末尾或因游离的break、continue而停止的函数体返回None。
+    """
+    if result.__class__ is Completion and result.kind is Completion.RETURN:
+        return result.value
+    return None
 
 
 class Interpreter:
     """Tree-walking interpreter with closure support / 支持闭包的语法树遍历解释器"""
 
-    def __init__(self, source_code=None, filename=None):
-        self.global_scope = {}  # Global scope / 全局变量作用域
-        self.functions = {}  # Function storage / 函数字典
+    # Available execution engines / 可用的执行引擎
+    ENGINES = ('tree', 'closure', 'vm', 'python')
+
+    def __init__(self, source_code=None, filename=None, engine=None):
+        self.globals = Environment()  # Global environment / 全局环境
+        self.frame = None  # Current function frame, None at top level / 当前函数帧，顶层为None
+        self.functions = {}  # Declared functions (for REPL completion) / 已声明的函数（用于REPL补全）
         self.classes = {}  # Class storage / 类字典
         self.source_code = source_code  # Store the source code for error reporting
         self.filename = filename  # Store the filename for error reporting
         self.builtins = {}  # Built-in functions / 内置函数
         self.module_manager = None  # Module manager / 模块管理器（延迟初始化以避免循环导入）
         self.current_instance = None  # Current instance for this reference / 当前实例（用于this引用）
+        self.dispatch = DispatchTable(self, 'visit_', self.generic_visit)  # Node class -> handler / 节点类到处理方法的映射
+
+        # Execution engine / 执行引擎
+        self.engine = engine or Config.ENGINE
+        if self.engine not in self.ENGINES:
+            raise ValueError(f"Unknown execution engine: {self.engine}")
+        if self.engine == 'closure':
+            self.backend = ClosureCompiler(self)
+        elif self.engine == 'vm':
+            self.backend = VirtualMachine(self)
+        elif self.engine == 'python':
+            self.backend = PythonBackend(self)
+        else:
+            self.backend = None
+
+        # Hot code of the tree walker is promoted to compiled closures / 语法树遍历器的热点代码被提升为编译后的闭包
+        self.tiering = Tiering(self) if self.backend is None and Config.TIERED_EXECUTION else None
 
         # Add built-in functions / 添加内置函数
         self._add_builtins()
 
+    @property
+    def global_scope(self):
+        """Variables of the global environment / 全局环境中的变量"""
+        return self.globals.values
+
     def _add_builtins(self):
         """Add built-in functions to global scope / 添加内置函数到全局作用域"""
         self.builtins = get_builtins()
@@ -35,9 +128,7 @@ class Interpreter:
 
     def visit(self, node):
         """Visit node using the appropriate method / 使用适当的方法访问节点"""
-        method_name = 'visit_' + type(node).__name__
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        return self.dispatch[node.__class__](node)
 
     def generic_visit(self, node):
         """Generic visit method for unknown node types / 未知节点类型的通用访问方法"""
@@ -45,83 +136,33 @@ class Interpreter:
 
     def _to_string(self, value):
         """Type conversion to string / 类型转换为字符串"""
-        if value is None:
-            return "null"
-        elif isinstance(value, bool):
-            return "true" if value else "false"
-        else:
-            return str(value)
+        return to_string(value)
 
     def visit_BinOp(self, node):
         """Evaluate binary operations / 执行二元运算"""
         left = self.visit(node.left)
         right = self.visit(node.right)
-
-        line = node.token.line if hasattr(node, 'token') else None
-        column = node.token.column if hasattr(node, 'token') else None
-
-        # Handle string concatenation - automatically convert non-string values to strings
-        # 处理字符串连接 - 自动将非字符串值转换为字符串
-        if node.op.value == '+' and (isinstance(left, str) or isinstance(right, str)):
-            return self._to_string(left) + self._to_string(right)
-
-        # Other binary operators / 其他二元操作符
         try:
-            if node.op.value == '+':
-                return left + right
-            elif node.op.value == '-':
-                return left - right
-            elif node.op.value == '*':
-                return left * right
-            elif node.op.value == '/':
-                if right == 0:
-                    raise ValueError("Division by zero", line, column)
-                return left / right
-            elif node.op.value == '%':
-                if right == 0:
-                    raise ValueError("Modulo by zero", line, column)
-                return left % right
-            elif node.op.value == '==':
-                return left == right
-            elif node.op.value == '!=':
-                return left != right
-            elif node.op.value == '<':
-                return left < right
-            elif node.op.value == '>':
-                return left > right
-            elif node.op.value == '<=':
-                return left <= right
-            elif node.op.value == '>=':
-                return left >= right
-            elif node.op.value == '&&':
-                return left and right
-            elif node.op.value == '||':
-                return left or right
-        except TypeError:
-            # Convert Python TypeError to EvilLang TypeError
-            raise TypeError(
-                f"Operator '{node.op.value}' cannot be applied to types '{type(left).__name__}' and '{type(right).__name__}'",
-                line, column
-            )
+            return node.operate(left, right)
+        except (PyTypeError, ZeroDivisionError) as e:
+            # String concatenation and errors / 字符串连接与错误处理
+            return binary_fallback(e, node.op.value, left, right, node.token.line, node.token.column)
+
+    def visit_LogicalOp(self, node):
+        """Evaluate && and ||, skipping the right operand when the left decides
+        执行 && 和 ||，当左操作数已决定结果时跳过右操作数"""
+        left = self.visit(node.left)
+        if node.op.value == '&&':
+            return self.visit(node.right) if left else left
+        return left if left else self.visit(node.right)
 
     def visit_UnaryOp(self, node):
         """Evaluate unary operations / 执行一元运算"""
-        line = node.token.line if hasattr(node, 'token') else None
-        column = node.token.column if hasattr(node, 'token') else None
-
-        op = node.op.value
+        value = self.visit(node.expr)
         try:
-            if op == '+':
-                return +self.visit(node.expr)
-            elif op == '-':
-                return -self.visit(node.expr)
-            elif op == '!':
-                return not self.visit(node.expr)
-        except TypeError:
-            raise TypeError(
-                f"Operator '{op}' cannot be applied to this type",
-                line, column
-            )
+            return node.operate(value)
+        except PyTypeError:
+            raise unary_error(node.token)
 
     def visit_TernaryOp(self, node):
         """Evaluate ternary operations / 执行三元运算"""
@@ -158,39 +199,26 @@ class Interpreter:
         """Evaluate property access / 计算属性访问"""
         obj = self.visit(node.obj)
 
+        # Instance fields: read the value at the cached offset / 实例字段：按缓存的偏移读取值
+        if obj.__class__ is EvilInstance:
+            index = cached_field(node.cache, obj, node.prop)
+            if index is not None:
+                value = obj.values[index]
+                if value is not None:
+                    return value
+
         line = node.obj.token.line if hasattr(node.obj, 'token') else None
         column = node.obj.token.column if hasattr(node.obj, 'token') else None
 
-        # Handle Evil Lang object instances / 处理 Evil Lang 对象实例
-        if isinstance(obj, EvilInstance):
-            value = obj.get(node.prop)
-            if value is None:
-                raise NameError(f"Instance has no property '{node.prop}'", line, column)
-            return value
-        # Handle built-in properties and methods / 处理内置属性和方法
-        elif isinstance(obj, list) and node.prop == 'length':
-            return len(obj)
-        # Handle string properties / 处理字符串属性
-        elif isinstance(obj, str) and node.prop == 'length':
-            return len(obj)
-        # Handle object property access / 处理对象属性访问
-        elif isinstance(obj, dict) and node.prop in obj:
-            return obj[node.prop]
-        # If object is a dictionary, try to access its keys / 如果对象是字典，尝试访问它的键
-        elif isinstance(obj, dict):
-            if node.prop in obj:
-                return obj[node.prop]
-            else:
-                # If property doesn't exist, throw error / 如果属性不存在，抛出异常
-                raise NameError(f"Object has no property '{node.prop}'", line, column)
-        else:
-            raise TypeError(f"Cannot access property '{node.prop}' on this type", line, column)
+        return get_property(obj, node.prop, line, column)
 
     def visit_Compound(self, node):
         """Execute compound statement / 执行复合语句"""
         result = None
         for child in node.children:
             result = self.visit(child)
+            if result.__class__ is Completion:
+                return result
         return result
 
     def visit_VarDecl(self, node):
@@ -201,7 +229,12 @@ class Interpreter:
         if node.value_node is not None:
             var_value = self.visit(node.value_node)
 
-        self.global_scope[var_name] = var_value
+        if node.slot is None:
+            self.globals.values[var_name] = var_value
+        elif node.cell:
+            self.frame[node.slot].value = var_value
+        else:
+            self.frame[node.slot] = var_value
         return var_value
 
     def visit_Assign(self, node):
@@ -212,15 +245,27 @@ class Interpreter:
         if isinstance(node.left, Var):
             var_name = node.left.value
 
-            # Check if variable is declared / 检查变量是否声明
-            if var_name not in self.global_scope:
-                raise NameError(f"Variable '{var_name}' is not declared", line, column)
+            depth = node.left.depth
+
+            # Global variable / 全局变量
+            if depth is None:
+                if var_name not in self.globals.values:
+                    raise NameError(f"Variable '{var_name}' is not declared", line, column)
+                value = self.visit(node.right)
+                self.globals.values[var_name] = value
+                return value
 
             # Calculate assignment expression value / 计算赋值表达式的值
             value = self.visit(node.right)
 
-            # Update variable value / 更新变量的值
-            self.global_scope[var_name] = value
+            # Update the resolved slot / 更新解析得到的槽位
+            frame = self.frame
+            for _ in range(depth):
+                frame = frame[0]
+            if node.left.cell:
+                frame[node.left.slot].value = value
+            else:
+                frame[node.left.slot] = value
             return value
 
         elif isinstance(node.left, ArrayAccess):
@@ -228,27 +273,12 @@ class Interpreter:
             array = self.visit(node.left.array)
             index = self.visit(node.left.index)
 
-            if not isinstance(array, list):
-                raise TypeError(f"Not an array: {array}", line, column)
-
-            if not isinstance(index, int):
-                raise TypeError(f"Array index must be an integer: {index}", line, column)
-
-            # Modified boundary check, allows adding elements at the end
-            # 修改后的边界检查，允许在数组末尾添加元素
-            if index < 0 or index > len(array):
-                raise IndexError(f"Array index out of bounds: {index}", line, column)
+            # Boundary check allows adding elements at the end
+            # 边界检查允许在数组末尾添加元素
+            check_index_store(array, index, line, column)
 
             value = self.visit(node.right)
-
-            # If index equals array length, append to end
-            # 如果索引等于数组长度，附加到数组末尾
-            if index == len(array):
-                array.append(value)
-            else:
-                array[index] = value
-
-            return value
+            return store_index(array, index, value)
 
         elif isinstance(node.left, PropertyAccess):
             # Handle object property assignment / 处理对象属性赋值
@@ -262,7 +292,12 @@ class Interpreter:
             elif isinstance(obj, EvilInstance):
                 # Handle Evil Lang instance property assignment
                 value = self.visit(node.right)
-                obj.set(prop, value)
+                index = obj.shape.fields.get(prop)
+                if index is not None:
+                    # Existing field: store at the shape's offset / 已有字段：按布局偏移存储
+                    obj.values[index] = value
+                else:
+                    obj.set(prop, value)
                 return value
             else:
                 raise TypeError(f"Cannot set property on non-object type", line, column)
@@ -270,23 +305,84 @@ class Interpreter:
         else:
             raise TypeError(f"Unsupported assignment target type: {type(node.left)}", line, column)
 
-    def visit_Var(self, node):
-        """Evaluate variable / 计算变量值"""
-        var_name = node.value
-        line = node.token.line if hasattr(node.token, 'line') else None
-        column = node.token.column if hasattr(node.token, 'column') else None
+    def visit_CompoundAssign(self, node):
+        """Execute +=, -=, *=, /=, %=, ++ and --, evaluating the target once
+        执行 +=、-=、*=、/=、%=、++ 和 --，目标只求值一次"""
+        target = node.left
+
+        # Variable: read and write the resolved slot / 变量：读写解析得到的槽位
+        if target.__class__ is Var:
+            depth = target.depth
+            if depth is None:
+                gvals = self.globals.values
+                name = target.value
+                if name not in gvals:
+                    raise NameError(f"Variable '{name}' is not declared", target.token.line, target.token.column)
+                value = gvals[name] = self.combine(node, gvals[name], self.visit(node.right))
+                return value
+            frame = self.frame
+            for _ in range(depth):
+                frame = frame[0]
+            if target.cell:
+                cell = frame[target.slot]
+                value = cell.value = self.combine(node, cell.value, self.visit(node.right))
+            else:
+                slot = target.slot
+                value = frame[slot] = self.combine(node, frame[slot], self.visit(node.right))
+            return value
 
-        # Check if it's a function name / 检查是否是函数名
-        if var_name in self.functions:
-            # Return function name for later use in function calls
-            # 返回函数名，之后可以用于函数调用
-            return var_name
+        if target.__class__ is ArrayAccess:
+            array = self.visit(target.array)
+            index = self.visit(target.index)
+            current = get_index(array, index, target.array.token.line, target.array.token.column)
+            return store_index(array, index, self.combine(node, current, self.visit(node.right)))
+
+        # Property: instance fields are updated at their offset / 属性：实例字段按偏移更新
+        obj = self.visit(target.obj)
+        prop = target.prop
+        if obj.__class__ is EvilInstance:
+            index = cached_field(target.cache, obj, prop)
+            if index is not None and obj.values[index] is not None:
+                value = self.combine(node, obj.values[index], self.visit(node.right))
+                obj.values[index] = value
+                return value
 
-        # Variable lookup / 变量查找
-        if var_name not in self.global_scope:
-            raise NameError(f"Variable '{var_name}' is not declared", line, column)
+        line = target.obj.token.line if hasattr(target.obj, 'token') else None
+        column = target.obj.token.column if hasattr(target.obj, 'token') else None
+        value = self.combine(node, get_property(obj, prop, line, column), self.visit(node.right))
+        if isinstance(obj, dict):
+            obj[prop] = value
+        elif isinstance(obj, EvilInstance):
+            obj.set(prop, value)
+        else:
+            raise TypeError(f"Cannot set property on non-object type", line, column)
+        return value
 
-        return self.global_scope[var_name]
+    def combine(self, node, current, operand):
+        """Apply the binary operator of a compound assignment / 执行复合赋值的二元运算"""
+        try:
+            return node.operate(current, operand)
+        except (PyTypeError, ZeroDivisionError) as e:
+            return binary_fallback(e, node.op, current, operand, node.token.line, node.token.column)
+
+    def visit_Var(self, node):
+        """Evaluate variable / 计算变量值"""
+        depth = node.depth
+
+        # Local variable: index the resolved frame slot / 局部变量：按解析得到的槽位索引帧
+        if depth is not None:
+            frame = self.frame
+            for _ in range(depth):
+                frame = frame[0]
+            if node.cell:
+                return frame[node.slot].value
+            return frame[node.slot]
+
+        # Global variable lookup / 全局变量查找
+        try:
+            return self.globals.values[node.value]
+        except KeyError:
+            raise NameError(f"Variable '{node.value}' is not declared", node.token.line, node.token.column)
 
     def visit_If(self, node):
         """Execute if statement / 执行if语句"""
@@ -299,31 +395,97 @@ class Interpreter:
 
     def visit_While(self, node):
         """Execute while loop / 执行while循环"""
-        while self.visit(node.condition):
-            try:
-                self.visit(node.body)
-            except BreakException:
-                break
-            except ContinueException:
-                continue
+        return self.run_loop(node, None)
 
     def visit_For(self, node):
         """Execute for loop / 执行for循环"""
         # Execute initialization statement / 执行初始化语句
         self.visit(node.init_stmt)
+        return self.run_loop(node, node.update_stmt)
+
+    def run_loop(self, node, update):
+        """Run the iterations of a while or for loop, compiling it once it gets hot
+        执行while或for循环的迭代，循环变热后将其编译"""
+        budget = -1  # 变热前剩余的迭代次数，-1表示不编译 Iterations left before the loop gets hot, -1 for never
+        if self.tiering is not None and not node.tail_calls:
+            code, budget = self.tiering.enter_loop(node, self.globals)
+            if code is not None:
+                return self.run_compiled_loop(code)
+
+        counter = node.counter if update is not None else None
+        if counter is not None:
+            steps = counter.steps(self.visit(counter.var), self.visit(counter.bound))
+            if steps is not None:
+                return self.run_counted_loop(node, steps, budget)
 
-        # Execute loop / 循环执行
-        while self.visit(node.condition):
-            try:
+        try:
+            while self.visit(node.condition):
                 # Execute loop body / 执行循环体
-                self.visit(node.body)
-            except BreakException:
-                break
-            except ContinueException:
-                pass
-
-            # Execute update statement / 执行更新语句
-            self.visit(node.update_stmt)
+                result = self.visit(node.body)
+                if result.__class__ is Completion:
+                    if result is BREAK:
+                        break
+                    if result is not CONTINUE:
+                        return result
+
+                # Execute update statement / 执行更新语句
+                if update is not None:
+                    self.visit(update)
+
+                # Continue the remaining iterations compiled / 剩余的迭代以编译后的形式继续
+                budget -= 1
+                if budget == 0:
+                    code = self.tiering.compile_loop(node, self.globals)
+                    if code is not None:
+                        return self.run_compiled_loop(code)
+        finally:
+            if budget > 0:
+                self.tiering.leave_loop(node, budget)
+
+    def run_counted_loop(self, node, steps, budget):
+        """Run a counted for loop over a range of its variable's values
+        以循环变量取值的range执行计数for循环
+
+        The variable is stored before each iteration, and after the loop it
+        holds the first value that failed the condition, as with the update.
+        每次迭代前写入循环变量；循环结束后它保存第一个不满足条件的值，与执行更新语句时相同。
+        """
+        var = node.counter.var
+        if var.depth is None:
+            scope, key = self.globals.values, var.value
+        else:
+            scope, key = self.frame, var.slot
+        step = node.counter.step
+        try:
+            for value in steps:
+                scope[key] = value
+                result = self.visit(node.body)
+                if result.__class__ is Completion:
+                    if result is BREAK:
+                        return None
+                    if result is not CONTINUE:
+                        return result
+
+                # Continue the remaining iterations compiled / 剩余的迭代以编译后的形式继续
+                budget -= 1
+                if budget == 0:
+                    code = self.tiering.compile_loop(node, self.globals)
+                    if code is not None:
+                        scope[key] = value + step
+                        return self.run_compiled_loop(code)
+            scope[key] = steps.start + len(steps) * step
+        finally:
+            if budget > 0:
+                self.tiering.leave_loop(node, budget)
+
+    def run_compiled_loop(self, code):
+        """Run a compiled loop in the current frame / 在当前帧中运行编译后的循环"""
+        signal = code(self.frame)
+        if signal is not None:
+            # break and continue stay inside the loop, only a return comes out
+            # break 和 continue 留在循环内部，只有return会传出
+            return Completion(Completion.RETURN, signal[0])
+        return None
 
     def visit_Print(self, node):
         """Execute print statement / 执行print语句"""
@@ -349,39 +511,131 @@ class Interpreter:
         line = node.array.token.line if hasattr(node.array, 'token') else None
         column = node.array.token.column if hasattr(node.array, 'token') else None
 
-        if not isinstance(array, list):
-            raise TypeError(f"Not an array: {array}", line, column)
-
-        if not isinstance(index, int):
-            raise TypeError(f"Array index must be an integer: {index}", line, column)
-
-        if index < 0 or index >= len(array):
-            raise IndexError(f"Array index out of bounds: {index}", line, column)
-
-        return array[index]
+        return get_index(array, index, line, column)
 
     def visit_FuncDecl(self, node):
         """Execute function declaration / 执行函数声明"""
-        # Store function definition in function dictionary
-        # 将函数定义保存到函数字典中
+        # Record the declaration for REPL completion / 记录函数声明（用于REPL补全）
         self.functions[node.name] = node
 
-        # Save current environment as captured environment for closures
-        # 保存当前环境作为闭包捕获的环境
-        closure_env = self.global_scope.copy()
+        # Capture only the cells of the free variables the function uses
+        # 只捕获函数使用的自由变量所在的单元
+        func_ref = FuncRef(node, capture(self.frame, node.captures), self.globals)
 
-        # Create a FuncRef object for the function, supporting later use as a value
-        # 把函数本身创建为一个FuncRef对象，支持后续作为值使用
-        func_ref = FuncRef(node, closure_env)
-        
-        # Also store function reference in global scope for easier access
-        # 同时将函数引用存储在全局作用域中，方便访问
-        self.global_scope[node.name] = func_ref
+        # Store function reference in its resolved slot
+        # 将函数引用存储在解析得到的槽位中
+        if node.slot is None:
+            self.globals.values[node.name] = func_ref
+        elif node.cell:
+            self.frame[node.slot].value = func_ref
+        else:
+            self.frame[node.slot] = func_ref
 
         # Return function reference, allowing functions to be assigned to variables
         # 返回函数引用，使得函数可以被赋值给变量
         return func_ref
 
+    def execute_body(self, body, frame, globals=None):
+        """Execute a function body in the given frame / 在给定的帧中执行函数体"""
+        if self.backend is not None:
+            return self.backend.execute_body(body, frame, globals)
+
+        if self.tiering is not None:
+            code = self.tiering.body_code(body, globals or self.globals)
+            if code is not None:
+                signal = code(frame)
+                return signal[0] if signal.__class__ is tuple else None
+        return self.walk_body(body, frame, globals)
+
+    def walk_body(self, body, frame, globals=None):
+        """Execute a function body in the given frame with the tree walker / 用语法树遍历器在给定的帧中执行函数体"""
+        saved_frame = self.frame
+        saved_globals = self.globals
+        self.frame = frame
+        self.globals = globals or saved_globals
+        try:
+            value = completion_value(self.visit(body))
+        finally:
+            # Pop the frame / 弹出帧
+            self.frame = saved_frame
+            self.globals = saved_globals
+        if value.__class__ is TailCall:
+            return self.run_tail_call(value)
+        return value
+
+    def call_function(self, func_ref, arg_values, func_name=None, line=None, column=None):
+        """Call a user-defined function / 调用用户定义的函数
+
+        Runs as a trampoline: when the body returns a TailCall, the callee
+        replaces the current call in the same loop, so tail-recursive code runs
+        in constant Python stack.
+        以蹦床方式运行：函数体返回TailCall时，被调用者在同一循环中替换当前调用，
+        因此尾递归代码只占用常量的Python栈。
+        """
+        saved_frame = self.frame
+        saved_globals = self.globals
+        tail = None  # 当前正在执行的尾调用节点 Tail call node being run
+        try:
+            while True:
+                func_node = func_ref.func_node
+                params = func_node.params
+
+                # Check parameter count / 检查参数数量
+                if len(arg_values) != len(params):
+                    raise ValueError(
+                        f"Function '{func_name or func_node.name}' requires {len(params)} arguments, "
+                        f"but {len(arg_values)} were given",
+                        line, column
+                    )
+
+                # Push a small frame linked to the closure frame
+                # 压入一个链接到闭包帧的小帧
+                frame = [None] * func_node.frame_size
+                frame[0] = func_ref.lexical_scope
+                frame[1:len(arg_values) + 1] = arg_values
+                if func_node.cells:
+                    wrap_cells(frame, func_node.cells)
+
+                # Execute function body, compiled once it is hot / 执行函数体，变热后使用编译后的形式
+                self.frame = frame
+                self.globals = func_ref.globals or saved_globals
+                if self.tiering is not None and not func_node.tail_calls:
+                    code = self.tiering.body_code(func_node.body, self.globals)
+                    if code is not None:
+                        signal = code(frame)
+                        return signal[0] if signal.__class__ is tuple else None
+                value = completion_value(self.visit(func_node.body))
+                if value.__class__ is not TailCall:
+                    return value
+
+                # Replace this call with the tail call / 用尾调用替换当前调用
+                tail = value.node
+                func_ref = value.func_ref
+                arg_values = value.args
+                func_name = tail.name
+                line = tail.token.line
+                column = tail.token.column
+        except EvilLangError as e:
+            # Calls replaced by tail calls leave no frame; report the one that failed
+            # 被尾调用替换的调用不留下帧；只报告出错的那一个
+            if tail is not None:
+                e.add_stack_frame(func_name, line, column)
+            raise
+        finally:
+            # Pop the frame / 弹出帧
+            self.frame = saved_frame
+            self.globals = saved_globals
+
+    def run_tail_call(self, value):
+        """Finish a tail call returned by a method body / 完成方法体返回的尾调用"""
+        node = value.node
+        line, column = node.token.line, node.token.column
+        try:
+            return self.call_function(value.func_ref, value.args, node.name, line, column)
+        except EvilLangError as e:
+            e.add_stack_frame(node.name, line, column)
+            raise
+
     def visit_FuncCall(self, node):
         """Execute function call / 执行函数调用"""
         func_name = node.name
@@ -390,22 +644,36 @@ class Interpreter:
 
         try:
             # Prepare arguments / 准备参数
-            arg_values = []
-            for arg in node.arguments:
-                arg_value = self.visit(arg)
+            arg_values = [self.visit(arg) for arg in node.arguments]
 
-                # Check if argument is a function name, if so, convert to function reference
-                # 检查参数是否为函数名，如果是，转换为函数引用
-                if isinstance(arg_value, str) and arg_value in self.functions:
-                    arg_value = FuncRef(self.functions[arg_value], self.global_scope.copy())
-
-                arg_values.append(arg_value)
+            # Look up the callee / 查找被调用者
+            depth = node.depth
+            if depth is None:
+                func = self.globals.values.get(func_name)
+            else:
+                frame = self.frame
+                for _ in range(depth):
+                    frame = frame[0]
+                func = frame[node.slot]
+                if node.cell:
+                    func = func.value
+
+            # User-defined function or closure / 用户定义的函数或闭包
+            if isinstance(func, FuncRef):
+                if node.tail:
+                    # Let the enclosing call run it / 交给外层调用执行
+                    return TailCall(func, arg_values, node)
+                return self.call_function(func, arg_values, func_name, func_line, func_column)
+
+            # Method stored in a variable / 存储在变量中的方法
+            if isinstance(func, BoundMethod):
+                return func.call(self, arg_values)
 
             # Check if built-in function / 检查是否是内置函数
-            if func_name in self.global_scope and callable(self.global_scope[func_name]):
+            if callable(func):
                 try:
                     # Call built-in function / 调用内置函数
-                    return self.global_scope[func_name](arg_values)
+                    return func(arg_values)
                 except EvilLangError as e:
                     # Already our custom error type, add stack frame and re-raise
                     # 已经是我们的自定义错误类型，添加堆栈帧并重新抛出
@@ -418,104 +686,7 @@ class Interpreter:
                     error.add_stack_frame(func_name, func_line, func_column)
                     raise error
 
-            # Check if it's a stored function reference (closure case)
-            # 检查是不是一个存储为变量的函数引用 (闭包情况)
-            if func_name in self.global_scope and isinstance(self.global_scope[func_name], FuncRef):
-                # Get function reference from variable / 从变量中获取函数引用
-                func_ref = self.global_scope[func_name]
-
-                # Get function definition / 获取函数定义
-                func_node = func_ref.func_node
-
-                # Check parameter count / 检查参数数量
-                if len(arg_values) != len(func_node.params):
-                    raise ValueError(
-                        f"Function '{func_name}' requires {len(func_node.params)} arguments, but {len(arg_values)} were given",
-                        func_line, func_column
-                    )
-
-                # Save current scope / 保存当前作用域
-                saved_scope = self.global_scope.copy()
-
-                # Use closure's lexical scope, note we don't copy here because we need to modify it directly
-                # 使用闭包的词法作用域，注意这里不要复制，因为我们需要直接修改它
-                if func_ref.lexical_scope:
-                    self.global_scope = func_ref.lexical_scope  # Use reference directly / 直接使用引用
-
-                # Bind parameters / 绑定参数
-                for i, param in enumerate(func_node.params):
-                    param_name = param.value
-                    self.global_scope[param_name] = arg_values[i]
-
-                # Execute function body / 执行函数体
-                return_value = None
-                try:
-                    self.visit(func_node.body)
-                except ReturnException as e:
-                    return_value = e.value
-                except EvilLangError as e:
-                    # Add stack frame information / 添加堆栈帧信息
-                    e.add_stack_frame(func_name, func_line, func_column)
-                    raise
-                finally:
-                    # Restore original scope / 恢复原来的作用域
-                    self.global_scope = saved_scope
-
-                return return_value
-
-            # Regular function call / 常规函数调用
-            elif func_name in self.functions:
-                func_node = self.functions[func_name]
-
-                # Check parameter count / 检查参数数量
-                if len(arg_values) != len(func_node.params):
-                    raise ValueError(
-                        f"Function '{func_name}' requires {len(func_node.params)} arguments, but {len(arg_values)} were given",
-                        func_line, func_column
-                    )
-
-                # Save current scope / 保存当前作用域
-                saved_scope = self.global_scope.copy()
-
-                # Create new scope for function execution
-                # 创建新的作用域用于函数执行
-                new_scope = saved_scope.copy()  # Copy current scope as base / 复制当前作用域作为基础
-                for i, param in enumerate(func_node.params):
-                    param_name = param.value
-                    new_scope[param_name] = arg_values[i]
-
-                # Set new scope / 设置新作用域
-                self.global_scope = new_scope
-
-                # Execute function body / 执行函数体
-                return_value = None
-                try:
-                    self.visit(func_node.body)
-                except ReturnException as e:
-                    return_value = e.value
-
-                    # If return value is a function name, convert to function reference
-                    # 如果返回值是一个函数名，将其转换为函数引用
-                    if isinstance(return_value, str) and return_value in self.functions:
-                        return_value = FuncRef(self.functions[return_value], self.global_scope.copy())
-                    # If return value is a function array, convert each function name to reference
-                    # 如果返回值是函数数组，将每个函数名转换为函数引用
-                    elif isinstance(return_value, list):
-                        for i, item in enumerate(return_value):
-                            if isinstance(item, str) and item in self.functions:
-                                return_value[i] = FuncRef(self.functions[item], self.global_scope.copy())
-                except EvilLangError as e:
-                    # Add current function call to the stack trace
-                    # 将当前函数调用添加到堆栈跟踪
-                    e.add_stack_frame(func_name, func_line, func_column)
-                    raise  # Re-raise to continue building the stack trace / 重新抛出以继续构建堆栈跟踪
-                finally:
-                    # Restore original scope / 恢复原来的作用域
-                    self.global_scope = saved_scope
-
-                return return_value
-            else:
-                raise NameError(f"Undefined function: {func_name}", func_line, func_column)
+            raise NameError(f"Undefined function: {func_name}", func_line, func_column)
 
         except EvilLangError as e:
             # Add current function to call stack if not already added
@@ -525,28 +696,18 @@ class Interpreter:
 
     def visit_Return(self, node):
         """Execute return statement / 执行return语句"""
-        line = node.token.line if hasattr(node, 'token') else None
-        column = node.token.column if hasattr(node, 'token') else None
-
         if node.expr:
-            value = self.visit(node.expr)
-
-            # If return value is a function name, convert to function reference
-            # 如果返回值是函数名，将其转换为函数引用
-            if isinstance(value, str) and value in self.functions:
-                value = FuncRef(self.functions[value], self.global_scope.copy())
-
-            raise ReturnException(value)
+            return Completion(Completion.RETURN, self.visit(node.expr))
         else:
-            raise ReturnException(None)
+            return Completion(Completion.RETURN)
 
     def visit_Break(self, node):
         """Execute break statement / 执行break语句"""
-        raise BreakException()
+        return BREAK
 
     def visit_Continue(self, node):
         """Execute continue statement / 执行continue语句"""
-        raise ContinueException()
+        return CONTINUE
 
     def visit_NoOp(self, node):
         """Execute no-op statement / 执行空操作语句"""
@@ -560,22 +721,49 @@ class Interpreter:
         # 获取方法名
         method_name = node.method
         
+        # 缓存命中时直接执行方法体：参数直接求值到新帧中，不遍历继承链，也不创建参数列表或绑定方法
+        if obj.__class__ is EvilInstance:
+            entry = cached_method(node.cache, obj, method_name)
+            if entry is not None and len(entry[0].params) == len(node.arguments):
+                method, owner = entry
+                shape = obj.shape
+                frame = owner.empty_frame(method, obj)
+                slot = 2
+                for arg in node.arguments:
+                    frame[slot] = self.visit(arg)
+                    slot += 1
+                # 参数求值可能添加了遮蔽该方法的字段
+                if obj.shape is shape or method_name not in obj.shape.fields:
+                    if method.cells:
+                        wrap_cells(frame, method.cells)
+                    return self.execute_body(method.body, frame, owner.globals)
+                return self.call_method(obj, method_name, frame[2:slot])
+        
         # 准备参数
         arg_values = []
         for arg in node.arguments:
             arg_values.append(self.visit(arg))
-        
+        return self.call_method(obj, method_name, arg_values)
+    
+    def call_method(self, obj, method_name, arg_values):
+        """Call a method without a cached lookup / 不经缓存查找地调用方法"""
         # 如果对象是 Evil Lang 实例
         if isinstance(obj, EvilInstance):
-            method = obj.get(method_name)
+            # 字段中存储的绑定方法
+            if obj.has_field(method_name):
+                method = obj.get_field(method_name)
+                if method is None:
+                    raise NameError(f"Instance has no method '{method_name}'")
+                if isinstance(method, BoundMethod):
+                    return method.call(self, arg_values)
+                raise TypeError(f"'{method_name}' is not a callable method")
+            
+            # 类方法：直接创建调用帧并执行
+            method, owner = obj.evil_class.find_method(method_name)
             if method is None:
                 raise NameError(f"Instance has no method '{method_name}'")
-            
-            # 如果是绑定方法，调用它
-            if isinstance(method, BoundMethod):
-                return method.call(self, arg_values)
-            else:
-                raise TypeError(f"'{method_name}' is not a callable method")
+            frame = owner.method_frame(method, obj, arg_values)
+            return self.execute_body(method.body, frame, owner.globals)
         
         # 如果对象是字典，尝试获取方法
         elif isinstance(obj, dict) and method_name in obj:
@@ -583,42 +771,7 @@ class Interpreter:
             
             # 如果是函数引用，调用它
             if isinstance(method, FuncRef):
-                func_node = method.func_node
-                
-                # 检查参数数量
-                if len(arg_values) != len(func_node.params):
-                    raise ValueError(
-                        f"Method '{method_name}' requires {len(func_node.params)} arguments, "
-                        f"but {len(arg_values)} were given"
-                    )
-                
-                # 创建新作用域
-                saved_scope = self.global_scope.copy()
-                saved_functions = self.functions.copy()
-                
-                # 创建闭包作用域
-                new_scope = method.lexical_scope.copy() if method.lexical_scope else {}
-                
-                # 绑定参数
-                for i, param in enumerate(func_node.params):
-                    new_scope[param.value] = arg_values[i]
-                
-                # 设置新作用域
-                self.global_scope = new_scope
-                self.functions = saved_functions
-                
-                try:
-                    # 执行函数体
-                    self.visit(func_node.body)
-                    return_value = None
-                except ReturnException as e:
-                    return_value = e.value
-                finally:
-                    # 恢复原作用域
-                    self.global_scope = saved_scope
-                    self.functions = saved_functions
-                
-                return return_value
+                return self.call_function(method, arg_values, method_name)
             else:
                 raise TypeError(f"'{method_name}' is not a callable method")
         else:
@@ -639,8 +792,8 @@ class Interpreter:
             from_path=self.filename
         )
         
-        # 将导入的符号添加到当前作用域
-        self.global_scope.update(imports)
+        # 将导入的符号添加到全局作用域
+        self.globals.values.update(imports)
     
     def visit_ExportStmt(self, node):
         """Execute export statement / 执行导出语句"""
@@ -656,18 +809,14 @@ class Interpreter:
                 self.visit(item.value)
                 
                 # 获取导出的值
-                if item.name in self.global_scope:
-                    self.module_exports[item.name] = self.global_scope[item.name]
-                elif item.name in self.functions:
-                    self.module_exports[item.name] = self.functions[item.name]
+                if item.name in self.globals.values:
+                    self.module_exports[item.name] = self.globals.values[item.name]
                 else:
                     raise NameError(f"Cannot export undefined variable '{item.name}'")
             else:
                 # 这是一个命名导出（export { x, y, z }）
-                if item.name in self.global_scope:
-                    self.module_exports[item.name] = self.global_scope[item.name]
-                elif item.name in self.functions:
-                    self.module_exports[item.name] = self.functions[item.name]
+                if item.name in self.globals.values:
+                    self.module_exports[item.name] = self.globals.values[item.name]
                 else:
                     raise NameError(f"Cannot export undefined variable '{item.name}'")
 
@@ -681,16 +830,21 @@ class Interpreter:
             else:
                 raise NameError(f"Superclass '{node.superclass}' is not defined")
         
-        # 创建类对象
-        evil_class = EvilClass(node.name, superclass, {}, node.constructor)
+        # 创建类对象，方法在声明类的环境中执行
+        evil_class = EvilClass(node.name, superclass, {}, node.constructor,
+                               capture(self.frame, node.captures), self.globals)
         
         # 添加方法
-        for method in node.methods:
-            evil_class.methods[method.name] = method
+        evil_class.declare(node)
         
         # 将类添加到类字典和全局作用域
         self.classes[node.name] = evil_class
-        self.global_scope[node.name] = evil_class
+        if node.slot is None:
+            self.globals.values[node.name] = evil_class
+        elif node.cell:
+            self.frame[node.slot].value = evil_class
+        else:
+            self.frame[node.slot] = evil_class
         
         return evil_class
     
@@ -701,6 +855,20 @@ class Interpreter:
             raise NameError(f"Class '{node.class_name}' is not defined")
         
         evil_class = self.classes[node.class_name]
+        constructor = evil_class.constructor
+        
+        # 直接运行构造函数：参数求值到新帧中，不创建参数列表
+        if constructor is not None and len(constructor.params) == len(node.arguments):
+            instance = EvilInstance(evil_class)
+            frame = evil_class.empty_frame(constructor, instance)
+            slot = 2
+            for arg in node.arguments:
+                frame[slot] = self.visit(arg)
+                slot += 1
+            if constructor.cells:
+                wrap_cells(frame, constructor.cells)
+            self.execute_body(constructor.body, frame, evil_class.globals)
+            return instance
         
         # 准备构造函数参数
         args = []
@@ -712,39 +880,43 @@ class Interpreter:
     
     def visit_ThisExpr(self, node):
         """Execute this expression / 执行this表达式"""
-        if 'this' in self.global_scope:
-            return self.global_scope['this']
-        else:
+        if node.depth is None:
             raise RuntimeError("'this' can only be used inside a class method")
+        frame = self.frame
+        for _ in range(node.depth):
+            frame = frame[0]
+        if node.cell:
+            return frame[node.slot].value
+        return frame[node.slot]
     
     def visit_SuperExpr(self, node):
         """Execute super expression / 执行super表达式"""
-        # TODO: 实现 super 支持
-        raise RuntimeError("'super' is not yet implemented")
+        raise RuntimeError("'super' must be called: use super(...) or super.method(...)",
+                           node.token.line, node.token.column)
+    
+    def visit_SuperCall(self, node):
+        """Execute super(...) or super.method(...) / 执行super调用"""
+        if node.depth is None:
+            raise RuntimeError("'super' can only be used inside a class method",
+                               node.token.line, node.token.column)
+        instance = self.visit_ThisExpr(node)
+        
+        # 目标在类声明时已计算，缓存命中时无需查找
+        target = cached_super(node.cache, instance, node)
+        args = [self.visit(arg) for arg in node.arguments]
+        frame = super_frame(target, instance, args)
+        if frame is None:
+            return None
+        method, owner = target
+        result = self.execute_body(method.body, frame, owner.globals)
+        return None if node.method is None else result
     
     def visit_TryStmt(self, node):
         """Execute try statement / 执行try语句"""
-        exception_caught = None
-        return_value = None
-        
-        # 执行try块
+        # 执行try块；return、break和continue作为完成信号返回，不会被当作异常捕获
         try:
-            return_value = self.visit(node.try_block)
-        except ReturnException as e:
-            # Return语句不应该被捕获为异常
-            if node.finally_block:
-                self.visit(node.finally_block)
-            raise
-        except BreakException:
-            # Break语句不应该被捕获为异常
-            if node.finally_block:
-                self.visit(node.finally_block)
-            raise
-        except ContinueException:
-            # Continue语句不应该被捕获为异常
-            if node.finally_block:
-                self.visit(node.finally_block)
-            raise
+            result = self.visit(node.try_block)
+            exception_caught = None
         except EvilLangException as e:
             # 用户抛出的异常
             exception_caught = e
@@ -754,34 +926,34 @@ class Interpreter:
         except Exception as e:
             # 其他Python异常
             exception_caught = EvilLangException(str(e))
-        
-        # 如果捕获到异常且有catch子句
-        if exception_caught and node.catch_clause:
-            # 保存当前作用域
-            saved_scope = self.global_scope.copy()
-            
-            # 创建新作用域，包含异常参数
-            new_scope = saved_scope.copy()
-            new_scope[node.catch_clause.param] = exception_caught.value
-            
-            # 执行catch块
-            self.global_scope = new_scope
-            try:
-                return_value = self.visit(node.catch_clause.body)
-                exception_caught = None  # 异常已处理
-            finally:
-                # 恢复作用域
-                self.global_scope = saved_scope
-        
-        # 执行finally块（如果有）
-        if node.finally_block:
-            self.visit(node.finally_block)
-        
-        # 如果异常未被处理，重新抛出
-        if exception_caught:
-            raise exception_caught
-        
-        return return_value
+
+        try:
+            if exception_caught is not None:
+                # 没有catch子句时重新抛出
+                if node.catch_clause is None:
+                    raise exception_caught
+
+                # 压入包含异常参数的新帧
+                saved_frame = self.frame
+                self.frame = new_frame(saved_frame, node.catch_clause.frame_size)
+                self.frame[1] = exception_caught.value
+                wrap_cells(self.frame, node.catch_clause.cells)
+
+                # 执行catch块
+                try:
+                    result = self.visit(node.catch_clause.body)
+                finally:
+                    # 弹出帧
+                    self.frame = saved_frame
+        finally:
+            # 执行finally块（如果有），即使catch块抛出异常也会执行；
+            # finally块中的return、break或continue优先于之前的完成
+            if node.finally_block:
+                final = self.visit(node.finally_block)
+                if final.__class__ is Completion:
+                    result = final
+
+        return result
     
     def visit_ThrowStmt(self, node):
         """Execute throw statement / 执行throw语句"""
@@ -791,10 +963,55 @@ class Interpreter:
         # 抛出用户异常
         raise EvilLangException(value)
     
+    def resolve(self, tree):
+        """Bind variables to frame slots before execution / 执行前将变量绑定到帧槽位"""
+        return Resolver(self.globals.values.keys()).resolve(tree)
+
+    def prepare(self, tree):
+        """Resolve a program and compile it for the selected engine 解析程序并为所选引擎编译
+
+        Returns the callable that runs the program, or None on the tree
+        walker. The resolver and the compilers recurse over the tree, so a
+        too deeply nested expression runs out of Python stack here, before
+        anything runs; that is reported as such and not as deep recursion.
+        返回运行程序的可调用对象，语法树遍历器返回None。解析器和编译器递归遍历语法树，因此嵌套过深的
+        表达式在此处、在任何代码运行之前耗尽Python栈；这种情况按嵌套过深报告，而不是深度递归。
+        """
+        try:
+            self.resolve(tree)
+            if self.backend is not None:
+                return self.backend.prepare(tree)
+        except RecursionError:
+            raise RuntimeError("Expression nesting too deep (the Python stack ran out while compiling)") from None
+        return None
+
+    def execute(self, tree):
+        """Resolve and run a program with the selected engine / 使用所选引擎解析并运行程序"""
+        program = self.prepare(tree)
+        if program is not None:
+            return program()
+        result = self.visit(tree)
+        if result.__class__ is Completion:
+            # A top-level return, break or continue ends the program / 顶层的return、break或continue结束程序
+            return None
+        return result
+
     def interpret(self, tree):
         """Main interpreter entry point / 解释器主入口点"""
         try:
-            return self.visit(tree)
+            return self.execute(tree)
+        except RecursionError:
+            # Recursive engines nest Python frames for every Evil Lang call and run out
+            # long before MAX_RECURSION_DEPTH; the vm engine keeps its frames on the heap
+            # 递归引擎的每次Evil Lang调用都嵌套Python帧，远在MAX_RECURSION_DEPTH之前就会耗尽；vm引擎在堆上保存帧
+            if self.engine == 'vm':
+                message = "Maximum recursion depth exceeded (the Python stack ran out)"
+            else:
+                message = ("Maximum recursion depth exceeded (the Python stack ran out; "
+                           "use --engine=vm for deep recursion)")
+            error = RuntimeError(message)
+            error.add_stack_frame("main", None, None)
+            raise error from None
         except EvilLangError as e:
             # Add main program to the call stack
             # 将主程序添加到调用堆栈
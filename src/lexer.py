@@ -4,6 +4,9 @@
 # Author: Evil0ctal
 # Date: 2025-05-04
 
+import re
+import sys
+from array import array
 from enum import Enum, auto
 
 
@@ -66,6 +69,8 @@ KEYWORDS = {
 class Token:
     """Token class with position tracking 带位置追踪的标记类"""
 
+    __slots__ = ('type', 'value', 'line', 'column')
+
     def __init__(self, token_type, value, line, column):
         self.type = token_type
         self.value = value
@@ -76,229 +81,278 @@ class Token:
         return f"Token({self.type}, '{self.value}', {self.line}:{self.column})"
 
 
-# 词法分析器
-class Lexer:
-    """Lexical analyzer with Unicode support 支持Unicode的词法分析器"""
-
-    def __init__(self, source_code):
-        self.source = source_code
-        self.position = 0
-        self.line = 1
-        self.column = 1
-        self.current_char = self.source[0] if self.source else None
-
-    def save_state(self):
-        """Save the current lexer state 保存当前词法分析器状态"""
-        return {
-            'position': self.position,
-            'line': self.line,
-            'column': self.column,
-            'current_char': self.current_char
-        }
-
-    def restore_state(self, state):
-        """Restore the lexer to a saved state 恢复词法分析器到保存的状态"""
-        self.position = state['position']
-        self.line = state['line']
-        self.column = state['column']
-        self.current_char = state['current_char']
-
-    def advance(self):
-        """Advance to next character 前进到下一个字符"""
-        self.position += 1
-
-        if self.current_char == '\n':
-            self.line += 1
-            self.column = 1
+# 操作符和标点符号到标记类型的映射 Operator and punctuation to token type mapping
+SYMBOLS = {
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+    ',': TokenType.COMMA,
+    ':': TokenType.COLON,
+    '.': TokenType.DOT,
+    ';': TokenType.SEMICOLON,
+}
+for _op in ('==', '!=', '<=', '>=', '&&', '||', '++', '--', '+=', '-=', '*=', '/=', '%=',
+            '+', '-', '*', '/', '%', '=', '<', '>', '!', '&', '|', '?'):
+    SYMBOLS[_op] = TokenType.OPERATOR
+
+# 字符串中的转义序列，其他转义原样保留 Escape sequences in strings; others are kept as written
+ESCAPES = {'n': '\n', 't': '\t', '\\': '\\', '"': '"'}
+
+# One alternation matches the whitespace and comments before a token and the
+# token itself; the name of the group that matched gives the token's kind.
+# The last two alternatives match at the end of the source and at any other
+# character, so a match never fails and the skipped prefix is never re-scanned.
+# 一个选择分支同时匹配标记之前的空白和注释以及标记本身，匹配的分组名即标记的种类。
+# 最后两个分支分别匹配源码末尾和任意其他字符，因此匹配不会失败，跳过的前缀也不会被重新扫描。
+_TOKEN = re.compile(r'''
+    (?:\s+|//[^\n]*)*
+    (?:
+        (?P<NAME>[^\W\d]\w*)
+      | (?P<SYMBOL>==|!=|<=|>=|&&|\|\||\+\+|--|[-+*/%]=|[-+*/%=<>!&|?(){}\[\],:.;])
+      | (?P<NUMBER>\d[\d.]*)
+      | (?P<STRING>"(?:[^"\\]|\\.)*")
+      | (?P<END>\Z)
+      | (?P<ERROR>.)
+    )''', re.VERBOSE | re.DOTALL)
+
+_ESCAPE = re.compile(r'\\(.)', re.DOTALL)
+
+# 标记类型编号到标记类型的映射 Token type id to token type mapping
+TOKEN_TYPES = [None] * (max(token_type.value for token_type in TokenType) + 1)
+for _token_type in TokenType:
+    TOKEN_TYPES[_token_type.value] = _token_type
+
+_SYMBOL_IDS = {text: token_type.value for text, token_type in SYMBOLS.items()}
+_IDENTIFIER = TokenType.IDENTIFIER.value
+_KEYWORD = TokenType.KEYWORD.value
+_NUMBER = TokenType.NUMBER.value
+_STRING = TokenType.STRING.value
+_EOF = TokenType.EOF.value
+
+# 值就是源码文本的标记类型（符号） Token types whose value is their source text (symbols)
+_TEXT_VALUES = [token_type is not None and token_type not in (
+    TokenType.IDENTIFIER, TokenType.NUMBER, TokenType.STRING, TokenType.KEYWORD, TokenType.EOF)
+    for token_type in TOKEN_TYPES]
+
+
+def _unescape(match):
+    return ESCAPES.get(match.group(1), match.group(0))
+
+
+class TokenBuffer:
+    """Packed token stream of a source 源码的紧凑标记流
+
+    Tokens are stored in parallel `array('i')` columns: type id, start and
+    end offset, line and column. The column is taken from the start of the
+    current line during the scan, so it costs the same on a single-line data
+    literal as on short lines. A token's value is materialized from its
+    source slice only when asked for; Token objects are only created by
+    `token()`. A large source therefore costs five machine integers per
+    token. A lexical error stops the scan: the tokens before it are kept and
+    the error is in `error`.
+    标记按列存放在并行的 `array('i')` 中：类型编号、起始和结束偏移、行号和列号。列号在扫描时由当前行
+    的起始位置得出，因此单行的数据字面量与短行的代价相同。标记的值只在需要时从源码切片中生成；
+    Token对象只由 `token()` 创建，因此大型源码每个标记只占用五个机器整数。词法错误会停止扫描：
+    之前的标记保留，错误保存在 `error` 中。
+
+    Identifier and string literal values go through `symbols`, the symbol
+    table of this compilation: every occurrence of a name or of a repeated
+    literal is one shared object, so the AST holds each text once and dict
+    lookups on it hit the identity fast path. Values are also interned
+    process-wide, which makes them the very keys the interpreter's own
+    dicts (globals, builtins, instance fields) are built from.
+    标识符和字符串字面量的值经过本次编译的符号表 `symbols`：同一名称或重复字面量的每次出现都是
+    同一个共享对象，因此语法树中每段文本只保存一次，对它的字典查找会命中同一性快速路径。
+    这些值还在进程范围内驻留，因此与解释器自身字典（全局变量、内置函数、实例字段）的键是同一对象。
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.types = array('i')   # 类型编号 Type ids (TokenType values)
+        self.starts = array('i')  # 起始偏移 Start offsets
+        self.ends = array('i')    # 结束偏移 End offsets
+        self.lines = array('i')   # 行号，字符串为其结束的行 Lines; a string takes the line it ends on
+        self.columns = array('i') # 列号，字符串为其开始的列 Columns; a string takes the column it starts at
+        self.error = None         # 最后一个标记之后的词法错误 Lexical error after the last token
+        self.symbols = {}         # 文本 -> 共享的驻留字符串 Text -> shared interned string
+        try:
+            self.scan()
+        except Exception as error:
+            self.error = error
+
+    def __len__(self):
+        return len(self.types)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield self.token(index)
+
+    def scan(self):
+        """Scan the whole source in one pass / 一次扫描整个源码"""
+        source = self.source
+        add_type = self.types.append
+        add_start = self.starts.append
+        add_end = self.ends.append
+        add_line = self.lines.append
+        add_column = self.columns.append
+        length = len(source)
+        line = 1
+        line_start = 0  # 当前行的起始偏移 Offset of the current line's start
+        newline = source.find('\n')  # 下一个换行位置 Offset of the next newline
+        if newline < 0:
+            newline = length
+
+        for match in _TOKEN.finditer(source):
+            kind = match.lastgroup
+            start, end = match.span(kind)
+
+            # 跳过的空白和注释中的换行 Newlines in the skipped whitespace and comments
+            if start > newline:
+                line += source.count('\n', newline, start)
+                line_start = source.rfind('\n', newline, start) + 1
+                newline = source.find('\n', start)
+                if newline < 0:
+                    newline = length
+            column = start - line_start + 1
+
+            if kind == 'NAME':
+                token_type = _KEYWORD if match.group(kind) in KEYWORDS else _IDENTIFIER
+            elif kind == 'SYMBOL':
+                token_type = _SYMBOL_IDS[match.group(kind)]
+            elif kind == 'NUMBER':
+                if match.group(kind).count('.') > 1:
+                    raise Exception(f"Invalid number format: {match.group(kind)} at {line}:{column}")
+                token_type = _NUMBER
+            elif kind == 'STRING':
+                token_type = _STRING
+                if end > newline:
+                    # 字符串标记位于其结束的行 A string token takes the line it ends on
+                    line += source.count('\n', start, end)
+                    line_start = source.rfind('\n', start, end) + 1
+                    newline = source.find('\n', end)
+                    if newline < 0:
+                        newline = length
+            elif kind == 'END':
+                token_type = _EOF
+            elif match.group(kind) == '"':
+                end_line = line + source.count('\n', start)
+                raise Exception(f"Unterminated string at {end_line}:{column}")
+            else:
+                raise Exception(f"Unexpected character: '{match.group(kind)}' at {line}:{column}")
+
+            add_type(token_type)
+            add_start(start)
+            add_end(end)
+            add_line(line)
+            add_column(column)
+
+    def column(self, offset):
+        """Column of a source offset / 源码偏移所在的列号"""
+        return offset - self.source.rfind('\n', 0, offset)
+
+    def value(self, index):
+        """Token value materialized from its source text / 由源码文本生成的标记值"""
+        token_type = self.types[index]
+        if token_type == _EOF:
+            return None
+        text = self.source[self.starts[index]:self.ends[index]]
+        if token_type == _IDENTIFIER:
+            return self.symbol(text)
+        if token_type == _KEYWORD:
+            return KEYWORDS[text]
+        if token_type == _NUMBER:
+            return float(text) if '.' in text else int(text)
+        if token_type == _STRING:
+            text = text[1:-1]
+            return self.symbol(_ESCAPE.sub(_unescape, text) if '\\' in text else text)
+        return text
+
+    def symbol(self, text):
+        """The shared string for a text, from the symbol table / 符号表中文本对应的共享字符串"""
+        symbol = self.symbols.get(text)
+        if symbol is None:
+            symbol = self.symbols[text] = sys.intern(text)
+        return symbol
+
+    def token(self, index):
+        """Token object for one token / 单个标记的Token对象"""
+        token_type = self.types[index]
+        if _TEXT_VALUES[token_type]:
+            value = self.source[self.starts[index]:self.ends[index]]
         else:
-            self.column += 1
+            value = self.value(index)
+        return Token(TOKEN_TYPES[token_type], value, self.lines[index], self.columns[index])
 
-        self.current_char = self.source[self.position] if self.position < len(self.source) else None
+    def read(self, index):
+        """Token at `index` as a consumer sees it / 消费者所见的 `index` 处的标记
 
-    def skip_whitespace(self):
-        """Skip whitespace characters 跳过空白字符"""
-        while self.current_char is not None and self.current_char.isspace():
-            self.advance()
+        Past the last scanned token this raises the lexical error that
+        stopped the scan; past the EOF token it returns EOF again.
+        超出最后扫描到的标记时抛出停止扫描的词法错误；超出EOF标记时再次返回EOF。
+        """
+        count = len(self.types)
+        if index < count:
+            return self.token(index)
+        if self.error is not None:
+            raise self.error
+        return self.token(count - 1)
 
-    def skip_comment(self):
-        """Skip single-line comments 跳过双斜杠后的单行注释"""
-        if self.current_char == '/' and self.peek() == '/':
-            self.advance()  # 跳过第一个斜杠
-            self.advance()  # 跳过第二个斜杠
 
-            while self.current_char is not None and self.current_char != '\n':
-                self.advance()
+def tokenize(source):
+    """Tokenize a whole source, ending with the EOF token / 对整个源码进行标记化，以EOF标记结尾"""
+    buffer = TokenBuffer(source)
+    if buffer.error is not None:
+        raise buffer.error
+    return list(buffer)
 
-    def peek(self):
-        """Look ahead one character 向前查看一个字符"""
-        peek_pos = self.position + 1
-        if peek_pos >= len(self.source):
-            return None
-        return self.source[peek_pos]
 
-    def get_number(self):
-        """Parse numeric literals 解析数字字面量"""
-        start_column = self.column
-        result = ''
+# 词法分析器
+class Lexer:
+    """Lexical analyzer with Unicode support 支持Unicode的词法分析器
+
+    A compatibility wrapper over `TokenBuffer`: the source is tokenized in
+    one pass and `get_next_token` creates the Token objects one at a time.
+    A lexical error is still raised when the token it stands for is
+    requested.
+    `TokenBuffer` 的兼容包装器：一次完成整个源码的标记化，`get_next_token` 逐个创建Token对象。
+    词法错误仍在请求到其所在的标记时抛出。
+
+    The state is the index of the next token. `position`, `line`, `column`
+    and `current_char` describe the source just after the last token handed
+    out and are derived from it. Nothing rewinds: a parser that needs to look
+    ahead peeks into `buffer` instead.
+    状态即下一个标记的索引。`position`、`line`、`column` 和 `current_char` 描述最后返回的标记
+    之后的源码位置，均由索引推导。不支持回溯：需要向前查看的解析器直接查看 `buffer`。
+    """
+
+    def __init__(self, source_code):
+        self.source = source_code
+        self.buffer = TokenBuffer(source_code)
+        self.index = 0  # 下一个标记的索引 Index of the next token
 
-        while self.current_char is not None and (self.current_char.isdigit() or self.current_char == '.'):
-            result += self.current_char
-            self.advance()
+    @property
+    def position(self):
+        return self.buffer.ends[self.index - 1] if self.index else 0
 
-        try:
-            if '.' in result:
-                return Token(TokenType.NUMBER, float(result), self.line, start_column)
-            else:
-                return Token(TokenType.NUMBER, int(result), self.line, start_column)
-        except ValueError:
-            raise Exception(f"Invalid number format: {result} at {self.line}:{start_column}")
-
-    def get_identifier(self):
-        """Parse identifiers and keywords 解析标识符和关键词"""
-        start_column = self.column
-        start_line = self.line
-        result = ''
-
-        while self.current_char is not None and (self.current_char.isalnum() or self.current_char == '_'):
-            result += self.current_char
-            self.advance()
-
-        # First check if it's a keyword
-        if result in KEYWORDS:
-            token_type = TokenType.KEYWORD
-            token_value = KEYWORDS[result]
-        else:
-            token_type = TokenType.IDENTIFIER
-            token_value = result
-
-        return Token(token_type, token_value, start_line, start_column)
-
-    def get_string(self):
-        """Parse string literals with escape sequences 解析带转义序列的字符串字面量"""
-        start_column = self.column
-        self.advance()  # 跳过开始的引号
-        result = ''
-
-        while self.current_char is not None and self.current_char != '"':
-            if self.current_char == '\\':
-                self.advance()
-                if self.current_char == 'n':
-                    result += '\n'
-                elif self.current_char == 't':
-                    result += '\t'
-                elif self.current_char == '\\':
-                    result += '\\'
-                elif self.current_char == '"':
-                    result += '"'
-                else:
-                    result += '\\' + self.current_char
-            else:
-                result += self.current_char
-            self.advance()
+    @property
+    def line(self):
+        return self.buffer.lines[self.index - 1] if self.index else 1
 
-        if self.current_char is None:
-            raise Exception(f"Unterminated string at {self.line}:{start_column}")
+    @property
+    def column(self):
+        return self.buffer.column(self.position)
 
-        self.advance()  # 跳过结束的引号
-        return Token(TokenType.STRING, result, self.line, start_column)
+    @property
+    def current_char(self):
+        position = self.position
+        return self.source[position] if position < len(self.source) else None
 
     def get_next_token(self):
-        """Main tokenization loop 标记化主循环"""
-        while self.current_char is not None:
-            # 跳过空白字符
-            if self.current_char.isspace():
-                self.skip_whitespace()
-                continue
-
-            # 跳过注释
-            if self.current_char == '/' and self.peek() == '/':
-                self.skip_comment()
-                continue
-
-            # 数字
-            if self.current_char.isdigit():
-                return self.get_number()
-
-            # 标识符和关键词
-            if self.current_char.isalpha() or self.current_char == '_':
-                return self.get_identifier()
-
-            # 字符串
-            if self.current_char == '"':
-                return self.get_string()
-
-            # 各种标点符号和操作符
-            if self.current_char == '(':
-                token = Token(TokenType.LPAREN, '(', self.line, self.column)
-                self.advance()
-                return token
-
-            if self.current_char == ')':
-                token = Token(TokenType.RPAREN, ')', self.line, self.column)
-                self.advance()
-                return token
-
-            if self.current_char == '{':
-                token = Token(TokenType.LBRACE, '{', self.line, self.column)
-                self.advance()
-                return token
-
-            if self.current_char == '}':
-                token = Token(TokenType.RBRACE, '}', self.line, self.column)
-                self.advance()
-                return token
-
-            if self.current_char == '[':
-                token = Token(TokenType.LBRACKET, '[', self.line, self.column)
-                self.advance()
-                return token
-
-            if self.current_char == ']':
-                token = Token(TokenType.RBRACKET, ']', self.line, self.column)
-                self.advance()
-                return token
-
-            if self.current_char == ',':
-                token = Token(TokenType.COMMA, ',', self.line, self.column)
-                self.advance()
-                return token
-
-            if self.current_char == ':':
-                token = Token(TokenType.COLON, ':', self.line, self.column)
-                self.advance()
-                return token
-
-            if self.current_char == '.':
-                token = Token(TokenType.DOT, '.', self.line, self.column)
-                self.advance()
-                return token
-
-            if self.current_char == ';':
-                token = Token(TokenType.SEMICOLON, ';', self.line, self.column)
-                self.advance()
-                return token
-
-            # 操作符
-            if self.current_char in '+-*/%=<>!&|?':  # 添加了 '?' 和 '%' 支持三元运算符和模运算
-                column = self.column
-                op = self.current_char
-                self.advance()
-
-                # 处理双字符操作符: ==, !=, <=, >=, &&, ||
-                if self.current_char in '=&|':
-                    if (op == '=' and self.current_char == '=') or \
-                            (op == '!' and self.current_char == '=') or \
-                            (op == '<' and self.current_char == '=') or \
-                            (op == '>' and self.current_char == '=') or \
-                            (op == '&' and self.current_char == '&') or \
-                            (op == '|' and self.current_char == '|'):
-                        op += self.current_char
-                        self.advance()
-
-                return Token(TokenType.OPERATOR, op, self.line, column)
-
-            # 未识别的字符
-            raise Exception(f"Unexpected character: '{self.current_char}' at {self.line}:{self.column}")
-
-        # 文件结束
-        return Token(TokenType.EOF, None, self.line, self.column)
+        """Return the next token 返回下一个标记"""
+        index = self.index
+        if index < len(self.buffer.types):
+            self.index = index + 1
+        return self.buffer.read(index)
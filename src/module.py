@@ -10,6 +10,7 @@ from .lexer import Lexer
 from .parser import Parser
 from .errors import RuntimeError as EvilRuntimeError
 from .config import Config
+from .environment import Environment
 
 
 class Module:
@@ -114,35 +115,30 @@ class ModuleManager:
         # 缓存模块
         self.modules[module_path] = module
         
-        # 在新的作用域中执行模块
-        saved_scope = self.interpreter.global_scope.copy()
-        saved_functions = self.interpreter.functions.copy()
+        # 在新的全局环境中执行模块
+        saved_globals = self.interpreter.globals
+        saved_frame = self.interpreter.frame
         saved_module_path = self.current_module_path
         
-        # 创建模块作用域
-        module_scope = {}
-        module_functions = {}
-        
-        # 添加内置函数到模块作用域
-        for name, func in self.interpreter.builtins.items():
-            module_scope[name] = func
+        # 创建模块环境并添加内置函数
+        module_env = Environment(values=dict(self.interpreter.builtins))
         
         # 设置当前模块路径
         self.current_module_path = module_path
         
         # 执行模块
-        self.interpreter.global_scope = module_scope
-        self.interpreter.functions = module_functions
+        self.interpreter.globals = module_env
+        self.interpreter.frame = None
         self.interpreter.module_exports = {}  # 收集导出
         
         try:
-            self.interpreter.visit(module.ast)
+            self.interpreter.execute(module.ast)
             module.exports = self.interpreter.module_exports.copy()
             module.loaded = True
         finally:
-            # 恢复原始作用域
-            self.interpreter.global_scope = saved_scope
-            self.interpreter.functions = saved_functions
+            # 恢复原始环境
+            self.interpreter.globals = saved_globals
+            self.interpreter.frame = saved_frame
             self.current_module_path = saved_module_path
             if hasattr(self.interpreter, 'module_exports'):
                 delattr(self.interpreter, 'module_exports')
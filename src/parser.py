@@ -5,8 +5,31 @@
 # Date: 2025-05-04
 
 from .ast import *
-from .lexer import TokenType
+from .lexer import Token, TokenType, TOKEN_TYPES
 from .errors import SyntaxError, EvilLangError
+from .runtime import BINARY_OPERATORS, UNARY_OPERATORS
+
+# 复合赋值操作符对应的二元操作符 Binary operator of each compound assignment operator
+COMPOUND_OPERATORS = {'+=': '+', '-=': '-', '*=': '*', '/=': '/', '%=': '%', '++': '+', '--': '-'}
+
+# 二元操作符的绑定力，数值越大结合越紧 Binding power of binary operators; higher binds tighter
+BINDING_POWERS = {
+    '||': 1,
+    '&&': 2,
+    '==': 3, '!=': 3,
+    '<': 4, '>': 4, '<=': 4, '>=': 4,
+    '+': 5, '-': 5,
+    '*': 6, '/': 6, '%': 6,
+}
+
+# 短路求值的逻辑操作符 Logical operators, evaluated with short-circuiting
+LOGICAL_OPERATORS = ('&&', '||')
+
+# 可以开始一个操作数的标记类型 Token types that can start an operand
+OPERAND_STARTS = frozenset((
+    TokenType.NUMBER, TokenType.STRING, TokenType.IDENTIFIER, TokenType.KEYWORD,
+    TokenType.OPERATOR, TokenType.LPAREN, TokenType.LBRACE, TokenType.LBRACKET,
+))
 
 
 class Parser:
@@ -14,12 +37,31 @@ class Parser:
 
     def __init__(self, lexer):
         self.lexer = lexer
-        self.current_token = self.lexer.get_next_token()
+        self.buffer = lexer.buffer  # 一次扫描得到的标记流 Token stream scanned in one pass
+        self.types = self.buffer.types
+        self.index = -1             # 当前标记在缓冲区中的索引 Buffer index of the current token
+        self.current_type = None    # 当前标记的类型 Type of the current token
         self.debug_mode = False
+        self.advance()
+
+    @property
+    def current_value(self):
+        """Value of the current token, read from the buffer / 从缓冲区读取的当前标记的值"""
+        return self.buffer.value(self.index)
+
+    @property
+    def current_token(self):
+        """Token object of the current token 当前标记的Token对象
+
+        The parser moves over the buffer's type column and only builds a
+        Token when an AST node or an error needs one.
+        解析器只在类型列上移动，仅在语法树节点或错误需要时才创建Token。
+        """
+        return self.buffer.token(self.index)
 
     def error(self, error_code, token):
         """Raise a parser error with detailed information"""
-        expected_token_name = self.current_token.type.name if hasattr(self, 'current_token') else "Unknown"
+        expected_token_name = self.current_type.name if self.current_type is not None else "Unknown"
         got_token_name = token.type.name if hasattr(token, 'type') else "Unknown"
 
         message = f"Parser error: Expected {expected_token_name}, got {got_token_name}"
@@ -37,12 +79,47 @@ class Parser:
         if self.debug_mode:
             print(f"Eating token: {self.current_token}, expecting: {token_type}")
 
-        if self.current_token.type == token_type:
-            result = self.current_token
-            self.current_token = self.lexer.get_next_token()
-            return result
+        if self.current_type == token_type:
+            self.advance()
         else:
-            self.error(f"Expected {token_type}, got {self.current_token.type}", self.current_token)
+            self.error(f"Expected {token_type}, got {self.current_type}", self.current_token)
+
+    def advance(self):
+        """Move to the next token 前进到下一个标记"""
+        index = self.index + 1
+        if index >= len(self.types):
+            # 抛出停止扫描的词法错误，或停留在EOF Raise the lexical error that stopped the scan, or stay on EOF
+            self.buffer.read(index)
+            index -= 1
+        self.index = index
+        self.current_type = TOKEN_TYPES[self.types[index]]
+
+    def peek(self, n=1):
+        """Type of the token `n` positions after the current one, consuming nothing
+        查看当前标记之后第 `n` 个标记的类型，不消费任何标记
+
+        Lookahead reads the buffer's columns like `advance`: looking ahead any
+        distance never lexes a character twice nor creates a Token.
+        向前查看与 `advance` 一样读取缓冲区的列：向前查看任意距离都不会重复词法分析字符，也不会创建Token。
+        """
+        return TOKEN_TYPES[self.types[self.lookahead(n)]]
+
+    def peek_value(self, n=1):
+        """Value of the token `n` positions after the current one 当前标记之后第 `n` 个标记的值"""
+        return self.buffer.value(self.lookahead(n))
+
+    def lookahead(self, n):
+        """Buffer index `n` positions after the current token 当前标记之后第 `n` 个标记的缓冲区索引
+
+        Like `advance`, this raises the lexical error that stopped the scan
+        when it is reached and stays on EOF past the end.
+        与 `advance` 一样，到达停止扫描的词法错误时将其抛出，超出末尾时停留在EOF。
+        """
+        index = self.index + n
+        if index >= len(self.types):
+            self.buffer.read(index)
+            index = len(self.types) - 1
+        return index
 
     def parse(self):
         """Entry point for parsing 解析入口点"""
@@ -59,7 +136,7 @@ class Parser:
         node = Compound()
         node.children = []
 
-        while self.current_token.type != TokenType.EOF:
+        while self.current_type != TokenType.EOF:
             statement = self.statement()
             node.children.append(statement)
 
@@ -70,106 +147,79 @@ class Parser:
         if self.debug_mode:
             print(f"Parsing statement, current token: {self.current_token}")
 
-        if self.current_token.type == TokenType.LBRACE:
+        if self.current_type == TokenType.LBRACE:
             return self.compound_statement()
 
-        elif self.current_token.type == TokenType.KEYWORD:
-            if self.current_token.value == 'VAR':
+        elif self.current_type == TokenType.KEYWORD:
+            keyword = self.current_value
+            if keyword == 'VAR':
                 return self.declaration_statement()
-            elif self.current_token.value == 'IF':
+            elif keyword == 'IF':
                 return self.if_statement()
-            elif self.current_token.value == 'WHILE':
+            elif keyword == 'WHILE':
                 return self.while_statement()
-            elif self.current_token.value == 'FOR':
+            elif keyword == 'FOR':
                 return self.for_statement()
-            elif self.current_token.value == 'PRINT':
+            elif keyword == 'PRINT':
                 return self.print_statement()
-            elif self.current_token.value == 'INPUT':
+            elif keyword == 'INPUT':
                 return self.input_statement()
-            elif self.current_token.value == 'FUNC':
+            elif keyword == 'FUNC':
                 return self.func_declaration()
-            elif self.current_token.value == 'RETURN':
+            elif keyword == 'RETURN':
                 return self.return_statement()
-            elif self.current_token.value == 'BREAK':
+            elif keyword == 'BREAK':
                 return self.break_statement()
-            elif self.current_token.value == 'CONTINUE':
+            elif keyword == 'CONTINUE':
                 return self.continue_statement()
-            elif self.current_token.value == 'IMPORT':
+            elif keyword == 'IMPORT':
                 return self.import_statement()
-            elif self.current_token.value == 'EXPORT':
+            elif keyword == 'EXPORT':
                 return self.export_statement()
-            elif self.current_token.value == 'CLASS':
+            elif keyword == 'CLASS':
                 return self.class_declaration()
-            elif self.current_token.value == 'TRY':
+            elif keyword == 'TRY':
                 return self.try_statement()
-            elif self.current_token.value == 'THROW':
+            elif keyword == 'THROW':
                 return self.throw_statement()
-            elif self.current_token.value in ['THIS', 'SUPER']:
+            elif keyword in ['THIS', 'SUPER']:
                 # Handle this/super as part of expression (e.g., this.name = value)
                 left = self.expr()
                 
-                # Expect assignment in statement context
-                if self.current_token.type == TokenType.OPERATOR and self.current_token.value == '=':
-                    op_token = self.current_token
-                    self.eat(TokenType.OPERATOR)  # '='
-                    right = self.expr()
+                # Expect assignment or a call in statement context
+                if self.at_assignment():
+                    node = self.assignment(left)
+                    self.eat(TokenType.SEMICOLON)
+                    return node
+                elif isinstance(left, (MethodCall, SuperCall)):
                     self.eat(TokenType.SEMICOLON)
-                    return Assign(left, op_token, right)
+                    return left
                 else:
                     self.error(f"Expected assignment operator after expression in statement context", self.current_token)
 
-        elif self.current_token.type == TokenType.IDENTIFIER:
-            # 保存当前词法分析器的状态，以便可能需要回溯
-            saved_lexer_position = self.lexer.position
-            saved_lexer_line = self.lexer.line
-            saved_lexer_column = self.lexer.column
-            saved_lexer_char = self.lexer.current_char
-            saved_token = self.current_token
-
-            # 先记住标识符，以便后续使用
-            var_name = self.current_token.value
-            self.eat(TokenType.IDENTIFIER)
-
-            # 检查标识符后面是什么
-            if self.current_token.type == TokenType.LPAREN:
-                # 回溯并解析函数调用
-                self.lexer.position = saved_lexer_position
-                self.lexer.line = saved_lexer_line
-                self.lexer.column = saved_lexer_column
-                self.lexer.current_char = saved_lexer_char
-                self.current_token = saved_token
-
+        elif self.current_type == TokenType.IDENTIFIER:
+            # 查看标识符后面是什么，无需回溯 Look past the identifier instead of rewinding
+            if self.peek() == TokenType.LPAREN:
                 func_call = self.func_call()
                 self.eat(TokenType.SEMICOLON)
                 return func_call
-            elif self.current_token.type == TokenType.OPERATOR and self.current_token.value == '=':
-                # 变量赋值
-                op_token = self.current_token
-                self.eat(TokenType.OPERATOR)  # '='
-                value = self.expr()
+            elif self.at_assignment(1):
+                # 变量赋值、复合赋值或自增自减：目标是变量本身
+                var_node = Var(self.current_token)
+                self.eat(TokenType.IDENTIFIER)
+                node = self.assignment(var_node)
                 self.eat(TokenType.SEMICOLON)
-
-                var_node = Var(saved_token)
-                return Assign(var_node, op_token, value)
+                return node
             else:
                 # 可能是数组访问、属性访问，后跟赋值操作
-                # 回溯，然后使用expr方法解析复杂表达式
-                self.lexer.position = saved_lexer_position
-                self.lexer.line = saved_lexer_line
-                self.lexer.column = saved_lexer_column
-                self.lexer.current_char = saved_lexer_char
-                self.current_token = saved_token
-
                 # 解析左侧表达式
                 left = self.expr()
 
                 # 如果是赋值表达式
-                if self.current_token.type == TokenType.OPERATOR and self.current_token.value == '=':
-                    op_token = self.current_token
-                    self.eat(TokenType.OPERATOR)  # '='
-                    right = self.expr()
+                if self.at_assignment():
+                    node = self.assignment(left)
                     self.eat(TokenType.SEMICOLON)
-                    return Assign(left, op_token, right)
+                    return node
                 else:
                     # Check if it's a method call or other valid expression statement
                     if isinstance(left, (FuncCall, MethodCall)):
@@ -179,11 +229,89 @@ class Parser:
                         # 必须是语句，所以应该是赋值
                         self.error(f"Expected assignment operator in statement context", self.current_token)
 
-        elif self.current_token.type == TokenType.SEMICOLON:
+        elif self.current_type == TokenType.SEMICOLON:
             return self.empty()
 
+        elif self.current_type == TokenType.OPERATOR and self.current_value in ('++', '--'):
+            # 前缀自增自减语句 ++x; / --x;
+            node = self.prefix_update()
+            self.eat(TokenType.SEMICOLON)
+            return node
+
         self.error(f"Unexpected token: {self.current_token}", self.current_token)
 
+    def at_assignment(self, n=0):
+        """Whether the token `n` positions ahead is an assignment operator 前方第 `n` 个标记是否为赋值操作符"""
+        if self.peek(n) != TokenType.OPERATOR:
+            return False
+        value = self.peek_value(n)
+        return value == '=' or value in COMPOUND_OPERATORS
+
+    def assignment(self, left):
+        """Parse the assignment operator and value after a target 解析目标之后的赋值操作符和值"""
+        op_token = self.current_token
+        if op_token.value != '=':
+            return self.compound_assignment(left, op_token)
+        self.eat(TokenType.OPERATOR)  # '='
+        return Assign(left, op_token, self.expr())
+
+    def compound_assignment(self, left, op_token):
+        """Parse +=, -=, *=, /=, %=, ++ or -- after a target 解析目标之后的复合赋值或自增自减"""
+        self.eat(TokenType.OPERATOR)
+        self.check_target(left, op_token)
+        right = None if op_token.value in ('++', '--') else self.expr()
+        return self.compound(left, op_token, right)
+
+    def prefix_update(self):
+        """Parse ++target or --target 解析 ++目标 或 --目标"""
+        op_token = self.current_token
+        self.eat(TokenType.OPERATOR)
+        left = self.expr()
+        self.check_target(left, op_token)
+        return self.compound(left, op_token, None)
+
+    def check_target(self, left, op_token):
+        if not isinstance(left, (Var, ArrayAccess, PropertyAccess)):
+            self.error(f"Invalid target for '{op_token.value}'", op_token)
+
+    def compound(self, left, op_token, right):
+        """Build a CompoundAssign; ++ and -- have no right operand and add or subtract 1
+        构建CompoundAssign；++ 和 -- 没有右操作数，加或减1"""
+        if right is None:
+            right = Number(Token(TokenType.NUMBER, 1, op_token.line, op_token.column))
+        op = COMPOUND_OPERATORS[op_token.value]
+        return CompoundAssign(left, op_token, op, right, BINARY_OPERATORS[op])
+
+    def call_arguments(self):
+        """Parse a parenthesized argument list 解析括号中的参数列表"""
+        self.eat(TokenType.LPAREN)
+        args = []
+        
+        if self.current_type != TokenType.RPAREN:
+            args.append(self.expr())
+            while self.current_type == TokenType.COMMA:
+                self.eat(TokenType.COMMA)
+                args.append(self.expr())
+        
+        self.eat(TokenType.RPAREN)
+        return args
+
+    def member_chain(self, node):
+        """Parse property accesses and method calls after a this/super expression
+        解析 this/super 表达式之后的属性访问和方法调用"""
+        while self.current_type == TokenType.DOT:
+            self.eat(TokenType.DOT)
+            prop_name = self.current_value
+            self.eat(TokenType.IDENTIFIER)
+            
+            # Check if it's a method call
+            if self.current_type == TokenType.LPAREN:
+                node = MethodCall(node, prop_name, self.call_arguments())
+            else:
+                node = PropertyAccess(node, prop_name)
+        
+        return node
+
     def compound_statement(self):
         """Parse compound statement (block) 解析复合语句（块）"""
         self.eat(TokenType.LBRACE)
@@ -191,7 +319,7 @@ class Parser:
         node.children = []
 
         # 处理块中的语句，直到遇到右花括号
-        while self.current_token.type != TokenType.RBRACE:
+        while self.current_type != TokenType.RBRACE:
             node.children.append(self.statement())
 
         self.eat(TokenType.RBRACE)
@@ -206,7 +334,7 @@ class Parser:
         var_node = Var(var_token)
         value_node = None
 
-        if self.current_token.type == TokenType.OPERATOR and self.current_token.value == '=':
+        if self.current_type == TokenType.OPERATOR and self.current_value == '=':
             self.eat(TokenType.OPERATOR)  # '='
             value_node = self.expr()
 
@@ -237,7 +365,7 @@ class Parser:
         if_body = self.statement()
 
         else_body = None
-        if self.current_token.type == TokenType.KEYWORD and self.current_token.value == 'ELSE':
+        if self.current_type == TokenType.KEYWORD and self.current_value == 'ELSE':
             self.eat(TokenType.KEYWORD)  # 'else'
             else_body = self.statement()
 
@@ -260,7 +388,7 @@ class Parser:
         self.eat(TokenType.LPAREN)
 
         # 初始化部分
-        if self.current_token.type == TokenType.KEYWORD and self.current_token.value == 'VAR':
+        if self.current_type == TokenType.KEYWORD and self.current_value == 'VAR':
             init_stmt = self.declaration_statement()
         else:
             init_stmt = self.assignment_statement()
@@ -269,15 +397,14 @@ class Parser:
         condition = self.expr()
         self.eat(TokenType.SEMICOLON)
 
-        # 更新部分
-        var_token = self.current_token
-        self.eat(TokenType.IDENTIFIER)
-        op_token = self.current_token
-        self.eat(TokenType.OPERATOR)  # '='
-        update_expr = self.expr()
-
-        var_node = Var(var_token)
-        update_stmt = Assign(var_node, op_token, update_expr)
+        # 更新部分：赋值、复合赋值或自增自减
+        if self.current_type == TokenType.OPERATOR and self.current_value in ('++', '--'):
+            update_stmt = self.prefix_update()
+        else:
+            left = self.expr()
+            if not self.at_assignment():
+                self.error("Expected assignment in for statement update", self.current_token)
+            update_stmt = self.assignment(left)
 
         self.eat(TokenType.RPAREN)
 
@@ -302,7 +429,7 @@ class Parser:
         self.eat(TokenType.LPAREN)
 
         prompt = None
-        if self.current_token.type != TokenType.RPAREN:
+        if self.current_type != TokenType.RPAREN:
             prompt = self.expr()
 
         self.eat(TokenType.RPAREN)
@@ -314,19 +441,19 @@ class Parser:
         """Parse function declaration 解析函数声明"""
         self.eat(TokenType.KEYWORD)  # 'func'
 
-        func_name = self.current_token.value
+        func_name = self.current_value
         self.eat(TokenType.IDENTIFIER)
 
         self.eat(TokenType.LPAREN)
         params = []
 
         # 解析参数列表
-        if self.current_token.type == TokenType.IDENTIFIER:
+        if self.current_type == TokenType.IDENTIFIER:
             param_token = self.current_token
             self.eat(TokenType.IDENTIFIER)
             params.append(Var(param_token))
 
-            while self.current_token.type == TokenType.COMMA:
+            while self.current_type == TokenType.COMMA:
                 self.eat(TokenType.COMMA)
                 param_token = self.current_token
                 self.eat(TokenType.IDENTIFIER)
@@ -352,7 +479,7 @@ class Parser:
 
         # 获取函数名称
         func_token = self.current_token  # 保存位置信息
-        func_name = self.current_token.value
+        func_name = self.current_value
         self.eat(TokenType.IDENTIFIER)
 
         if self.debug_mode:
@@ -363,12 +490,12 @@ class Parser:
         args = []
 
         # 解析参数列表
-        if self.current_token.type != TokenType.RPAREN:
+        if self.current_type != TokenType.RPAREN:
             # 添加第一个参数
             args.append(self.expr())
 
             # 处理剩余参数
-            while self.current_token.type == TokenType.COMMA:
+            while self.current_type == TokenType.COMMA:
                 self.eat(TokenType.COMMA)
                 args.append(self.expr())
 
@@ -385,7 +512,7 @@ class Parser:
         self.eat(TokenType.LPAREN)
 
         prompt = None
-        if self.current_token.type != TokenType.RPAREN:
+        if self.current_type != TokenType.RPAREN:
             prompt = self.expr()
 
         self.eat(TokenType.RPAREN)
@@ -397,7 +524,7 @@ class Parser:
         self.eat(TokenType.KEYWORD)  # 'return'
 
         expr = None
-        if self.current_token.type != TokenType.SEMICOLON:
+        if self.current_type != TokenType.SEMICOLON:
             expr = self.expr()
 
         self.eat(TokenType.SEMICOLON)
@@ -421,10 +548,10 @@ class Parser:
         self.eat(TokenType.LBRACKET)
         elements = []
 
-        if self.current_token.type != TokenType.RBRACKET:
+        if self.current_type != TokenType.RBRACKET:
             elements.append(self.expr())
 
-            while self.current_token.type == TokenType.COMMA:
+            while self.current_type == TokenType.COMMA:
                 self.eat(TokenType.COMMA)
                 elements.append(self.expr())
 
@@ -437,35 +564,35 @@ class Parser:
         self.eat(TokenType.LBRACE)
         pairs = {}
 
-        if self.current_token.type != TokenType.RBRACE:
+        if self.current_type != TokenType.RBRACE:
             # 解析第一个键值对
-            if self.current_token.type == TokenType.STRING:
-                key = self.current_token.value
+            if self.current_type == TokenType.STRING:
+                key = self.current_value
                 self.eat(TokenType.STRING)
-            elif self.current_token.type == TokenType.IDENTIFIER:
-                key = self.current_token.value
+            elif self.current_type == TokenType.IDENTIFIER:
+                key = self.current_value
                 self.eat(TokenType.IDENTIFIER)
             else:
-                self.error(f"Object key must be string or identifier, got: {self.current_token.type}", self.current_token)
+                self.error(f"Object key must be string or identifier, got: {self.current_type}", self.current_token)
                 
             self.eat(TokenType.COLON)
             value = self.expr()
             pairs[key] = value
 
             # 解析剩余的键值对
-            while self.current_token.type == TokenType.COMMA:
+            while self.current_type == TokenType.COMMA:
                 self.eat(TokenType.COMMA)
-                if self.current_token.type == TokenType.RBRACE:
+                if self.current_type == TokenType.RBRACE:
                     break  # 允许尾随逗号
                     
-                if self.current_token.type == TokenType.STRING:
-                    key = self.current_token.value
+                if self.current_type == TokenType.STRING:
+                    key = self.current_value
                     self.eat(TokenType.STRING)
-                elif self.current_token.type == TokenType.IDENTIFIER:
-                    key = self.current_token.value
+                elif self.current_type == TokenType.IDENTIFIER:
+                    key = self.current_value
                     self.eat(TokenType.IDENTIFIER)
                 else:
-                    self.error(f"Object key must be string or identifier, got: {self.current_token.type}", self.current_token)
+                    self.error(f"Object key must be string or identifier, got: {self.current_type}", self.current_token)
                     
                 self.eat(TokenType.COLON)
                 value = self.expr()
@@ -487,10 +614,10 @@ class Parser:
 
     def expr(self):
         """Parse expression 解析表达式"""
-        node = self.logic_expr()
+        node = self.binary_expr(1)
 
         # 检查是否有三元运算符
-        if self.current_token.type == TokenType.OPERATOR and self.current_token.value == '?':
+        if self.current_type == TokenType.OPERATOR and self.current_value == '?':
             self.eat(TokenType.OPERATOR)  # 吃掉问号
             true_expr = self.expr()  # 解析问号后面的表达式
 
@@ -502,72 +629,105 @@ class Parser:
 
         return node
 
-    def logic_expr(self):
-        """Parse logical expression 解析逻辑表达式"""
-        node = self.comp_expr()
-
-        while (self.current_token.type == TokenType.OPERATOR and
-               self.current_token.value in ('&&', '||')):
-            token = self.current_token
-            self.eat(TokenType.OPERATOR)
-            node = BinOp(node, token, self.comp_expr())
-
-        return node
-
-    def comp_expr(self):
-        """Parse comparison expression 解析比较表达式"""
-        node = self.arith_expr()
-
-        while (self.current_token.type == TokenType.OPERATOR and
-               self.current_token.value in ('==', '!=', '<', '>', '<=', '>=')):
-            token = self.current_token
-            self.eat(TokenType.OPERATOR)
-            node = BinOp(node, token, self.arith_expr())
-
-        return node
-
-    def arith_expr(self):
-        """Parse arithmetic expression 解析算术表达式"""
-        node = self.term()
-
-        while (self.current_token.type == TokenType.OPERATOR and
-               self.current_token.value in ('+', '-')):
-            token = self.current_token
-            self.eat(TokenType.OPERATOR)
-            node = BinOp(node, token, self.term())
+    def binary_expr(self, min_power, node=None):
+        """Parse binary operators binding at least `min_power` tight 解析绑定力不低于 `min_power` 的二元操作符
+
+        Precedence climbing over `BINDING_POWERS`: operands of one level are
+        chained in the loop and only a tighter operator on the right recurses,
+        so the Python stack grows with the precedence levels an expression
+        mixes, not with its length. `node`, when given, is the already parsed
+        first operand.
+        基于 `BINDING_POWERS` 的优先级爬升：同一级别的操作数在循环中连接，只有右侧结合更紧的
+        操作符才会递归，因此Python栈的深度取决于表达式混合的优先级层数，而不是表达式的长度。
+        给出 `node` 时，它是已解析的第一个操作数。
+        """
+        if node is None:
+            node = self.factor()
+
+        while self.current_type == TokenType.OPERATOR:
+            op = self.current_value
+            doubled = op in ('--', '++')
+            if doubled:
+                # 后面没有操作数时留给后缀自增自减语句 Without an operand after it, it is a postfix update
+                if self.peek() not in OPERAND_STARTS:
+                    break
+                op = op[0]
+            power = BINDING_POWERS.get(op)
+            if power is None or power < min_power:
+                break
+
+            if doubled:
+                # 表达式中的 -- 和 ++ 是二元操作符加一元符号：a--3 即 a - (-3)
+                # Inside an expression -- and ++ are a binary operator and a sign: a--3 is a - (-3)
+                token, sign = self.signs(self.current_token)
+                self.advance()
+                first = UnaryOp(sign, self.factor(), UNARY_OPERATORS[op])
+            else:
+                token = self.current_token
+                self.advance()
+                first = None
+
+            # 右操作数只接受结合更紧的操作符，因此同级操作符左结合 Left-associative
+            right = self.binary_expr(power + 1, first)
+            if op in LOGICAL_OPERATORS:
+                node = LogicalOp(node, token, right)
+            else:
+                node = BinOp(node, token, right, BINARY_OPERATORS[op])
 
         return node
 
-    def term(self):
-        """Parse term 解析项"""
-        node = self.factor()
-
-        while (self.current_token.type == TokenType.OPERATOR and
-               self.current_token.value in ('*', '/')):
-            token = self.current_token
-            self.eat(TokenType.OPERATOR)
-            node = BinOp(node, token, self.factor())
-
-        return node
+    def signs(self, token):
+        """The two sign tokens a -- or ++ token stands for inside an expression
+        表达式中 -- 或 ++ 标记所代表的两个符号标记"""
+        sign = token.value[0]
+        return (Token(TokenType.OPERATOR, sign, token.line, token.column),
+                Token(TokenType.OPERATOR, sign, token.line, token.column + 1))
 
     def factor(self):
         """Parse factor 解析因子"""
         if self.debug_mode:
             print(f"Parsing factor, current token: {self.current_token}")
 
+        # 不构成语法树节点的标记无需创建Token Tokens that become no AST node need no Token object
+        token_type = self.current_type
+        if token_type == TokenType.LPAREN:
+            self.eat(TokenType.LPAREN)
+            node = self.expr()
+            self.eat(TokenType.RPAREN)
+            return node
+
+        # 处理对象字面量
+        elif token_type == TokenType.LBRACE:
+            return self.object_literal()
+
+        elif token_type == TokenType.LBRACKET:
+            return self.array_literal()
+
+        # 向前查看一个标记判断这是什么 Peek one token ahead to tell what this is
+        elif token_type == TokenType.IDENTIFIER and self.peek() == TokenType.LPAREN:
+            # 这是函数调用
+            return self.func_call()
+
         token = self.current_token
 
         if token.type == TokenType.OPERATOR and token.value == '+':
             self.eat(TokenType.OPERATOR)
-            return UnaryOp(token, self.factor())
+            return UnaryOp(token, self.factor(), UNARY_OPERATORS[token.value])
 
         elif token.type == TokenType.OPERATOR and token.value == '-':
             self.eat(TokenType.OPERATOR)
-            return UnaryOp(token, self.factor())
+            return UnaryOp(token, self.factor(), UNARY_OPERATORS[token.value])
 
         elif token.type == TokenType.OPERATOR and token.value == '!':
             self.eat(TokenType.OPERATOR)
-            return UnaryOp(token, self.factor())
+            return UnaryOp(token, self.factor(), UNARY_OPERATORS[token.value])
+
+        elif token.type == TokenType.OPERATOR and token.value in ('--', '++'):
+            # 表达式中的前缀 -- 和 ++ 是两个符号：--a 即 -(-a) Two signs inside an expression
+            outer, inner = self.signs(token)
+            self.eat(TokenType.OPERATOR)
+            operator = UNARY_OPERATORS[outer.value]
+            return UnaryOp(outer, UnaryOp(inner, self.factor(), operator), operator)
 
         elif token.type == TokenType.NUMBER:
             self.eat(TokenType.NUMBER)
@@ -587,19 +747,6 @@ class Parser:
             self.eat(TokenType.KEYWORD)
             return Null(token)
 
-        elif token.type == TokenType.LPAREN:
-            self.eat(TokenType.LPAREN)
-            node = self.expr()
-            self.eat(TokenType.RPAREN)
-            return node
-
-        # 处理对象字面量
-        elif token.type == TokenType.LBRACE:
-            return self.object_literal()
-
-        elif token.type == TokenType.LBRACKET:
-            return self.array_literal()
-
         elif token.type == TokenType.KEYWORD and token.value == 'INPUT':
             # 处理input函数调用
             return self.input_func_call()
@@ -608,19 +755,19 @@ class Parser:
             self.eat(TokenType.KEYWORD)  # 吃掉 'new'
             
             # 获取类名
-            if self.current_token.type != TokenType.IDENTIFIER:
+            if self.current_type != TokenType.IDENTIFIER:
                 self.error("Expected class name after 'new'", self.current_token)
             
-            class_name = self.current_token.value
+            class_name = self.current_value
             self.eat(TokenType.IDENTIFIER)
             
             # 解析构造函数参数
             self.eat(TokenType.LPAREN)
             args = []
             
-            if self.current_token.type != TokenType.RPAREN:
+            if self.current_type != TokenType.RPAREN:
                 args.append(self.expr())
-                while self.current_token.type == TokenType.COMMA:
+                while self.current_type == TokenType.COMMA:
                     self.eat(TokenType.COMMA)
                     args.append(self.expr())
             
@@ -629,121 +776,94 @@ class Parser:
         
         elif token.type == TokenType.KEYWORD and token.value == 'THIS':
             self.eat(TokenType.KEYWORD)
-            node = ThisExpr(token)
-            
             # Handle property access on this (e.g., this.name)
-            while self.current_token.type == TokenType.DOT:
-                self.eat(TokenType.DOT)
-                prop_token = self.current_token
-                self.eat(TokenType.IDENTIFIER)
-                node = PropertyAccess(node, prop_token.value)
-                
-                # Check if it's a method call
-                if self.current_token.type == TokenType.LPAREN:
-                    self.eat(TokenType.LPAREN)
-                    args = []
-                    
-                    if self.current_token.type != TokenType.RPAREN:
-                        args.append(self.expr())
-                        while self.current_token.type == TokenType.COMMA:
-                            self.eat(TokenType.COMMA)
-                            args.append(self.expr())
-                    
-                    self.eat(TokenType.RPAREN)
-                    node = MethodCall(node.obj, prop_token.value, args)
-            
-            return node
+            return self.member_chain(ThisExpr(token))
         
         elif token.type == TokenType.KEYWORD and token.value == 'SUPER':
             self.eat(TokenType.KEYWORD)
+            
+            # super(...) calls the superclass constructor / super(...) 调用父类构造函数
+            if self.current_type == TokenType.LPAREN:
+                return self.member_chain(SuperCall(token, None, self.call_arguments()))
+            
+            # super.method(...) calls the superclass method / super.method(...) 调用父类方法
+            if self.current_type == TokenType.DOT:
+                self.eat(TokenType.DOT)
+                method_name = self.current_value
+                self.eat(TokenType.IDENTIFIER)
+                if self.current_type != TokenType.LPAREN:
+                    self.error("Expected '(' after super method name", self.current_token)
+                return self.member_chain(SuperCall(token, method_name, self.call_arguments()))
+            
             return SuperExpr(token)
 
         elif token.type == TokenType.IDENTIFIER:
-            # 保存当前状态，以便可能的回溯
-            saved_position = self.lexer.position
-            saved_line = self.lexer.line
-            saved_column = self.lexer.column
-            saved_char = self.lexer.current_char
-            saved_token = token
-
-            # 先读取标识符
             self.eat(TokenType.IDENTIFIER)
 
-            # 根据下一个标记判断这是什么
-            if self.current_token.type == TokenType.LPAREN:
-                # 这是函数调用，回溯并让func_call方法处理
-                self.lexer.position = saved_position
-                self.lexer.line = saved_line
-                self.lexer.column = saved_column
-                self.lexer.current_char = saved_char
-                self.current_token = saved_token
-
-                return self.func_call()
-
-            elif self.current_token.type == TokenType.LBRACKET:
+            if self.current_type == TokenType.LBRACKET:
                 # 数组访问 - 支持多维数组访问
-                var_node = Var(saved_token)
+                var_node = Var(token)
                 node = var_node
 
                 # 处理一个或多个方括号索引
-                while self.current_token.type == TokenType.LBRACKET:
+                while self.current_type == TokenType.LBRACKET:
                     self.eat(TokenType.LBRACKET)
                     index = self.expr()
                     self.eat(TokenType.RBRACKET)
                     node = ArrayAccess(node, index)
 
                 # 处理属性访问（在数组访问之后可能有属性访问）
-                while self.current_token.type == TokenType.DOT:
+                while self.current_type == TokenType.DOT:
                     self.eat(TokenType.DOT)
-                    prop_token = self.current_token
+                    prop_name = self.current_value
                     self.eat(TokenType.IDENTIFIER)
-                    node = PropertyAccess(node, prop_token.value)
+                    node = PropertyAccess(node, prop_name)
                     
                     # 检查是否是方法调用
-                    if self.current_token.type == TokenType.LPAREN:
+                    if self.current_type == TokenType.LPAREN:
                         self.eat(TokenType.LPAREN)
                         args = []
                         
-                        if self.current_token.type != TokenType.RPAREN:
+                        if self.current_type != TokenType.RPAREN:
                             args.append(self.expr())
-                            while self.current_token.type == TokenType.COMMA:
+                            while self.current_type == TokenType.COMMA:
                                 self.eat(TokenType.COMMA)
                                 args.append(self.expr())
                         
                         self.eat(TokenType.RPAREN)
-                        node = MethodCall(node.obj, prop_token.value, args)
+                        node = MethodCall(node.obj, prop_name, args)
 
                 return node
-            elif self.current_token.type == TokenType.DOT:
+            elif self.current_type == TokenType.DOT:
                 # 这是属性访问
-                var_node = Var(saved_token)
+                var_node = Var(token)
                 node = var_node
 
                 # 处理属性访问链 (obj.prop1.prop2...)
-                while self.current_token.type == TokenType.DOT:
+                while self.current_type == TokenType.DOT:
                     self.eat(TokenType.DOT)
-                    prop_token = self.current_token
+                    prop_name = self.current_value
                     self.eat(TokenType.IDENTIFIER)
-                    node = PropertyAccess(node, prop_token.value)
+                    node = PropertyAccess(node, prop_name)
                     
                     # 检查是否是方法调用
-                    if self.current_token.type == TokenType.LPAREN:
+                    if self.current_type == TokenType.LPAREN:
                         self.eat(TokenType.LPAREN)
                         args = []
                         
-                        if self.current_token.type != TokenType.RPAREN:
+                        if self.current_type != TokenType.RPAREN:
                             args.append(self.expr())
-                            while self.current_token.type == TokenType.COMMA:
+                            while self.current_type == TokenType.COMMA:
                                 self.eat(TokenType.COMMA)
                                 args.append(self.expr())
                         
                         self.eat(TokenType.RPAREN)
-                        node = MethodCall(node.obj, prop_token.value, args)
+                        node = MethodCall(node.obj, prop_name, args)
 
                 return node
             else:
                 # 这是普通变量
-                return Var(saved_token)
+                return Var(token)
 
         else:
             self.error(f"Unexpected token in factor: {token}", token)
@@ -759,49 +879,49 @@ class Parser:
         self.eat(TokenType.KEYWORD)  # 吃掉 'import'
         
         # 检查是否是 import { ... } from "..."
-        if self.current_token.type == TokenType.LBRACE:
+        if self.current_type == TokenType.LBRACE:
             # 解析导入项
             self.eat(TokenType.LBRACE)
             items = []
             
-            while self.current_token.type != TokenType.RBRACE:
+            while self.current_type != TokenType.RBRACE:
                 # 解析导入项名称
-                if self.current_token.type != TokenType.IDENTIFIER:
+                if self.current_type != TokenType.IDENTIFIER:
                     self.error("Expected identifier in import list", self.current_token)
                 
-                name = self.current_token.value
+                name = self.current_value
                 self.eat(TokenType.IDENTIFIER)
                 
                 # 检查是否有别名
                 alias = None
-                if self.current_token.type == TokenType.KEYWORD and self.current_token.value == 'AS':
+                if self.current_type == TokenType.KEYWORD and self.current_value == 'AS':
                     self.eat(TokenType.KEYWORD)  # 吃掉 'as'
-                    if self.current_token.type != TokenType.IDENTIFIER:
+                    if self.current_type != TokenType.IDENTIFIER:
                         self.error("Expected identifier after 'as'", self.current_token)
-                    alias = self.current_token.value
+                    alias = self.current_value
                     self.eat(TokenType.IDENTIFIER)
                 
                 items.append(ImportItem(name, alias))
                 
                 # 检查逗号或结束
-                if self.current_token.type == TokenType.COMMA:
+                if self.current_type == TokenType.COMMA:
                     self.eat(TokenType.COMMA)
-                    if self.current_token.type == TokenType.RBRACE:
+                    if self.current_type == TokenType.RBRACE:
                         break  # 允许尾随逗号
-                elif self.current_token.type != TokenType.RBRACE:
+                elif self.current_type != TokenType.RBRACE:
                     self.error("Expected ',' or '}' in import list", self.current_token)
             
             self.eat(TokenType.RBRACE)
             
             # 期望 'from'
-            if self.current_token.type != TokenType.KEYWORD or self.current_token.value != 'FROM':
+            if self.current_type != TokenType.KEYWORD or self.current_value != 'FROM':
                 self.error("Expected 'from' after import list", self.current_token)
             self.eat(TokenType.KEYWORD)  # 吃掉 'from'
             
             # 解析模块路径
-            if self.current_token.type != TokenType.STRING:
+            if self.current_type != TokenType.STRING:
                 self.error("Expected module path string", self.current_token)
-            module_path = self.current_token.value
+            module_path = self.current_value
             self.eat(TokenType.STRING)
             
             self.eat(TokenType.SEMICOLON)
@@ -809,19 +929,19 @@ class Parser:
             
         else:
             # import "module_path" [as alias]
-            if self.current_token.type != TokenType.STRING:
+            if self.current_type != TokenType.STRING:
                 self.error("Expected module path string", self.current_token)
             
-            module_path = self.current_token.value
+            module_path = self.current_value
             self.eat(TokenType.STRING)
             
             # 检查是否有别名
             alias = None
-            if self.current_token.type == TokenType.KEYWORD and self.current_token.value == 'AS':
+            if self.current_type == TokenType.KEYWORD and self.current_value == 'AS':
                 self.eat(TokenType.KEYWORD)  # 吃掉 'as'
-                if self.current_token.type != TokenType.IDENTIFIER:
+                if self.current_type != TokenType.IDENTIFIER:
                     self.error("Expected identifier after 'as'", self.current_token)
-                alias = self.current_token.value
+                alias = self.current_value
                 self.eat(TokenType.IDENTIFIER)
             
             self.eat(TokenType.SEMICOLON)
@@ -838,24 +958,24 @@ class Parser:
         self.eat(TokenType.KEYWORD)  # 吃掉 'export'
         
         # 检查是否是 export { ... }
-        if self.current_token.type == TokenType.LBRACE:
+        if self.current_type == TokenType.LBRACE:
             self.eat(TokenType.LBRACE)
             items = []
             
-            while self.current_token.type != TokenType.RBRACE:
-                if self.current_token.type != TokenType.IDENTIFIER:
+            while self.current_type != TokenType.RBRACE:
+                if self.current_type != TokenType.IDENTIFIER:
                     self.error("Expected identifier in export list", self.current_token)
                 
-                name = self.current_token.value
+                name = self.current_value
                 self.eat(TokenType.IDENTIFIER)
                 items.append(ExportItem(name))
                 
                 # 检查逗号或结束
-                if self.current_token.type == TokenType.COMMA:
+                if self.current_type == TokenType.COMMA:
                     self.eat(TokenType.COMMA)
-                    if self.current_token.type == TokenType.RBRACE:
+                    if self.current_type == TokenType.RBRACE:
                         break  # 允许尾随逗号
-                elif self.current_token.type != TokenType.RBRACE:
+                elif self.current_type != TokenType.RBRACE:
                     self.error("Expected ',' or '}' in export list", self.current_token)
             
             self.eat(TokenType.RBRACE)
@@ -864,12 +984,12 @@ class Parser:
             
         else:
             # export var/func declaration
-            if self.current_token.type == TokenType.KEYWORD:
-                if self.current_token.value == 'VAR':
+            if self.current_type == TokenType.KEYWORD:
+                if self.current_value == 'VAR':
                     # export var x = value;
                     var_decl = self.declaration_statement()
                     return ExportStmt([ExportItem(var_decl.var_node.value, var_decl)])
-                elif self.current_token.value == 'FUNC':
+                elif self.current_value == 'FUNC':
                     # export func foo() { ... }
                     func_decl = self.func_declaration()
                     return ExportStmt([ExportItem(func_decl.name, func_decl)])
@@ -894,21 +1014,21 @@ class Parser:
         self.eat(TokenType.KEYWORD)  # 吃掉 'class'
         
         # 获取类名
-        if self.current_token.type != TokenType.IDENTIFIER:
+        if self.current_type != TokenType.IDENTIFIER:
             self.error("Expected class name", self.current_token)
         
-        class_name = self.current_token.value
+        class_name = self.current_value
         self.eat(TokenType.IDENTIFIER)
         
         # 检查是否有继承
         superclass = None
-        if self.current_token.type == TokenType.KEYWORD and self.current_token.value == 'EXTENDS':
+        if self.current_type == TokenType.KEYWORD and self.current_value == 'EXTENDS':
             self.eat(TokenType.KEYWORD)  # 吃掉 'extends'
             
-            if self.current_token.type != TokenType.IDENTIFIER:
+            if self.current_type != TokenType.IDENTIFIER:
                 self.error("Expected superclass name", self.current_token)
             
-            superclass = self.current_token.value
+            superclass = self.current_value
             self.eat(TokenType.IDENTIFIER)
         
         # 期望类体
@@ -918,9 +1038,9 @@ class Parser:
         methods = []
         constructor = None
         
-        while self.current_token.type != TokenType.RBRACE:
+        while self.current_type != TokenType.RBRACE:
             # 检查是否是构造函数
-            if self.current_token.type == TokenType.KEYWORD and self.current_token.value == 'CONSTRUCTOR':
+            if self.current_type == TokenType.KEYWORD and self.current_value == 'CONSTRUCTOR':
                 if constructor is not None:
                     self.error("Class can only have one constructor", self.current_token)
                 
@@ -929,11 +1049,11 @@ class Parser:
                 
                 # 解析参数
                 params = []
-                if self.current_token.type != TokenType.RPAREN:
+                if self.current_type != TokenType.RPAREN:
                     params.append(Var(self.current_token))
                     self.eat(TokenType.IDENTIFIER)
                     
-                    while self.current_token.type == TokenType.COMMA:
+                    while self.current_type == TokenType.COMMA:
                         self.eat(TokenType.COMMA)
                         params.append(Var(self.current_token))
                         self.eat(TokenType.IDENTIFIER)
@@ -945,19 +1065,19 @@ class Parser:
                 constructor = MethodDecl('constructor', params, body)
                 
             # 普通方法
-            elif self.current_token.type == TokenType.IDENTIFIER:
-                method_name = self.current_token.value
+            elif self.current_type == TokenType.IDENTIFIER:
+                method_name = self.current_value
                 self.eat(TokenType.IDENTIFIER)
                 
                 self.eat(TokenType.LPAREN)
                 
                 # 解析参数
                 params = []
-                if self.current_token.type != TokenType.RPAREN:
+                if self.current_type != TokenType.RPAREN:
                     params.append(Var(self.current_token))
                     self.eat(TokenType.IDENTIFIER)
                     
-                    while self.current_token.type == TokenType.COMMA:
+                    while self.current_type == TokenType.COMMA:
                         self.eat(TokenType.COMMA)
                         params.append(Var(self.current_token))
                         self.eat(TokenType.IDENTIFIER)
@@ -986,15 +1106,15 @@ class Parser:
         finally_block = None
         
         # 检查是否有catch子句
-        if self.current_token.type == TokenType.KEYWORD and self.current_token.value == 'CATCH':
+        if self.current_type == TokenType.KEYWORD and self.current_value == 'CATCH':
             self.eat(TokenType.KEYWORD)  # 'catch'
             self.eat(TokenType.LPAREN)
             
             # 解析异常参数
-            if self.current_token.type != TokenType.IDENTIFIER:
+            if self.current_type != TokenType.IDENTIFIER:
                 self.error("Expected exception parameter name in catch clause", self.current_token)
             
-            param = self.current_token.value
+            param = self.current_value
             self.eat(TokenType.IDENTIFIER)
             self.eat(TokenType.RPAREN)
             
@@ -1003,7 +1123,7 @@ class Parser:
             catch_clause = CatchClause(param, catch_body)
         
         # 检查是否有finally子句
-        if self.current_token.type == TokenType.KEYWORD and self.current_token.value == 'FINALLY':
+        if self.current_type == TokenType.KEYWORD and self.current_value == 'FINALLY':
             self.eat(TokenType.KEYWORD)  # 'finally'
             finally_block = self.compound_statement()
         
@@ -176,10 +176,8 @@ Examples:
             if Config.SHOW_TOKENS:
                 # 调试模式：显示标记
                 print(Colors.debug("=== Tokens ==="))
-                temp_lexer = Lexer(code)
                 tokens = []
-                while True:
-                    token = temp_lexer.get_next_token()
+                for token in lexer.buffer:
                     if token.type.name == 'EOF':
                         break
                     tokens.append(str(token))
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 变量解析器 / Variable Resolver
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+from .ast import *
+from .errors import NameError
+from .dispatch import DispatchTable
+
+
+class Scope:
+    """Compile-time layout of one runtime frame / 一个运行时帧的编译期布局
+
+    Slot 0 of every frame holds the link to the enclosing frame, so the
+    first variable gets slot 1. For a function frame that link is the tuple
+    of cells the function captured; a catch frame links to the frame it runs in.
+    每个帧的0号槽位保存外层帧的链接，因此第一个变量位于1号槽位。函数帧的链接是函数捕获的
+    单元元组；catch帧链接到它所在的帧。
+    """
+
+    def __init__(self, closure=None):
+        self.names = {}          # 变量名到槽位的映射 Name to slot mapping
+        self.size = 1            # 帧大小（含父链接） Frame size (including parent link)
+        self.closure = closure   # 函数帧的自由变量，catch帧为None Free variables of a function frame, None for catch frames
+        self.cells = set()       # 被闭包捕获的槽位 Slots captured by closures
+
+    def declare(self, name):
+        """Declare a name and return its slot / 声明名称并返回其槽位"""
+        if name not in self.names:
+            self.names[name] = self.size
+            self.size += 1
+        return self.names[name]
+
+
+class Closure:
+    """Free variables captured by a function, or by all methods of a class
+    函数（或类的所有方法）捕获的自由变量
+
+    Each capture is a (depth, slot) pair relative to the frame the declaration
+    runs in, and its index is the variable's slot in the captured cell tuple.
+    每个捕获是相对于声明所在帧的 (深度, 槽位) 对，其索引即该变量在捕获单元元组中的位置。
+    """
+
+    def __init__(self):
+        self.captures = []  # 按索引排列的捕获 Captures in index order
+        self.index = {}     # 捕获到索引的映射 Capture to index mapping
+
+    def capture(self, depth, slot):
+        """Index of a captured cell / 被捕获单元的索引"""
+        key = (depth, slot)
+        if key not in self.index:
+            self.index[key] = len(self.captures)
+            self.captures.append(key)
+        return self.index[key]
+
+
+class Resolver:
+    """Bind every variable reference to a (depth, slot) pair before execution
+    在执行前将每个变量引用绑定到 (深度, 槽位) 对
+
+    Names that are not declared in any enclosing function are globals and keep
+    depth None; they are looked up by name at runtime. A function captures
+    only the outer variables it (or a function nested in it) references: they
+    become shared cells, and `cell` is set on every node that reads or writes
+    one.
+    未在任何外层函数中声明的名称是全局变量，其深度为None，运行时按名称查找。函数只捕获它
+    （或嵌套在其中的函数）引用的外层变量：这些变量成为共享单元，所有读写它们的节点都会设置 `cell`。
+    """
+
+    def __init__(self, known_globals=()):
+        self.scopes = []                          # 函数作用域栈 Function scope stack
+        self.global_names = set(known_globals)    # 已知的全局名称 Known global names
+        self.global_refs = []                     # 对全局名称的引用 References to global names
+        self.has_wildcard_import = False          # 是否存在通配导入 Whether a wildcard import exists
+        self.protected = 0                        # 当前函数中外层try语句的数量 Enclosing try statements in the current function
+        self.local_refs = []                      # (节点, 作用域, 槽位) 局部变量引用 Local references
+        self.frames = []                          # (节点, 作用域) 拥有帧的节点 Nodes that own a frame
+        self.classes = []                         # 外层类声明 Enclosing class declarations
+        self.function = None                      # 当前函数或方法声明 Current function or method declaration
+        self.loops = []                           # 当前函数中的外层循环 Enclosing loops in the current function
+        self.writes = []                          # 被赋值或声明的名称 Names assigned or declared so far
+        self.calls = 0                            # 已见的调用数 Calls seen so far
+        self.for_loops = []                       # (for节点, 循环中写入的名称, 循环中是否有调用) For loops to classify
+        self.dispatch = DispatchTable(self, 'visit_', self.generic_visit)  # 节点类到处理方法 Node class to handler
+
+    def resolve(self, tree):
+        """Resolve a program and report undeclared variables / 解析程序并报告未声明的变量"""
+        self.hoist(tree, self.global_names)
+        self.visit(tree)
+        self.check_globals()
+        self.mark_cells()
+        self.mark_counted_loops()
+        return tree
+
+    def mark_cells(self):
+        """Flag accesses to captured variables once every closure is known
+        在所有闭包都已知后标记对被捕获变量的访问"""
+        for node, scope, slot in self.local_refs:
+            node.cell = scope is None or slot in scope.cells
+        for node, scope in self.frames:
+            node.cells = tuple(sorted(scope.cells))
+
+    def mark_counted_loops(self):
+        """Describe the for loops that count an integer variable, once cells are known
+        在单元已知后描述以整数变量计数的for循环"""
+        for node, writes, calls in self.for_loops:
+            node.counter = self.counted_loop(node, writes, calls)
+
+    def counted_loop(self, node, writes, calls):
+        """CountedLoop for `i < n; i = i + c` style loops, None for any other loop
+        为 `i < n; i = i + c` 形式的循环返回CountedLoop，其他循环返回None
+
+        The variable and the bound must be plain locals or globals that the
+        loop never assigns; a global could also be assigned by any function
+        the loop calls, so loops with calls only qualify for locals.
+        变量和上界必须是循环从不赋值的普通局部变量或全局变量；全局变量也可能被循环调用的任何函数赋值，
+        因此含有调用的循环只在使用局部变量时符合条件。
+        """
+        def invariant(var):
+            return (not var.cell and var.value not in writes
+                    and (var.depth is not None or not calls))
+
+        condition = node.condition
+        if not isinstance(condition, BinOp) or condition.op.value not in ('<', '<=', '>', '>='):
+            return None
+        var, bound = condition.left, condition.right
+        if not isinstance(var, Var) or var.depth not in (0, None) or var.cell:
+            return None
+        if isinstance(bound, Var):
+            if bound.value == var.value or not invariant(bound):
+                return None
+        elif not isinstance(bound, Number):
+            return None
+
+        # The update must be `i = i + c`, `i += c`, `i++` or their subtracting forms
+        # 更新语句必须是 `i = i + c`、`i += c`、`i++` 或对应的减法形式
+        update = node.update_stmt
+        if isinstance(update, CompoundAssign) and update.op in ('+', '-'):
+            target, left, op, amount = update.left, update.left, update.op, update.right
+        elif (isinstance(update, Assign) and isinstance(update.right, BinOp)
+                and update.right.op.value in ('+', '-')):
+            target, left, op, amount = update.left, update.right.left, update.right.op.value, update.right.right
+        else:
+            return None
+        binding = (var.value, var.depth, var.slot)
+        if (not isinstance(target, Var) or not isinstance(left, Var)
+                or (target.value, target.depth, target.slot) != binding
+                or (left.value, left.depth, left.slot) != binding):
+            return None
+        if not isinstance(amount, Number) or amount.value.__class__ is not int:
+            return None
+        step = amount.value if op == '+' else -amount.value
+
+        # Only the update may assign the variable / 只有更新语句可以给变量赋值
+        writes = writes[:]
+        writes.remove(var.value)
+        if not invariant(var) or step == 0 or (step > 0) != (condition.op.value in ('<', '<=')):
+            return None
+        return CountedLoop(var, bound, step, condition.op.value in ('<=', '>='))
+
+    def check_globals(self):
+        """Report the first reference to an undeclared global / 报告第一个对未声明全局变量的引用"""
+        if self.has_wildcard_import:
+            # The module's exports are only known at runtime / 模块导出只有在运行时才能确定
+            return
+
+        undeclared = [(name, node) for name, node in self.global_refs if name not in self.global_names]
+        if not undeclared:
+            return
+
+        name, node = min(undeclared, key=lambda item: self._position(item[1]))
+        line, column = self._position(node)
+        if isinstance(node, FuncCall):
+            raise NameError(f"Undefined function: {name}", line, column)
+        raise NameError(f"Variable '{name}' is not declared", line, column)
+
+    def _position(self, node):
+        token = getattr(node, 'token', None)
+        if token is None:
+            return 0, 0
+        return token.line, token.column
+
+    # ------------------------------------------------------------------
+    # 声明提升 Declaration hoisting
+    # ------------------------------------------------------------------
+
+    def hoist(self, node, names):
+        """Collect the names a block declares, without entering nested scopes
+        收集代码块声明的名称，不进入嵌套作用域"""
+        if isinstance(node, Compound):
+            for child in node.children:
+                self.hoist(child, names)
+        elif isinstance(node, VarDecl):
+            self._add(names, node.var_node.value)
+        elif isinstance(node, (FuncDecl, ClassDecl)):
+            self._add(names, node.name)
+        elif isinstance(node, If):
+            self.hoist(node.if_body, names)
+            if node.else_body is not None:
+                self.hoist(node.else_body, names)
+        elif isinstance(node, While):
+            self.hoist(node.body, names)
+        elif isinstance(node, For):
+            self.hoist(node.init_stmt, names)
+            self.hoist(node.body, names)
+        elif isinstance(node, TryStmt):
+            self.hoist(node.try_block, names)
+            if node.finally_block is not None:
+                self.hoist(node.finally_block, names)
+        elif isinstance(node, ExportStmt):
+            for item in node.items:
+                if item.value is not None:
+                    self.hoist(item.value, names)
+        elif isinstance(node, ImportStmt):
+            if node.items:
+                for item in node.items:
+                    self._add(names, item.alias or item.name)
+            elif node.alias:
+                self._add(names, node.alias)
+            else:
+                self.has_wildcard_import = True
+
+    def _add(self, names, name):
+        if isinstance(names, Scope):
+            names.declare(name)
+        else:
+            names.add(name)
+
+    # ------------------------------------------------------------------
+    # 作用域管理 Scope management
+    # ------------------------------------------------------------------
+
+    def push_scope(self, declared, body, closure=None):
+        """Enter a new frame with the given leading names / 进入以给定名称开头的新帧"""
+        scope = Scope(closure)
+        for name in declared:
+            scope.declare(name)
+        if body is not None:
+            self.hoist(body, scope)
+        self.scopes.append(scope)
+        return scope
+
+    def pop_scope(self):
+        return self.scopes.pop()
+
+    def lookup(self, name, level=None):
+        """Return (depth, slot, scope) for a name, or (None, None, None) for globals
+        返回名称的(深度, 槽位, 作用域)，全局变量返回(None, None, None)
+
+        scope is the declaring scope, or None when the name is one of the
+        innermost function's captured cells.
+        scope 是声明所在的作用域；若名称是最内层函数捕获的单元，则为None。
+        """
+        if level is None:
+            level = len(self.scopes) - 1
+        depth = 0
+        while level >= 0:
+            scope = self.scopes[level]
+            slot = scope.names.get(name)
+            if slot is not None:
+                return depth, slot, scope
+            if scope.closure is not None:
+                # Crossing a function boundary: capture the variable as a cell
+                # 跨越函数边界：将变量作为单元捕获
+                outer_depth, outer_slot, outer_scope = self.lookup(name, level - 1)
+                if outer_depth is None:
+                    break
+                if outer_scope is not None:
+                    outer_scope.cells.add(outer_slot)
+                return depth + 1, scope.closure.capture(outer_depth, outer_slot), None
+            depth += 1
+            level -= 1
+        return None, None, None
+
+    def bind(self, node, name):
+        """Annotate a referencing node with its (depth, slot) / 为引用节点标注(深度, 槽位)"""
+        node.depth, node.slot, scope = self.lookup(name)
+        if node.depth is None:
+            self.global_refs.append((name, node))
+        else:
+            self.local_refs.append((node, scope, node.slot))
+
+    def declare(self, node, name):
+        """Annotate a declaration with its slot in the innermost frame, None at top level
+        为声明标注其在最内层帧中的槽位，顶层为None"""
+        if not self.scopes:
+            node.slot = None
+            return
+        scope = self.scopes[-1]
+        node.slot = scope.names[name]
+        self.local_refs.append((node, scope, node.slot))
+
+    # ------------------------------------------------------------------
+    # 节点遍历 Node traversal
+    # ------------------------------------------------------------------
+
+    def visit(self, node):
+        """Visit node using the appropriate method / 使用适当的方法访问节点"""
+        return self.dispatch[node.__class__](node)
+
+    def generic_visit(self, node):
+        """Leaf nodes need no resolution / 叶子节点无需解析"""
+        pass
+
+    def visit_all(self, nodes):
+        for node in nodes:
+            self.visit(node)
+
+    def visit_BinOp(self, node):
+        """Resolve a binary or logical operation 解析二元或逻辑运算
+
+        Left-deep chains such as `a + b + c + ...` are walked in a loop, so
+        a long generated expression does not run out of Python stack here.
+        `a + b + c + ...` 这样的左深链在循环中遍历，因此长的生成表达式不会在此耗尽Python栈。
+        """
+        rights = []
+        while node.__class__ is BinOp or node.__class__ is LogicalOp:
+            rights.append(node.right)
+            node = node.left
+        self.visit(node)
+        for right in reversed(rights):
+            self.visit(right)
+
+    visit_LogicalOp = visit_BinOp
+
+    def visit_UnaryOp(self, node):
+        self.visit(node.expr)
+
+    def visit_TernaryOp(self, node):
+        self.visit(node.condition)
+        self.visit(node.true_expr)
+        self.visit(node.false_expr)
+
+    def visit_ObjectLiteral(self, node):
+        self.visit_all(node.pairs.values())
+
+    def visit_PropertyAccess(self, node):
+        self.visit(node.obj)
+
+    def visit_Compound(self, node):
+        self.visit_all(node.children)
+
+    def visit_Assign(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+        if isinstance(node.left, Var):
+            self.writes.append(node.left.value)
+
+    visit_CompoundAssign = visit_Assign
+
+    def visit_Var(self, node):
+        self.bind(node, node.value)
+
+    def visit_VarDecl(self, node):
+        if node.value_node is not None:
+            self.visit(node.value_node)
+        self.declare(node, node.var_node.value)
+        self.writes.append(node.var_node.value)
+
+    def visit_If(self, node):
+        self.visit(node.condition)
+        self.visit(node.if_body)
+        if node.else_body is not None:
+            self.visit(node.else_body)
+
+    def visit_While(self, node):
+        self.visit(node.condition)
+        self.loops.append(node)
+        self.visit(node.body)
+        self.loops.pop()
+
+    def visit_For(self, node):
+        self.visit(node.init_stmt)
+        self.visit(node.condition)
+        self.loops.append(node)
+        writes, calls = len(self.writes), self.calls
+        self.visit(node.update_stmt)
+        self.visit(node.body)
+        self.for_loops.append((node, self.writes[writes:], self.calls != calls))
+        self.loops.pop()
+
+    def visit_Print(self, node):
+        self.visit(node.expr)
+
+    def visit_Input(self, node):
+        if node.prompt is not None:
+            self.visit(node.prompt)
+
+    def visit_Array(self, node):
+        self.visit_all(node.elements)
+
+    def visit_ArrayAccess(self, node):
+        self.visit(node.array)
+        self.visit(node.index)
+
+    def visit_FuncDecl(self, node):
+        self.declare(node, node.name)
+        self.writes.append(node.name)
+        closure = Closure()
+        scope = self.push_scope([param.value for param in node.params], node.body, closure)
+        self.visit_function_body(node)
+        self.pop_scope()
+        node.frame_size = scope.size
+        node.captures = closure.captures
+        self.frames.append((node, scope))
+
+    def visit_function_body(self, node):
+        """Visit a function or method body; try statements and loops outside it do not enclose it
+        访问函数或方法体；函数体之外的try语句和循环不包含它"""
+        saved = self.protected, self.function, self.loops
+        self.protected, self.function, self.loops = 0, node, []
+        self.visit(node.body)
+        self.protected, self.function, self.loops = saved
+
+    def visit_FuncCall(self, node):
+        self.calls += 1
+        self.bind(node, node.name)
+        self.visit_all(node.arguments)
+
+    def visit_MethodCall(self, node):
+        self.calls += 1
+        self.visit(node.obj)
+        self.visit_all(node.arguments)
+
+    def visit_Return(self, node):
+        if node.expr is not None:
+            self.visit(node.expr)
+            # A returned call inside a try must come back for catch/finally, so it is not a tail call
+            # try语句中返回的调用必须回来执行catch/finally，因此不是尾调用
+            if self.scopes and not self.protected:
+                self.mark_tail(node.expr)
+
+    def mark_tail(self, node):
+        """Mark the calls whose result a function returns directly / 标注函数直接返回其结果的调用"""
+        if isinstance(node, FuncCall):
+            node.tail = True
+            # The tree walker runs tail calls on a trampoline; code that contains
+            # one is not promoted to compiled closures, which would nest them
+            # 语法树遍历器以蹦床方式执行尾调用；包含尾调用的代码不会被提升为编译后的闭包（闭包会嵌套执行它们）
+            self.function.tail_calls = True
+            for loop in self.loops:
+                loop.tail_calls = True
+        elif isinstance(node, TernaryOp):
+            self.mark_tail(node.true_expr)
+            self.mark_tail(node.false_expr)
+
+    def visit_ExportStmt(self, node):
+        for item in node.items:
+            if item.value is not None:
+                self.visit(item.value)
+            else:
+                self.global_refs.append((item.name, item))
+
+    def visit_ClassDecl(self, node):
+        self.declare(node, node.name)
+        self.writes.append(node.name)
+        # All methods of a class share one tuple of captured cells / 类的所有方法共享一个捕获单元元组
+        closure = Closure()
+        self.classes.append(node)
+        if node.constructor is not None:
+            self.visit_MethodDecl(node.constructor, closure)
+        for method in node.methods:
+            self.visit_MethodDecl(method, closure)
+        self.classes.pop()
+        node.captures = closure.captures
+
+    def visit_MethodDecl(self, node, closure=None):
+        # this 占用方法帧的第一个槽位 'this' takes the first slot of a method frame
+        scope = self.push_scope(['this'] + [param.value for param in node.params], node.body,
+                                closure or Closure())
+        self.visit_function_body(node)
+        self.pop_scope()
+        node.frame_size = scope.size
+        self.frames.append((node, scope))
+
+    def visit_NewExpr(self, node):
+        self.calls += 1
+        self.visit_all(node.arguments)
+
+    def visit_ThisExpr(self, node):
+        node.depth, node.slot, scope = self.lookup('this')
+        if node.depth is not None:
+            self.local_refs.append((node, scope, node.slot))
+
+    def visit_SuperCall(self, node):
+        # The call runs on this, with a target fixed by the enclosing class
+        # 调用作用于 this，目标由所在的类决定
+        self.calls += 1
+        self.visit_ThisExpr(node)
+        if self.classes:
+            node.home = self.classes[-1]
+            node.home.super_methods.add(node.method)
+        self.visit_all(node.arguments)
+
+    def visit_ImportStmt(self, node):
+        # Running a module can rebind globals / 执行模块可能重新绑定全局变量
+        self.calls += 1
+
+    def visit_TryStmt(self, node):
+        self.protected += 1
+        self.visit(node.try_block)
+        if node.catch_clause is not None:
+            self.visit(node.catch_clause)
+        if node.finally_block is not None:
+            self.visit(node.finally_block)
+        self.protected -= 1
+
+    def visit_CatchClause(self, node):
+        # catch 子句拥有自己的帧 A catch clause gets its own frame
+        scope = self.push_scope([node.param], node.body)
+        self.visit(node.body)
+        self.pop_scope()
+        node.frame_size = scope.size
+        self.frames.append((node, scope))
+
+    def visit_ThrowStmt(self, node):
+        self.visit(node.expr)
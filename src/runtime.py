@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 运行时语义 / Runtime Semantics
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+# Value operations shared by all execution engines, so that the tree walker
+# and the compiled backends agree on every edge case.
+# 所有执行引擎共享的值操作，保证树遍历解释器与编译后端在各种边界情况下行为一致。
+
+import builtins
+import operator
+
+from .errors import TypeError, NameError, IndexError, ValueError
+from .class_system import EvilInstance
+
+PyTypeError = builtins.TypeError
+
+
+def to_string(value):
+    """Type conversion to string / 类型转换为字符串"""
+    if value is None:
+        return "null"
+    elif isinstance(value, bool):
+        return "true" if value else "false"
+    else:
+        return str(value)
+
+
+def get_property(obj, prop, line=None, column=None):
+    """Read a property of an instance, object, array or string / 读取实例、对象、数组或字符串的属性"""
+    # Handle Evil Lang object instances / 处理 Evil Lang 对象实例
+    if isinstance(obj, EvilInstance):
+        value = obj.get(prop)
+        if value is None:
+            raise NameError(f"Instance has no property '{prop}'", line, column)
+        return value
+    # Handle built-in properties / 处理内置属性
+    elif isinstance(obj, (list, str)) and prop == 'length':
+        return len(obj)
+    # Handle object property access / 处理对象属性访问
+    elif isinstance(obj, dict):
+        if prop in obj:
+            return obj[prop]
+        # If property doesn't exist, throw error / 如果属性不存在，抛出异常
+        raise NameError(f"Object has no property '{prop}'", line, column)
+    else:
+        raise TypeError(f"Cannot access property '{prop}' on this type", line, column)
+
+
+def get_index(array, index, line=None, column=None):
+    """Read an array element with bounds checking / 带边界检查地读取数组元素"""
+    if not isinstance(array, list):
+        raise TypeError(f"Not an array: {array}", line, column)
+
+    if not isinstance(index, int):
+        raise TypeError(f"Array index must be an integer: {index}", line, column)
+
+    if index < 0 or index >= len(array):
+        raise IndexError(f"Array index out of bounds: {index}", line, column)
+
+    return array[index]
+
+
+def check_index_store(array, index, line=None, column=None):
+    """Validate an element assignment target / 校验数组元素赋值目标
+
+    Assigning at index len(array) appends to the end.
+    在索引 len(array) 处赋值会附加到数组末尾。
+    """
+    if not isinstance(array, list):
+        raise TypeError(f"Not an array: {array}", line, column)
+
+    if not isinstance(index, int):
+        raise TypeError(f"Array index must be an integer: {index}", line, column)
+
+    if index < 0 or index > len(array):
+        raise IndexError(f"Array index out of bounds: {index}", line, column)
+
+
+def store_index(array, index, value):
+    """Store an array element, appending at the end / 存储数组元素，末尾时附加"""
+    if index == len(array):
+        array.append(value)
+    else:
+        array[index] = value
+    return value
+
+
+def divide(a, b):
+    """Evil Lang `/`, checking the divisor before the operand types / 在检查操作数类型之前检查除数"""
+    if b == 0:
+        raise ZeroDivisionError("division by zero")
+    return a / b
+
+
+def modulo(a, b):
+    """Evil Lang `%`, checking the divisor before the operand types / 在检查操作数类型之前检查除数"""
+    if b == 0:
+        raise ZeroDivisionError("modulo by zero")
+    return a % b
+
+
+# 二元操作符到运算函数的映射 Binary operator to operation mapping
+# Operations raise native TypeError / ZeroDivisionError and callers handle them
+# with binary_fallback, so positions are only read on failure. `+` is native
+# addition: mixing a string with another type is the only case it rejects that
+# Evil Lang accepts, and binary_fallback concatenates those.
+# 运算抛出原生 TypeError / ZeroDivisionError，由调用方用 binary_fallback 处理，因此只有出错时
+# 才读取位置信息。`+` 是原生加法：字符串与其他类型混合是它拒绝而 Evil Lang 接受的唯一情况，
+# 由 binary_fallback 完成连接。
+BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': divide,
+    '%': modulo,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+}
+
+# 一元操作符到运算函数的映射 Unary operator to operation mapping
+UNARY_OPERATORS = {
+    '+': operator.pos,
+    '-': operator.neg,
+    '!': operator.not_,
+}
+
+
+def binary_type_error(op, a, b, line=None, column=None):
+    """Evil Lang error for operands a binary operator rejects / 二元操作符拒绝操作数时的 Evil Lang 错误"""
+    return operand_type_error(op, type(a).__name__, type(b).__name__, line, column)
+
+
+def operand_type_error(op, left_type, right_type, line=None, column=None):
+    """The same error, from the names of the operand types / 同一错误，由操作数类型名构造"""
+    return TypeError(f"Operator '{op}' cannot be applied to types '{left_type}' and '{right_type}'", line, column)
+
+
+def zero_division_error(op, line=None, column=None):
+    """Evil Lang error for `/` or `%` by zero / `/` 或 `%` 除以零时的 Evil Lang 错误"""
+    return ValueError("Modulo by zero" if op == '%' else "Division by zero", line, column)
+
+
+def unary_type_error(op, line=None, column=None):
+    """Evil Lang error for a failed unary operation / 一元运算失败时的 Evil Lang 错误"""
+    return TypeError(f"Operator '{op}' cannot be applied to this type", line, column)
+
+
+def binary_fallback(error, op, a, b, line=None, column=None):
+    """Finish a binary operation whose native operation failed / 完成原生运算失败的二元运算
+
+    Returns the concatenation for `+` with a string operand, otherwise raises
+    the Evil Lang error located at (line, column).
+    `+` 有字符串操作数时返回连接结果，否则抛出位于 (行, 列) 处的 Evil Lang 错误。
+    """
+    if op == '+' and (isinstance(a, str) or isinstance(b, str)):
+        # String concatenation converts the other operand / 字符串连接会转换另一个操作数
+        return to_string(a) + to_string(b)
+    if isinstance(error, ZeroDivisionError):
+        raise zero_division_error(op, line, column)
+    raise binary_type_error(op, a, b, line, column)
+
+
+def add(a, b, line=None, column=None):
+    """Evil Lang `+` for engines without a pre-bound operation / 供没有预绑定运算的引擎使用的 `+` 运算"""
+    try:
+        return a + b
+    except PyTypeError as e:
+        return binary_fallback(e, '+', a, b, line, column)
+
+
+def operate(op, a, b, line=None, column=None):
+    """Evil Lang binary operation for engines without a pre-bound operation / 供没有预绑定运算的引擎使用的二元运算"""
+    try:
+        return BINARY_OPERATORS[op](a, b)
+    except (PyTypeError, ZeroDivisionError) as e:
+        return binary_fallback(e, op, a, b, line, column)
+
+
+def unary_error(token):
+    """Evil Lang error for a failed unary operation at an operator token / 位于操作符标记处的一元运算失败错误"""
+    return unary_type_error(token.value, token.line, token.column)
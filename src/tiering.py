@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 分层执行 / Tiered Execution
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+from .errors import EvilLangError
+from .closure_compiler import ClosureCompiler
+from .config import Config
+
+
+class Tiering:
+    """Hotness counters that promote the tree walker's hot code to compiled closures
+    热度计数器：将语法树遍历器中的热点代码提升为编译后的闭包
+
+    Every function or method body counts its calls and every while or for
+    loop its iterations. Once a count reaches its threshold in `Config`, the
+    body or loop is compiled by a closure compiler and later runs use the
+    compiled form, so short scripts never pay for compilation.
+    每个函数或方法体统计调用次数，每个while或for循环统计迭代次数。计数达到 `Config` 中的阈值后，
+    函数体或循环由闭包编译器编译，之后的执行使用编译后的形式，因此短脚本不承担编译开销。
+
+    Compiled closures read globals from the environment they were compiled
+    against. That is the assumption guarded here: code reached with another
+    global environment (the same declaration imported as another module) runs
+    on the tree walker again, and is recompiled for that environment once it
+    gets hot there. A node that cannot be compiled stays on the tree walker.
+    编译后的闭包从编译时所针对的全局环境中读取全局变量，这是此处守护的假设：以其他全局环境
+    执行到的代码（例如作为另一个模块导入的同一声明）重新由语法树遍历器执行，在该环境中变热后再为其重新编译。
+    无法编译的节点一直由语法树遍历器执行。
+
+    Compiled code also bypasses `Interpreter.dispatch`. While a handler is
+    registered on the dispatch table, or when the interpreter's class
+    overrides `visit` or a `visit_*` method, nothing is promoted and code
+    already compiled is not used, so the custom handlers see every node.
+    编译后的代码也绕过 `Interpreter.dispatch`。当分派表上注册了处理方法，或解释器的类覆盖了
+    `visit` 或某个 `visit_*` 方法时，不提升任何代码，也不使用已编译的代码，因此自定义处理方法能看到每个节点。
+    """
+
+    def __init__(self, interpreter):
+        self.compiler = ClosureCompiler(interpreter, tiered=True)
+        self.dispatch = interpreter.dispatch
+        self.custom_visitors = bool(overridden_visitors(type(interpreter)))  # 类覆盖了访问方法 The class overrides visitors
+        self.function_threshold = Config.HOT_FUNCTION_THRESHOLD  # 函数体的调用阈值 Calls before a body is compiled
+        self.loop_threshold = Config.HOT_LOOP_THRESHOLD          # 循环的迭代阈值 Iterations before a loop is compiled
+        self.counters = {}  # 函数体或循环节点 -> 调用或迭代次数 Body or loop node -> calls or iterations
+        self.compiled = {}  # 节点 -> (全局环境, 闭包，无法编译时为None) Node -> (globals, closure or None)
+
+    def body_code(self, body, genv):
+        """Compiled function or method body once it is hot, else None
+        函数或方法体变热后返回编译后的闭包，否则返回None"""
+        if self.custom_visitors or self.dispatch.overrides:
+            return None
+        entry = self.compiled.get(body)
+        if entry is not None and entry[0] is genv:
+            return entry[1]
+        count = self.counters.get(body, 0) + 1
+        if count < self.function_threshold:
+            self.counters[body] = count
+            return None
+        return self.compile(body, genv, self.compiler.stmt)
+
+    def enter_loop(self, node, genv):
+        """(compiled loop, 0) for a hot loop, else (None, iterations left before it gets hot)
+        热循环返回 (编译后的循环, 0)，否则返回 (None, 变热前剩余的迭代次数)
+
+        The count is -1 when the loop is never to be compiled.
+        循环永不编译时剩余次数为-1。
+        """
+        if self.custom_visitors or self.dispatch.overrides:
+            return None, -1
+        entry = self.compiled.get(node)
+        if entry is not None and entry[0] is genv:
+            if entry[1] is None:
+                return None, -1
+            return entry[1], 0
+        return None, max(self.loop_threshold - self.counters.get(node, 0), 1)
+
+    def leave_loop(self, node, budget):
+        """Remember the iterations of a loop that is not hot yet / 记录尚未变热的循环的迭代次数"""
+        self.counters[node] = self.loop_threshold - budget
+
+    def compile_loop(self, node, genv):
+        """Compile a loop that just got hot, None if it cannot be compiled
+        编译刚变热的循环，无法编译时返回None"""
+        return self.compile(node, genv, self.compiler.loop)
+
+    def compile(self, node, genv, compile):
+        if self.dispatch.overrides:
+            # 循环运行期间注册了处理方法 A handler was registered while the loop ran
+            return None
+        self.counters[node] = 0
+        try:
+            code = self.compiler.compile_in(genv, compile, node)
+        except (EvilLangError, RecursionError):
+            code = None
+        self.compiled[node] = (genv, code)
+        return code
+
+
+def overridden_visitors(interpreter_class):
+    """Names of the visitor methods an `Interpreter` subclass overrides
+    `Interpreter` 子类所覆盖的访问方法名称"""
+    from .interpreter import Interpreter  # 避免循环导入 Avoid a circular import
+    return [name for name in dir(interpreter_class)
+            if name.startswith('visit') and getattr(interpreter_class, name) is not getattr(Interpreter, name, None)]
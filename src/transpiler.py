@@ -0,0 +1,742 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - Python 转译后端 / Python Transpiler Backend
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+import ast as pyast
+import copy
+import itertools
+import sys
+
+from .ast import *
+from .resolver import Resolver, Scope
+from .transpiler_runtime import ModuleRuntime, NATIVE_ERRORS, map_native_error
+from .errors import EvilLangError, RuntimeError
+
+# Evil Lang 运算符到 Python 运算符的映射 Evil Lang to Python operator mapping
+ARITHMETIC_OPERATORS = {
+    '-': pyast.Sub,
+    '*': pyast.Mult,
+    '/': pyast.Div,
+    '%': pyast.Mod,
+}
+
+COMPARISON_OPERATORS = {
+    '==': pyast.Eq,
+    '!=': pyast.NotEq,
+    '<': pyast.Lt,
+    '>': pyast.Gt,
+    '<=': pyast.LtE,
+    '>=': pyast.GtE,
+}
+
+UNARY_OPERATORS = {
+    '-': pyast.USub,
+    '+': pyast.UAdd,
+    '!': pyast.Not,
+}
+
+
+def _int_constant(expr):
+    return isinstance(expr, pyast.Constant) and expr.value.__class__ is int
+
+
+def _nonzero_constant(expr):
+    return isinstance(expr, pyast.Constant) and expr.value.__class__ in (int, float) and expr.value != 0
+
+
+def _is_load(expr):
+    """Whether an expression only reads a variable / 表达式是否只读取变量"""
+    if isinstance(expr, pyast.Subscript):
+        return isinstance(expr.value, pyast.Name) and expr.value.id == 'G' and isinstance(expr.slice, pyast.Constant)
+    return isinstance(expr, pyast.Name)
+
+
+def _name(identifier, store=False):
+    return pyast.Name(id=identifier, ctx=pyast.Store() if store else pyast.Load())
+
+
+def _const(value):
+    return pyast.Constant(value=value)
+
+
+def _call(func, *args):
+    if isinstance(func, str):
+        func = _name(func)
+    return pyast.Call(func=func, args=list(args), keywords=[])
+
+
+def _attribute(value, attr):
+    return pyast.Attribute(value=value, attr=attr, ctx=pyast.Load())
+
+
+def _subscript(value, key, store=False):
+    ctx = pyast.Store() if store else pyast.Load()
+    if sys.version_info < (3, 9):
+        key = pyast.Index(value=key)
+    return pyast.Subscript(value=value, slice=key, ctx=ctx)
+
+
+def _assign(targets, value):
+    return pyast.Assign(targets=list(targets), value=value)
+
+
+def _function_def(name, params, body):
+    node = pyast.FunctionDef(
+        name=name,
+        args=pyast.arguments(
+            posonlyargs=[], args=[pyast.arg(arg=param) for param in params], vararg=None,
+            kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[]
+        ),
+        body=body or [pyast.Pass()],
+        decorator_list=[],
+        returns=None,
+    )
+    if 'type_params' in pyast.FunctionDef._fields:
+        node.type_params = []  # Python 3.12+
+    return node
+
+
+class FunctionContext:
+    """Python function being generated / 正在生成的Python函数"""
+
+    def __init__(self, level):
+        self.levels = {level}   # 本函数持有的帧层级（含内联的catch帧） Frame levels held by this function
+        self.nonlocals = set()  # 需要声明为nonlocal的外层变量 Outer variables assigned here
+        self.loops = []         # 外层循环 Enclosing loops (LoopContext)
+
+
+class LoopContext:
+    """Loop being generated / 正在生成的循环
+
+    A for loop whose continue has to run a pending finally body first cannot
+    inline its update before `continue`; its body is then wrapped in a
+    one-shot inner loop, so continue becomes `break` and break sets a flag.
+    若 for 循环中的 continue 需要先执行尚未完成的 finally 体，则不能在 `continue` 前内联更新语句；
+    此时循环体被包装在只执行一次的内层循环中，continue 变为 `break`，break 则设置标志。
+    """
+
+    def __init__(self, update=None, flag=None):
+        self.update = update  # 更新语句（while为None） Update statement, None for while
+        self.flag = flag      # 包装时的 break 标志名 Name of the break flag when wrapped
+
+
+def _continue_crosses_finally(node, protected=False):
+    """Whether a continue of this loop sits inside a try with finally / 本循环的continue是否位于带finally的try中"""
+    if isinstance(node, Continue):
+        return protected
+    if isinstance(node, Compound):
+        return any(_continue_crosses_finally(child, protected) for child in node.children)
+    if isinstance(node, If):
+        return (_continue_crosses_finally(node.if_body, protected) or
+                node.else_body is not None and _continue_crosses_finally(node.else_body, protected))
+    if isinstance(node, TryStmt):
+        inner = protected or node.finally_block is not None
+        return (_continue_crosses_finally(node.try_block, inner) or
+                node.catch_clause is not None and _continue_crosses_finally(node.catch_clause.body, inner) or
+                node.finally_block is not None and _continue_crosses_finally(node.finally_block, protected))
+    # 嵌套的循环和函数有自己的 continue Nested loops and functions own their continues
+    return False
+
+
+class Transpiler:
+    """Translate a resolved Evil Lang program into a Python ast.Module
+    将已解析的 Evil Lang 程序翻译为 Python ast.Module
+
+    Evil Lang frames become Python function scopes: the variable in slot s of
+    the frame at nesting level L is the Python local ``<name>_<L>``, so
+    closures are native Python closures. Catch clauses, which get their own
+    frame in Evil Lang, are inlined into the enclosing Python function.
+    Every generated node carries the line and column of the Evil Lang token it
+    came from, so CPython's own position tables map back to the `.el` source.
+    Evil Lang 的帧对应 Python 函数作用域：嵌套层级为 L 的帧中的变量是 Python 局部变量
+    ``<名称>_<L>``，闭包即为原生 Python 闭包。catch 子句内联到外层 Python 函数中。
+    每个生成的节点都带有其来源标记的行列位置，CPython 自身的位置表即可映射回 `.el` 源码。
+    """
+
+    def __init__(self):
+        self.constants = []   # 生成代码通过 K[i] 引用的对象 Objects referenced as K[i]
+        self.source_map = {}  # (行, 列) -> 函数调用节点 (line, column) -> FuncCall node
+        self.level = 0        # 当前帧层级，顶层为0 Current frame level, 0 at top level
+        self.scopes = []      # 每个帧的名称到层级映射 Name to level mapping of each frame
+        self.context = None
+        self.ids = itertools.count()
+        self.declared = set() # 当前语句之前必定已声明的全局变量 Globals certainly declared before the current statement
+
+    def translate(self, tree):
+        """Translate a program into a module defining __program__ / 将程序翻译为定义 __program__ 的模块"""
+        self.context = FunctionContext(0)
+        program = _function_def('__program__', [], self.program_body(tree))
+        program.lineno, program.col_offset = 1, 0
+        module = pyast.Module(body=[program], type_ignores=[])
+        return pyast.fix_missing_locations(module)
+
+    def program_body(self, tree):
+        children = tree.children if isinstance(tree, Compound) else [tree]
+        body = [_assign([_name('_result', store=True)], _const(None))]
+        for child in children:
+            if isinstance(child, NoOp):
+                continue
+            if isinstance(child, VALUE_STATEMENTS) or not self.is_statement(child):
+                body += self.value_statement(child)
+            else:
+                body += self.stmt(child)
+                body.append(_assign([_name('_result', store=True)], _const(None)))
+            # 顶层声明执行之后，之后的语句给它赋值无需检查 Later stores to a top-level declaration need no check
+            if isinstance(child, VarDecl):
+                self.declared.add(child.var_node.value)
+            elif isinstance(child, (FuncDecl, ClassDecl)):
+                self.declared.add(child.name)
+        body.append(pyast.Return(value=_name('_result')))
+        return body
+
+    def value_statement(self, node):
+        """Statement whose value is stored in _result / 其值保存到 _result 的语句"""
+        result = _name('_result', store=True)
+        if isinstance(node, Assign):
+            return self.assign(node, [result])
+        if isinstance(node, CompoundAssign):
+            return [self.located(statement, node) for statement in self.compound_assign(node, [result])]
+        if isinstance(node, VarDecl):
+            return self.var_decl(node, [result])
+        if isinstance(node, FuncDecl):
+            return self.func_decl(node, [result])
+        if isinstance(node, ClassDecl):
+            return self.class_decl(node, [result])
+        return [self.located(_assign([result], self.expr(node)), node)]
+
+    # ------------------------------------------------------------------
+    # 辅助 Helpers
+    # ------------------------------------------------------------------
+
+    def is_statement(self, node):
+        return hasattr(self, 'stmt_' + type(node).__name__)
+
+    def located(self, pynode, node):
+        """Give a generated node the position of an Evil Lang node / 赋予生成节点 Evil Lang 节点的位置"""
+        line, column = node_position(node)
+        if line is not None:
+            pynode.lineno = pynode.end_lineno = line
+            pynode.col_offset = pynode.end_col_offset = column or 0
+        return pynode
+
+    def constant(self, value):
+        """Reference an arbitrary object from generated code / 从生成代码中引用任意对象"""
+        self.constants.append(value)
+        return _subscript(_name('K'), _const(len(self.constants) - 1))
+
+    def position_args(self, node):
+        line, column = node_position(node)
+        return _const(line), _const(column)
+
+    def local(self, name, level):
+        """Python name of an Evil Lang local / Evil Lang 局部变量的 Python 名称"""
+        return f"{name}_{level}"
+
+    def level_of(self, name):
+        """Level of the frame declaring a resolved local / 声明已解析局部变量的帧层级
+
+        The resolver's depth counts hops through captured cells, which Python
+        closures handle natively, so the level is found by name instead.
+        解析器的深度按捕获单元的跳数计算，而 Python 闭包原生处理单元，因此按名称查找层级。
+        """
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        raise KeyError(name)
+
+    def enter_scope(self, names):
+        self.scopes.append(dict.fromkeys(names, self.level))
+
+    def load(self, name, depth, node=None):
+        if depth is None:
+            return self.located(_subscript(_name('G'), _const(name)), node)
+        return self.located(_name(self.local(name, self.level_of(name))), node)
+
+    def store(self, name, depth):
+        if depth is None:
+            return _subscript(_name('G'), _const(name), store=True)
+        level = self.level_of(name)
+        identifier = self.local(name, level)
+        if level not in self.context.levels:
+            self.context.nonlocals.add(identifier)
+        return _name(identifier, store=True)
+
+    def declare(self, name, slot):
+        if slot is None:
+            return _subscript(_name('G'), _const(name), store=True)
+        return _name(self.local(name, self.level), store=True)
+
+    def hoisted(self, leading, body):
+        """Names declared by a frame, in slot order / 帧中声明的名称（按槽位顺序）"""
+        scope = Scope()
+        for name in leading:
+            scope.declare(name)
+        Resolver().hoist(body, scope)
+        return list(scope.names)
+
+    def function(self, name, leading, body):
+        """Translate a function or method body into a FunctionDef / 将函数或方法体翻译为 FunctionDef"""
+        saved_level, saved_context = self.level, self.context
+        self.level += 1
+        self.context = FunctionContext(self.level)
+        names = self.hoisted(leading, body)
+        self.enter_scope(names)
+        try:
+            statements = []
+            locals_ = [self.local(n, self.level) for n in names[len(leading):]]
+            if locals_:
+                statements.append(_assign([_name(n, store=True) for n in locals_], _const(None)))
+            statements += self.stmt(body)
+            if self.context.nonlocals:
+                statements.insert(0, pyast.Nonlocal(names=sorted(self.context.nonlocals)))
+            params = [self.local(n, self.level) for n in leading]
+            return _function_def(f"{name}__fn{next(self.ids)}", params, statements)
+        finally:
+            self.scopes.pop()
+            self.level, self.context = saved_level, saved_context
+
+    # ------------------------------------------------------------------
+    # 表达式 Expressions
+    # ------------------------------------------------------------------
+
+    def expr(self, node):
+        """Translate an expression node / 翻译表达式节点"""
+        translator = getattr(self, 'expr_' + type(node).__name__, None)
+        if translator is None:
+            raise RuntimeError(f"No visit_{type(node).__name__} method implemented")
+        return self.located(translator(node), node)
+
+    def expr_Number(self, node):
+        return _const(node.value)
+
+    expr_String = expr_Number
+    expr_Boolean = expr_Number
+
+    def expr_Null(self, node):
+        return _const(None)
+
+    def expr_Var(self, node):
+        return self.load(node.value, node.depth)
+
+    def expr_BinOp(self, node):
+        return self.binary(node.op.value, self.expr(node.left), self.expr(node.right), node)
+
+    def binary(self, op, left, right, node):
+        """Python expression for a binary operation located at node / 位于节点处的二元运算的 Python 表达式"""
+        if op == '+':
+            return _call('_add', left, right, *self.position_args(node))
+        if op in COMPARISON_OPERATORS:
+            return pyast.Compare(left=left, ops=[COMPARISON_OPERATORS[op]()], comparators=[right])
+        if op == '-' or (op == '*' and (_int_constant(left) or _int_constant(right))) or \
+                (op == '/' and _nonzero_constant(right)):
+            return pyast.BinOp(left=left, op=ARITHMETIC_OPERATORS[op](), right=right)
+        # Natively, `*` and `%` on strings or lists and `/` or `%` by zero fail with
+        # messages of their own (sequence repetition, string formatting, type before divisor)
+        # 原生的 `*` 和 `%` 作用于字符串或数组、以及 `/` 或 `%` 除以零时，会给出各自不同的错误消息
+        operation = _call('_operate', _const(op), left, right, *self.position_args(node))
+        if op == '%' and _nonzero_constant(right) and _is_load(left):
+            # Only a string on the left formats natively; reading a variable twice is harmless
+            # 只有左侧为字符串时才会进行原生格式化；重复读取变量没有副作用
+            is_string = pyast.Compare(left=_attribute(copy.deepcopy(left), '__class__'), ops=[pyast.Is()],
+                                      comparators=[_name('str')])
+            return pyast.IfExp(test=is_string, body=operation,
+                               orelse=pyast.BinOp(left=copy.deepcopy(left), op=pyast.Mod(), right=right))
+        return operation
+
+    def expr_LogicalOp(self, node):
+        op = pyast.And() if node.op.value == '&&' else pyast.Or()
+        return pyast.BoolOp(op=op, values=[self.expr(node.left), self.expr(node.right)])
+
+    def expr_UnaryOp(self, node):
+        return pyast.UnaryOp(op=UNARY_OPERATORS[node.op.value](), operand=self.expr(node.expr))
+
+    def expr_TernaryOp(self, node):
+        return pyast.IfExp(test=self.expr(node.condition), body=self.expr(node.true_expr),
+                           orelse=self.expr(node.false_expr))
+
+    def expr_ObjectLiteral(self, node):
+        return pyast.Dict(keys=[_const(key) for key in node.pairs],
+                          values=[self.expr(value) for value in node.pairs.values()])
+
+    def expr_Array(self, node):
+        return pyast.List(elts=[self.expr(element) for element in node.elements], ctx=pyast.Load())
+
+    def expr_PropertyAccess(self, node):
+        return _call('_get_property', self.expr(node.obj), _const(node.prop), self.constant(node.cache),
+                     *self.position_args(node.obj))
+
+    def expr_ArrayAccess(self, node):
+        return _call('_get_index', self.expr(node.array), self.expr(node.index),
+                     *self.position_args(node.array))
+
+    def expr_Input(self, node):
+        prompt = self.expr(node.prompt) if node.prompt is not None else _const("")
+        return _call('input', prompt)
+
+    def expr_ThisExpr(self, node):
+        if node.depth is None:
+            return _call('_no_this')
+        return self.load('this', node.depth)
+
+    def expr_SuperExpr(self, node):
+        return _call('_no_super', _const(False), *self.position_args(node))
+
+    def expr_SuperCall(self, node):
+        if node.depth is None:
+            return _call('_no_super', _const(True), *self.position_args(node))
+        return self.located(_call('_call_super', self.load('this', node.depth), self.constant(node),
+                                  *[self.expr(arg) for arg in node.arguments]), node)
+
+    def expr_NewExpr(self, node):
+        return _call('_new', _const(node.class_name), *[self.expr(arg) for arg in node.arguments])
+
+    def expr_MethodCall(self, node):
+        return _call('_call_method', self.expr(node.obj), _const(node.method), self.constant(node.cache),
+                     *[self.expr(arg) for arg in node.arguments])
+
+    def expr_FuncCall(self, node):
+        # (F.code if F is a FuncRef of the right arity else _callee(F, ...))(args)
+        name = node.name
+        argc = len(node.arguments)
+        line, column = node_position(node)
+        self.source_map[(line, column)] = node
+
+        def callee():
+            if node.depth is None:
+                return _call(_attribute(_name('G'), 'get'), _const(name))
+            return self.load(name, node.depth)
+
+        is_function = pyast.BoolOp(op=pyast.And(), values=[
+            pyast.Compare(left=_attribute(callee(), '__class__'), ops=[pyast.Is()], comparators=[_name('FuncRef')]),
+            pyast.Compare(left=_call('len', _attribute(_attribute(callee(), 'func_node'), 'params')),
+                          ops=[pyast.Eq()], comparators=[_const(argc)]),
+        ])
+        function = pyast.IfExp(
+            test=is_function,
+            body=_attribute(callee(), 'code'),
+            orelse=_call('_callee', callee(), _const(argc), _const(name), _const(line), _const(column)),
+        )
+        return _call(function, *[self.expr(arg) for arg in node.arguments])
+
+    # ------------------------------------------------------------------
+    # 语句 Statements
+    # ------------------------------------------------------------------
+
+    def stmt(self, node):
+        """Translate a statement node into a list of statements / 将语句节点翻译为语句列表"""
+        translator = getattr(self, 'stmt_' + type(node).__name__, None)
+        if translator is None:
+            statements = [pyast.Expr(value=self.expr(node))]
+        else:
+            statements = translator(node)
+        for statement in statements:
+            if not hasattr(statement, 'lineno'):
+                self.located(statement, node)
+        return statements
+
+    def block(self, node):
+        return self.stmt(node) or [pyast.Pass()]
+
+    def stmt_Compound(self, node):
+        statements = []
+        for child in node.children:
+            if not isinstance(child, NoOp):
+                statements += self.stmt(child)
+        return statements
+
+    def stmt_NoOp(self, node):
+        return []
+
+    def stmt_Assign(self, node):
+        return self.assign(node)
+
+    def assign(self, node, extra_targets=()):
+        target = node.left
+        if isinstance(target, Var):
+            statements = []
+            if target.depth is None and target.value not in self.declared:
+                # 读取一次全局变量，使未声明的变量在求值右侧之前报告 NameError
+                # Read the global once so an undeclared one raises NameError before the right side runs
+                statements.append(pyast.Expr(value=self.load(target.value, None, target)))
+            statements.append(_assign([*extra_targets, self.store(target.value, target.depth)], self.expr(node.right)))
+            return statements
+
+        line, column = self.position_args(target)
+        if isinstance(target, ArrayAccess):
+            checked = _call('_check_index', self.expr(target.array), self.expr(target.index), line, column)
+            value = _call('_set_index', checked, self.expr(node.right))
+        elif isinstance(target, PropertyAccess):
+            checked = _call('_check_property', self.expr(target.obj), line, column)
+            value = _call('_set_property', checked, _const(target.prop), self.expr(node.right))
+        else:
+            raise TypeError(f"Unsupported assignment target type: {type(target)}")
+
+        if extra_targets:
+            return [_assign(extra_targets, value)]
+        return [pyast.Expr(value=value)]
+
+    def stmt_CompoundAssign(self, node):
+        return self.compound_assign(node)
+
+    def compound_assign(self, node, extra_targets=()):
+        # The target's object and index are kept in temporaries so they are evaluated once
+        # 目标的对象和索引保存在临时变量中，因此只求值一次
+        target = node.left
+        right = self.expr(node.right)
+        if isinstance(target, Var):
+            value = self.binary(node.op, self.load(target.value, target.depth, target), right, node)
+            return [_assign([*extra_targets, self.store(target.value, target.depth)], value)]
+
+        number = next(self.ids)
+        if isinstance(target, ArrayAccess):
+            array, index = f"_array{number}", f"_index{number}"
+            statements = [_assign([_name(array, store=True)], self.expr(target.array)),
+                          _assign([_name(index, store=True)], self.expr(target.index))]
+            current = _call('_get_index', _name(array), _name(index), *self.position_args(target.array))
+            element = pyast.Tuple(elts=[_name(array), _name(index)], ctx=pyast.Load())
+            value = _call('_set_index', element, self.binary(node.op, current, right, node))
+        elif isinstance(target, PropertyAccess):
+            obj, result = f"_object{number}", f"_value{number}"
+            line, column = self.position_args(target.obj)
+            current = _call('_get_property', _name(obj), _const(target.prop), self.constant(target.cache), line, column)
+            statements = [_assign([_name(obj, store=True)], self.expr(target.obj)),
+                          _assign([_name(result, store=True)], self.binary(node.op, current, right, node))]
+            checked = _call('_check_property', _name(obj), line, column)
+            value = _call('_set_property', checked, _const(target.prop), _name(result))
+        else:
+            raise TypeError(f"Unsupported assignment target type: {type(target)}")
+
+        if extra_targets:
+            return statements + [_assign(extra_targets, value)]
+        return statements + [pyast.Expr(value=value)]
+
+    def stmt_VarDecl(self, node):
+        return self.var_decl(node)
+
+    def var_decl(self, node, extra_targets=()):
+        value = self.expr(node.value_node) if node.value_node is not None else _const(None)
+        return [_assign([*extra_targets, self.declare(node.var_node.value, node.slot)], value)]
+
+    def stmt_FuncDecl(self, node):
+        return self.func_decl(node)
+
+    def func_decl(self, node, extra_targets=()):
+        function = self.function(node.name, [param.value for param in node.params], node.body)
+        value = _call('_function', self.constant(node), _name(function.name))
+        return [function, _assign([*extra_targets, self.declare(node.name, node.slot)], value)]
+
+    def stmt_ClassDecl(self, node):
+        return self.class_decl(node)
+
+    def class_decl(self, node, extra_targets=()):
+        methods = list(node.methods)
+        if node.constructor is not None:
+            methods.append(node.constructor)
+        functions = [
+            self.function(f"{node.name}_{method.name}", ['this'] + [param.value for param in method.params],
+                          method.body)
+            for method in methods
+        ]
+        value = _call('_class', self.constant(node),
+                      pyast.Tuple(elts=[_name(function.name) for function in functions], ctx=pyast.Load()))
+        return functions + [_assign([*extra_targets, self.declare(node.name, node.slot)], value)]
+
+    def stmt_If(self, node):
+        orelse = self.block(node.else_body) if node.else_body is not None else []
+        return [pyast.If(test=self.expr(node.condition), body=self.block(node.if_body), orelse=orelse)]
+
+    def stmt_While(self, node):
+        self.context.loops.append(LoopContext())
+        body = self.block(node.body)
+        self.context.loops.pop()
+        return [pyast.While(test=self.expr(node.condition), body=body, orelse=[])]
+
+    def stmt_For(self, node):
+        init = self.stmt(node.init_stmt)
+        if not _continue_crosses_finally(node.body):
+            self.context.loops.append(LoopContext(node.update_stmt))
+            body = self.stmt(node.body)
+            self.context.loops.pop()
+            body += self.stmt(node.update_stmt)
+            return init + [pyast.While(test=self.expr(node.condition), body=body, orelse=[])]
+
+        # while cond: flag = False; while True: body; break / if flag: break / update
+        flag = f"_break{next(self.ids)}"
+        self.context.loops.append(LoopContext(node.update_stmt, flag))
+        inner = self.stmt(node.body) + [pyast.Break()]
+        self.context.loops.pop()
+        body = [
+            _assign([_name(flag, store=True)], _const(False)),
+            pyast.While(test=_const(True), body=inner, orelse=[]),
+            pyast.If(test=_name(flag), body=[pyast.Break()], orelse=[]),
+        ] + self.stmt(node.update_stmt)
+        return init + [pyast.While(test=self.expr(node.condition), body=body, orelse=[])]
+
+    def stmt_Print(self, node):
+        return [pyast.Expr(value=_call('print', self.expr(node.expr)))]
+
+    def stmt_Return(self, node):
+        if self.level == 0:
+            # return 在顶层结束程序，结果为 null / A top-level return ends the program with a null result
+            statements = self.stmt(node.expr) if node.expr is not None else []
+            return statements + [pyast.Return(value=_const(None))]
+        value = self.expr(node.expr) if node.expr is not None else _const(None)
+        return [pyast.Return(value=value)]
+
+    def stmt_Break(self, node):
+        if not self.context.loops:
+            # break/continue outside a loop ends the current code / 循环外的break/continue结束当前代码
+            return [pyast.Return(value=_const(None))]
+        loop = self.context.loops[-1]
+        if loop.flag is not None:
+            return [_assign([_name(loop.flag, store=True)], _const(True)), pyast.Break()]
+        return [pyast.Break()]
+
+    def stmt_Continue(self, node):
+        if not self.context.loops:
+            return [pyast.Return(value=_const(None))]
+        loop = self.context.loops[-1]
+        if loop.flag is not None:
+            return [pyast.Break()]
+        # A for loop runs its update before the next test / for 循环在下一次判断前执行更新语句
+        statements = self.stmt(loop.update) if loop.update is not None else []
+        return statements + [pyast.Continue()]
+
+    def stmt_ImportStmt(self, node):
+        return [pyast.Expr(value=_call('_import', self.constant(node)))]
+
+    def stmt_ExportStmt(self, node):
+        statements = []
+        for item in node.items:
+            if item.value is not None:
+                statements += self.stmt(item.value)
+            statements.append(pyast.Expr(value=_call('_export', _const(item.name))))
+        return statements
+
+    def stmt_ThrowStmt(self, node):
+        return [pyast.Raise(exc=_call('EvilLangException', self.expr(node.expr)), cause=None)]
+
+    def stmt_TryStmt(self, node):
+        body = self.block(node.try_block)
+        error = f"_exc{next(self.ids)}"
+
+        if node.catch_clause is not None:
+            # The catch frame is inlined one level deeper / catch 帧内联在更深一层
+            clause = node.catch_clause
+            saved_level = self.level
+            self.level += 1
+            self.context.levels.add(self.level)
+            hoisted = self.hoisted([clause.param], clause.body)
+            self.enter_scope(hoisted)
+            try:
+                names = [self.local(n, self.level) for n in hoisted]
+                handler = [_assign([_name(names[0], store=True)], _call('_caught', _name(error)))]
+                if len(names) > 1:
+                    handler.append(_assign([_name(n, store=True) for n in names[1:]], _const(None)))
+                handler += self.stmt(clause.body)
+            finally:
+                self.scopes.pop()
+                self.level = saved_level
+        else:
+            handler = [pyast.Raise(exc=_call('_wrap', _name(error)), cause=None)]
+
+        finalbody = self.stmt(node.finally_block) if node.finally_block is not None else []
+        return [pyast.Try(
+            body=body,
+            handlers=[pyast.ExceptHandler(type=_name('Exception'), name=error, body=handler)],
+            orelse=[],
+            finalbody=finalbody,
+        )]
+
+
+class PythonBackend:
+    """Run programs by transpiling them to Python code objects
+    通过转译为 Python 代码对象来运行程序"""
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.source_maps = {}           # 代码文件名 -> 源码映射 Code filename -> source map
+        self.programs = itertools.count()
+        self.active = 0                 # 正在执行的入口数 Number of active entries
+
+    def transpile(self, tree):
+        """Translate a resolved program / 翻译已解析的程序"""
+        transpiler = Transpiler()
+        return transpiler, transpiler.translate(tree)
+
+    def prepare(self, tree):
+        """Transpile and compile a resolved program into a callable that runs it
+        将已解析的程序转译并编译为运行它的可调用对象"""
+        transpiler, module = self.transpile(tree)
+        filename = f"<evil {self.interpreter.filename or 'main'} #{next(self.programs)}>"
+        code = compile(module, filename, 'exec')
+        self.source_maps[filename] = transpiler.source_map
+
+        runtime = ModuleRuntime(self.interpreter, self.interpreter.globals)
+        namespace = runtime.namespace(transpiler.constants)
+        exec(code, namespace)
+        program = namespace['__program__']
+        return lambda: self.enter(program)
+
+    def run(self, tree):
+        """Transpile, compile and run a resolved program / 转译、编译并运行已解析的程序"""
+        return self.prepare(tree)()
+
+    def execute_body(self, body, frame, globals=None):
+        """Run a transpiled method body with the arguments of a frame / 以帧中的参数运行转译后的方法体"""
+        evil_class = frame[1].evil_class
+        while body not in evil_class.compiled:
+            evil_class = evil_class.superclass
+        fn = evil_class.compiled[body]
+        return self.enter(fn, *frame[1:fn.__code__.co_argcount + 1])
+
+    def enter(self, fn, *args):
+        """Call into generated code, mapping errors at the outermost entry / 调用生成代码，并在最外层入口映射错误"""
+        self.active += 1
+        try:
+            return fn(*args)
+        except Exception as error:
+            if self.active == 1:
+                mapped = self.map_error(error)
+                if mapped is not error:
+                    raise mapped from None
+            raise
+        finally:
+            self.active -= 1
+
+    def map_error(self, error):
+        """Point an error at the `.el` source using the traceback / 借助回溯将错误定位到 `.el` 源码"""
+        entries = []  # 生成代码中的帧，由外到内 Generated frames, outermost first
+        innermost_generated = False
+        tb = error.__traceback__
+        while tb is not None:
+            code = tb.tb_frame.f_code
+            source_map = self.source_maps.get(code.co_filename)
+            innermost_generated = source_map is not None
+            if source_map is not None:
+                line, column = self.position(code, tb)
+                entries.append((source_map, line, column))
+            tb = tb.tb_next
+
+        if isinstance(error, NATIVE_ERRORS) and innermost_generated:
+            _, line, column = entries[-1]
+            error = map_native_error(error, line, column)
+
+        if isinstance(error, EvilLangError):
+            # Every active call site becomes a stack frame / 每个活动的调用点都成为一个堆栈帧
+            for source_map, line, column in reversed(entries):
+                node = source_map.get((line, column))
+                if node is not None:
+                    error.add_stack_frame(node.name, line, column)
+        return error
+
+    def position(self, code, tb):
+        """Evil Lang (line, column) of the instruction a traceback entry stopped at
+        回溯条目所停指令对应的 Evil Lang (行, 列)"""
+        if hasattr(code, 'co_positions'):
+            positions = code.co_positions()
+            line, _, column, _ = next(itertools.islice(positions, tb.tb_lasti // 2, None))
+            return line, column
+        return tb.tb_lineno, None  # Python < 3.11 只记录行号 only records lines
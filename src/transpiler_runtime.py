@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - Python 转译运行时支持 / Python Transpiler Runtime Support
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+# Helpers called by transpiled programs wherever Evil Lang semantics differ
+# from Python's: string `+` coercion, the class and instance model, and the
+# mapping of native Python errors to Evil Lang errors.
+# 转译后的程序在 Evil Lang 语义与 Python 不同之处调用这些辅助函数：字符串 `+` 的类型转换、
+# 类与实例模型，以及将原生 Python 错误映射为 Evil Lang 错误。
+
+import builtins
+import re
+
+from .ast import FuncRef
+from .errors import EvilLangError, RuntimeError, NameError, TypeError, ValueError, EvilLangException
+from .class_system import EvilClass, EvilInstance, BoundMethod, super_frame
+from .runtime import (get_property, get_index, check_index_store, store_index, add, operate,
+                      operand_type_error, zero_division_error, unary_type_error)
+from .inline_cache import cached_method, cached_field, cached_super
+
+PyTypeError = builtins.TypeError
+
+# Messages of native operator errors / 原生运算符错误的消息
+_BINARY_MESSAGE = re.compile(r"unsupported operand type\(s\) for (\S+): '(\w+)' and '(\w+)'")
+_COMPARE_MESSAGE = re.compile(r"'(\S+)' not supported between instances of '(\w+)' and '(\w+)'")
+_UNARY_MESSAGE = re.compile(r"bad operand type for unary (\S+): '(\w+)'")
+
+# Native errors raised directly by operators in generated code
+# 由生成代码中的运算符直接抛出的原生错误
+NATIVE_ERRORS = (PyTypeError, ZeroDivisionError, KeyError)
+
+
+def map_native_error(error, line=None, column=None):
+    """Convert a native Python error raised by generated code / 转换生成代码抛出的原生Python错误"""
+    if isinstance(error, ZeroDivisionError):
+        return zero_division_error('%' if 'modulo' in str(error) else '/', line, column)
+
+    if isinstance(error, KeyError):
+        # Only global variable reads subscript dictionaries / 只有全局变量读取会对字典取下标
+        return NameError(f"Variable '{error.args[0]}' is not declared", line, column)
+
+    message = str(error)
+    match = _BINARY_MESSAGE.match(message) or _COMPARE_MESSAGE.match(message)
+    if match:
+        return operand_type_error(*match.groups(), line, column)
+    match = _UNARY_MESSAGE.match(message)
+    if match:
+        return unary_type_error(match.group(1), line, column)
+    return TypeError(message, line, column)
+
+
+def to_exception(error):
+    """Convert any caught error into a user exception / 将捕获的任意错误转换为用户异常"""
+    if isinstance(error, EvilLangException):
+        return error
+    if isinstance(error, NATIVE_ERRORS):
+        error = map_native_error(error)
+    return EvilLangException(str(error))
+
+
+def caught(error):
+    """Value bound to a catch parameter / 绑定到catch参数的值"""
+    return to_exception(error).value
+
+
+def property_access(obj, prop, cache, line, column):
+    """Read a property, through the site's inline cache for instance fields
+    读取属性，实例字段通过访问点的内联缓存读取"""
+    if obj.__class__ is EvilInstance:
+        index = cached_field(cache, obj, prop)
+        if index is not None:
+            value = obj.values[index]
+            if value is not None:
+                return value
+    return get_property(obj, prop, line, column)
+
+
+def check_index(array, index, line, column):
+    """Validate an element assignment target before its value is computed / 在计算值之前校验数组元素赋值目标"""
+    check_index_store(array, index, line, column)
+    return array, index
+
+
+def set_index(target, value):
+    array, index = target
+    return store_index(array, index, value)
+
+
+def check_property(obj, line, column):
+    """Validate a property assignment target / 校验属性赋值目标"""
+    if isinstance(obj, (dict, EvilInstance)):
+        return obj
+    raise TypeError(f"Cannot set property on non-object type", line, column)
+
+
+def set_property(obj, prop, value):
+    if isinstance(obj, dict):
+        obj[prop] = value
+    else:
+        obj.set(prop, value)
+    return value
+
+
+def no_this():
+    raise RuntimeError("'this' can only be used inside a class method")
+
+
+def no_super(called, line, column):
+    if called:
+        raise RuntimeError("'super' can only be used inside a class method", line, column)
+    raise RuntimeError("'super' must be called: use super(...) or super.method(...)", line, column)
+
+
+class ModuleRuntime:
+    """Helpers bound to one interpreter and one global environment
+    绑定到一个解释器和一个全局环境的辅助函数"""
+
+    def __init__(self, interpreter, genv):
+        self.interpreter = interpreter
+        self.genv = genv
+
+    def namespace(self, constants):
+        """Globals dictionary for a transpiled program / 转译程序的全局字典"""
+        return {
+            'G': self.genv.values,
+            'K': constants,
+            'FuncRef': FuncRef,
+            'EvilLangException': EvilLangException,
+            '_add': add,
+            '_operate': operate,
+            '_get_property': property_access,
+            '_get_index': get_index,
+            '_check_index': check_index,
+            '_set_index': set_index,
+            '_check_property': check_property,
+            '_set_property': set_property,
+            '_caught': caught,
+            '_wrap': to_exception,
+            '_no_this': no_this,
+            '_no_super': no_super,
+            '_callee': self.callee,
+            '_call_method': self.call_method,
+            '_call_super': self.call_super,
+            '_new': self.new,
+            '_function': self.function,
+            '_class': self.make_class,
+            '_import': self.interpreter.visit_ImportStmt,
+            '_export': self.export,
+        }
+
+    def function(self, node, fn):
+        """Wrap a transpiled function as a function reference / 将转译后的函数包装为函数引用"""
+        self.interpreter.functions[node.name] = node
+        func_ref = FuncRef(node, None, self.genv)
+        func_ref.code = fn
+        return func_ref
+
+    def make_class(self, node, functions):
+        """Create a class whose methods are transpiled functions / 创建方法为转译函数的类"""
+        classes = self.interpreter.classes
+        superclass = None
+        if node.superclass:
+            if node.superclass not in classes:
+                raise NameError(f"Superclass '{node.superclass}' is not defined")
+            superclass = classes[node.superclass]
+
+        evil_class = EvilClass(node.name, superclass, {}, node.constructor, None, self.genv)
+        methods = list(node.methods)
+        if node.constructor is not None:
+            methods.append(node.constructor)
+        for method, fn in zip(methods, functions):
+            evil_class.compiled[method.body] = fn
+        evil_class.declare(node)
+
+        classes[node.name] = evil_class
+        return evil_class
+
+    def callee(self, func, argc, name, line, column):
+        """Python callable for a call that is not a direct function call / 非直接函数调用的Python可调用对象"""
+        if func.__class__ is FuncRef:
+            params = func.func_node.params
+            raise ValueError(
+                f"Function '{name}' requires {len(params)} arguments, but {argc} were given",
+                line, column
+            )
+
+        # Method stored in a variable / 存储在变量中的方法
+        if isinstance(func, BoundMethod):
+            interpreter = self.interpreter
+            return lambda *args: func.call(interpreter, list(args))
+
+        # Built-in function / 内置函数
+        if callable(func):
+            def call_builtin(*args):
+                try:
+                    return func(list(args))
+                except EvilLangError:
+                    raise
+                except Exception as e:
+                    raise RuntimeError(str(e), line, column)
+            return call_builtin
+
+        raise NameError(f"Undefined function: {name}", line, column)
+
+    def call_method(self, obj, method_name, cache, *args):
+        """Call a method of an instance or object / 调用实例或对象的方法"""
+        if obj.__class__ is EvilInstance:
+            entry = cached_method(cache, obj, method_name)
+            if entry is not None:
+                method, owner = entry
+                owner.check_method_arguments(method, args)
+                return owner.compiled[method.body](obj, *args)
+
+        if isinstance(obj, EvilInstance):
+            if obj.has_field(method_name):
+                method = obj.get_field(method_name)
+                if method is None:
+                    raise NameError(f"Instance has no method '{method_name}'")
+                if isinstance(method, BoundMethod):
+                    return method.call(self.interpreter, list(args))
+                raise TypeError(f"'{method_name}' is not a callable method")
+
+            method, owner = obj.evil_class.find_method(method_name)
+            if method is None:
+                raise NameError(f"Instance has no method '{method_name}'")
+            owner.check_method_arguments(method, args)
+            return owner.compiled[method.body](obj, *args)
+
+        elif isinstance(obj, dict) and method_name in obj:
+            method = obj[method_name]
+            if not isinstance(method, FuncRef):
+                raise TypeError(f"'{method_name}' is not a callable method")
+            params = method.func_node.params
+            if len(args) != len(params):
+                raise ValueError(
+                    f"Function '{method_name}' requires {len(params)} arguments, "
+                    f"but {len(args)} were given"
+                )
+            return method.code(*args)
+
+        raise NameError(f"Object has no method '{method_name}'")
+
+    def call_super(self, instance, node, *args):
+        """Run a super(...) or super.method(...) call / 执行 super(...) 或 super.method(...) 调用"""
+        # Targets were computed when the class was declared / 目标在类声明时已计算
+        target = cached_super(node.cache, instance, node)
+        method, owner = target
+        if method is None:
+            # No ancestor constructor: only checks the arguments / 没有祖先构造函数：只检查参数
+            return super_frame(target, instance, args)
+        if node.method is None:
+            owner.check_constructor_arguments(args)
+            owner.compiled[method.body](instance, *args)
+            return None
+        owner.check_method_arguments(method, args)
+        return owner.compiled[method.body](instance, *args)
+
+    def new(self, class_name, *args):
+        """Create an instance / 创建实例"""
+        evil_class = self.interpreter.classes.get(class_name)
+        if evil_class is None:
+            raise NameError(f"Class '{class_name}' is not defined")
+        instance = EvilInstance(evil_class)
+        if evil_class.constructor is not None:
+            evil_class.check_constructor_arguments(args)
+            evil_class.compiled[evil_class.constructor.body](instance, *args)
+        return instance
+
+    def export(self, name):
+        interpreter = self.interpreter
+        if not hasattr(interpreter, 'module_exports'):
+            interpreter.module_exports = {}
+        if name not in self.genv.values:
+            raise NameError(f"Cannot export undefined variable '{name}'")
+        interpreter.module_exports[name] = self.genv.values[name]
@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 字节码虚拟机 / Bytecode Virtual Machine
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+import builtins
+
+from .ast import FuncRef
+from .errors import EvilLangError, RuntimeError, NameError, TypeError, ValueError, EvilLangException
+from .class_system import EvilClass, EvilInstance, BoundMethod, super_frame
+from .environment import Cell, new_frame, wrap_cells, capture
+from .runtime import (get_property, get_index, check_index_store, store_index, add,
+                      binary_type_error, zero_division_error, unary_type_error)
+from .compiler import *
+from .config import Config
+from .inline_cache import cached_method, cached_super
+
+PyTypeError = builtins.TypeError
+
+
+def _position(code_obj, pc):
+    """Source position of the instruction before pc / pc 之前那条指令的源码位置"""
+    return code_obj.positions[(pc >> 1) - 1]
+
+
+def _to_exception(error):
+    """Convert any caught error into a user exception / 将捕获的任意错误转换为用户异常"""
+    if isinstance(error, EvilLangException):
+        return error
+    return EvilLangException(str(error))
+
+
+class VirtualMachine:
+    """Stack-based virtual machine executing compiled CodeObjects
+    执行已编译代码对象的基于栈的虚拟机
+
+    Calls between Evil functions, methods and constructors do not recurse in
+    Python: the caller's state is saved in a heap-allocated record and the
+    dispatch loop simply switches to the callee's code.
+    Evil 函数、方法和构造函数之间的调用不会产生 Python 递归：调用者状态保存在堆上分配的记录中，
+    分派循环直接切换到被调用者的代码。
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.compiler = Compiler()
+        self.bodies = self.compiler.bodies  # 方法体节点 -> 代码对象 Method body node -> code object
+
+    # ------------------------------------------------------------------
+    # 入口 Entry points
+    # ------------------------------------------------------------------
+
+    def compile(self, tree):
+        """Compile a resolved program / 编译已解析的程序"""
+        return self.compiler.compile_program(tree)
+
+    def prepare(self, tree):
+        """Compile a resolved program into a callable that runs it / 将已解析的程序编译为运行它的可调用对象"""
+        code = self.compile(tree)
+        return lambda: self.run_code(code, None, self.interpreter.globals)
+
+    def run(self, tree):
+        """Compile and run a resolved program / 编译并运行已解析的程序"""
+        return self.prepare(tree)()
+
+    def execute_body(self, body, frame, globals=None):
+        """Run a compiled method body in the given frame / 在给定帧中运行已编译的方法体"""
+        return self.run_code(self.bodies[body], frame, globals or self.interpreter.globals)
+
+    def code_for(self, func_ref):
+        """Code object of a function reference / 函数引用的代码对象"""
+        if func_ref.code is None:
+            node = func_ref.func_node
+            func_ref.code = self.compiler.compile_function(node.name, node.body, node.frame_size)
+        return func_ref.code
+
+    # ------------------------------------------------------------------
+    # 分派循环 Dispatch loop
+    # ------------------------------------------------------------------
+
+    def run_code(self, code_obj, frame, genv):
+        """Execute a code object until its outermost frame returns / 执行代码对象直到最外层帧返回"""
+        interpreter = self.interpreter
+        classes = interpreter.classes
+        bodies = self.bodies
+        max_depth = Config.MAX_RECURSION_DEPTH
+
+        # Saved caller states / 已保存的调用者状态
+        # (code_obj, pc, frame, stack, handlers, genv, instance)
+        callers = []
+
+        code = code_obj.code
+        consts = code_obj.consts
+        names = code_obj.names
+        gvals = genv.values
+        pc = 0
+        stack = []
+        handlers = []      # (handler pc, stack depth, frame)
+        instance = None    # 构造函数帧正在初始化的实例 Instance being constructed by this frame
+        result = None
+
+        while True:
+            try:
+                while True:
+                    op = code[pc]
+                    arg = code[pc + 1]
+                    pc += 2
+
+                    if op == LOAD_LOCAL:
+                        stack.append(frame[arg])
+
+                    elif op == LOAD_CONST:
+                        stack.append(consts[arg])
+
+                    elif op == STORE_LOCAL:
+                        frame[arg] = stack.pop()
+
+                    elif op == LOAD_DEREF:
+                        outer = frame[0]
+                        for _ in range((arg >> 16) - 1):
+                            outer = outer[0]
+                        stack.append(outer[arg & 0xFFFF])
+
+                    elif op == LOAD_GLOBAL:
+                        try:
+                            stack.append(gvals[names[arg]])
+                        except KeyError:
+                            raise NameError(f"Variable '{names[arg]}' is not declared", *_position(code_obj, pc))
+
+                    elif op == POP_JUMP_IF_FALSE:
+                        if not stack.pop():
+                            pc = arg
+
+                    elif op == JUMP:
+                        pc = arg
+
+                    elif op == BINARY_ADD:
+                        b = stack.pop()
+                        a = stack[-1]
+                        if a.__class__ is int and b.__class__ is int:
+                            stack[-1] = a + b
+                        else:
+                            stack[-1] = add(a, b, *_position(code_obj, pc))
+
+                    elif op == BINARY_SUB:
+                        b = stack.pop()
+                        a = stack[-1]
+                        try:
+                            stack[-1] = a - b
+                        except PyTypeError:
+                            raise binary_type_error('-', a, b, *_position(code_obj, pc))
+
+                    elif op == COMPARE_LT:
+                        b = stack.pop()
+                        a = stack[-1]
+                        try:
+                            stack[-1] = a < b
+                        except PyTypeError:
+                            raise binary_type_error('<', a, b, *_position(code_obj, pc))
+
+                    elif op == COMPARE_LE:
+                        b = stack.pop()
+                        a = stack[-1]
+                        try:
+                            stack[-1] = a <= b
+                        except PyTypeError:
+                            raise binary_type_error('<=', a, b, *_position(code_obj, pc))
+
+                    elif op == COMPARE_GT:
+                        b = stack.pop()
+                        a = stack[-1]
+                        try:
+                            stack[-1] = a > b
+                        except PyTypeError:
+                            raise binary_type_error('>', a, b, *_position(code_obj, pc))
+
+                    elif op == COMPARE_GE:
+                        b = stack.pop()
+                        a = stack[-1]
+                        try:
+                            stack[-1] = a >= b
+                        except PyTypeError:
+                            raise binary_type_error('>=', a, b, *_position(code_obj, pc))
+
+                    elif op == COMPARE_EQ:
+                        b = stack.pop()
+                        stack[-1] = stack[-1] == b
+
+                    elif op == COMPARE_NE:
+                        b = stack.pop()
+                        stack[-1] = stack[-1] != b
+
+                    elif op == BINARY_MUL:
+                        b = stack.pop()
+                        a = stack[-1]
+                        try:
+                            stack[-1] = a * b
+                        except PyTypeError:
+                            raise binary_type_error('*', a, b, *_position(code_obj, pc))
+
+                    elif op == BINARY_DIV:
+                        b = stack.pop()
+                        a = stack[-1]
+                        if b == 0:
+                            raise zero_division_error('/', *_position(code_obj, pc))
+                        try:
+                            stack[-1] = a / b
+                        except PyTypeError:
+                            raise binary_type_error('/', a, b, *_position(code_obj, pc))
+
+                    elif op == BINARY_MOD:
+                        b = stack.pop()
+                        a = stack[-1]
+                        if b == 0:
+                            raise zero_division_error('%', *_position(code_obj, pc))
+                        try:
+                            stack[-1] = a % b
+                        except PyTypeError:
+                            raise binary_type_error('%', a, b, *_position(code_obj, pc))
+
+                    elif op == JUMP_IF_FALSE_OR_POP:
+                        if stack[-1]:
+                            stack.pop()
+                        else:
+                            pc = arg
+
+                    elif op == JUMP_IF_TRUE_OR_POP:
+                        if stack[-1]:
+                            pc = arg
+                        else:
+                            stack.pop()
+
+                    elif op == POP:
+                        stack.pop()
+
+                    elif op == DUP:
+                        stack.append(stack[-1])
+
+                    elif op == DUP_TWO:
+                        stack.extend(stack[-2:])
+
+                    elif op == STORE_DEREF:
+                        outer = frame[0]
+                        for _ in range((arg >> 16) - 1):
+                            outer = outer[0]
+                        outer[arg & 0xFFFF] = stack.pop()
+
+                    elif op == LOAD_CELL:
+                        outer = frame
+                        for _ in range(arg >> 16):
+                            outer = outer[0]
+                        stack.append(outer[arg & 0xFFFF].value)
+
+                    elif op == STORE_CELL:
+                        outer = frame
+                        for _ in range(arg >> 16):
+                            outer = outer[0]
+                        outer[arg & 0xFFFF].value = stack.pop()
+
+                    elif op == MAKE_CELL:
+                        frame[arg] = Cell(frame[arg])
+
+                    elif op == STORE_GLOBAL:
+                        name = names[arg]
+                        if name not in gvals:
+                            raise NameError(f"Variable '{name}' is not declared", *_position(code_obj, pc))
+                        gvals[name] = stack.pop()
+
+                    elif op == DEFINE_GLOBAL:
+                        gvals[names[arg]] = stack.pop()
+
+                    elif op == GET_INDEX:
+                        index = stack.pop()
+                        array = stack[-1]
+                        if array.__class__ is list and index.__class__ is int and 0 <= index < len(array):
+                            stack[-1] = array[index]
+                        else:
+                            stack[-1] = get_index(array, index, *_position(code_obj, pc))
+
+                    elif op == GET_PROPERTY:
+                        obj = stack[-1]
+                        prop = names[arg]
+                        if obj.__class__ is dict and prop in obj:
+                            stack[-1] = obj[prop]
+                        elif obj.__class__ is EvilInstance:
+                            # Instance fields: read the value at the shape's offset / 实例字段：按布局偏移读取值
+                            index = obj.shape.fields.get(prop)
+                            value = None if index is None else obj.values[index]
+                            if value is None:
+                                value = get_property(obj, prop, *_position(code_obj, pc))
+                            stack[-1] = value
+                        else:
+                            stack[-1] = get_property(obj, prop, *_position(code_obj, pc))
+
+                    elif op == CALL or op == CALL_METHOD or op == NEW or op == CALL_SUPER:
+                        site = consts[arg]
+                        argc = site[1]
+                        if argc:
+                            args = stack[-argc:]
+                            del stack[-argc:]
+                        else:
+                            args = []
+
+                        if op == CALL:
+                            name = site[0]
+                            depth = site[2]
+                            if depth is None:
+                                func = gvals.get(name)
+                            else:
+                                func = frame
+                                for _ in range(depth):
+                                    func = func[0]
+                                func = func[site[3]]
+                                if site[4]:
+                                    func = func.value
+
+                            # User-defined function or closure / 用户定义的函数或闭包
+                            if func.__class__ is FuncRef:
+                                func_node = func.func_node
+                                if argc != len(func_node.params):
+                                    raise ValueError(
+                                        f"Function '{name}' requires {len(func_node.params)} arguments, "
+                                        f"but {argc} were given",
+                                        *_position(code_obj, pc)
+                                    )
+                                callee = [None] * func_node.frame_size
+                                callee[0] = func.lexical_scope
+                                callee[1:argc + 1] = args
+                                if func_node.cells:
+                                    wrap_cells(callee, func_node.cells)
+                                callee_code = func.code or self.code_for(func)
+                                callee_genv = func.globals or genv
+                                callee_instance = None
+
+                            # Method stored in a variable / 存储在变量中的方法
+                            elif isinstance(func, BoundMethod):
+                                stack.append(func.call(interpreter, args))
+                                continue
+
+                            # Built-in function / 内置函数
+                            elif callable(func):
+                                try:
+                                    stack.append(func(args))
+                                except EvilLangError:
+                                    raise
+                                except Exception as e:
+                                    raise RuntimeError(str(e), *_position(code_obj, pc))
+                                continue
+
+                            else:
+                                raise NameError(f"Undefined function: {name}", *_position(code_obj, pc))
+
+                        elif op == CALL_METHOD:
+                            method_name = site[0]
+                            obj = stack.pop()
+
+                            # Cache hit: switch to the method body directly / 缓存命中：直接切换到方法体
+                            entry = None
+                            if obj.__class__ is EvilInstance:
+                                entry = cached_method(site[2], obj, method_name)
+                            if entry is not None:
+                                method, owner = entry
+                                callee = owner.method_frame(method, obj, args)
+                                callee_code = bodies[method.body]
+                                callee_genv = owner.globals or genv
+                                callee_instance = None
+
+                            elif isinstance(obj, EvilInstance):
+                                if obj.has_field(method_name):
+                                    method = obj.get_field(method_name)
+                                    if method is None:
+                                        raise NameError(f"Instance has no method '{method_name}'")
+                                    if isinstance(method, BoundMethod):
+                                        stack.append(method.call(interpreter, args))
+                                        continue
+                                    raise TypeError(f"'{method_name}' is not a callable method")
+
+                                method, owner = obj.evil_class.find_method(method_name)
+                                if method is None:
+                                    raise NameError(f"Instance has no method '{method_name}'")
+                                callee = owner.method_frame(method, obj, args)
+                                callee_code = bodies[method.body]
+                                callee_genv = owner.globals or genv
+                                callee_instance = None
+
+                            elif isinstance(obj, dict) and method_name in obj:
+                                func = obj[method_name]
+                                if not isinstance(func, FuncRef):
+                                    raise TypeError(f"'{method_name}' is not a callable method")
+                                func_node = func.func_node
+                                if argc != len(func_node.params):
+                                    raise ValueError(
+                                        f"Function '{method_name}' requires {len(func_node.params)} arguments, "
+                                        f"but {argc} were given"
+                                    )
+                                callee = [None] * func_node.frame_size
+                                callee[0] = func.lexical_scope
+                                callee[1:argc + 1] = args
+                                if func_node.cells:
+                                    wrap_cells(callee, func_node.cells)
+                                callee_code = func.code or self.code_for(func)
+                                callee_genv = func.globals or genv
+                                callee_instance = None
+
+                            else:
+                                raise NameError(f"Object has no method '{method_name}'")
+
+                        elif op == NEW:
+                            class_name = site[0]
+                            evil_class = classes.get(class_name)
+                            if evil_class is None:
+                                raise NameError(f"Class '{class_name}' is not defined")
+                            obj = EvilInstance(evil_class)
+                            if evil_class.constructor is None:
+                                stack.append(obj)
+                                continue
+                            callee = evil_class.constructor_frame(obj, args)
+                            callee_code = bodies[evil_class.constructor.body]
+                            callee_genv = evil_class.globals or genv
+                            callee_instance = obj
+
+                        else:
+                            # Targets were computed when the class was declared / 目标在类声明时已计算
+                            obj = stack.pop()
+                            node = site[2]
+                            target = cached_super(node.cache, obj, node)
+                            callee = super_frame(target, obj, args)
+                            if callee is None:
+                                stack.append(None)
+                                continue
+                            method, owner = target
+                            callee_code = bodies[method.body]
+                            callee_genv = owner.globals or genv
+                            callee_instance = None
+
+                        # Switch to the callee / 切换到被调用者
+                        if len(callers) >= max_depth:
+                            raise RuntimeError("Maximum recursion depth exceeded", *_position(code_obj, pc))
+                        callers.append((code_obj, pc, frame, stack, handlers, genv, instance))
+                        code_obj = callee_code
+                        code = code_obj.code
+                        consts = code_obj.consts
+                        names = code_obj.names
+                        genv = callee_genv
+                        gvals = genv.values
+                        frame = callee
+                        instance = callee_instance
+                        pc = 0
+                        stack = []
+                        handlers = []
+
+                    elif op == RETURN_VALUE:
+                        value = stack.pop()
+                        if instance is not None:
+                            # 构造函数总是返回新实例 A constructor always yields the new instance
+                            value = instance
+                        if not callers:
+                            return value
+                        code_obj, pc, frame, stack, handlers, genv, instance = callers.pop()
+                        code = code_obj.code
+                        consts = code_obj.consts
+                        names = code_obj.names
+                        gvals = genv.values
+                        stack.append(value)
+
+                    elif op == POP_JUMP_IF_TRUE:
+                        if stack.pop():
+                            pc = arg
+
+                    elif op == UNARY_NOT:
+                        stack[-1] = not stack[-1]
+
+                    elif op == UNARY_NEG or op == UNARY_POS:
+                        value = stack[-1]
+                        try:
+                            stack[-1] = -value if op == UNARY_NEG else +value
+                        except PyTypeError:
+                            raise unary_type_error('-' if op == UNARY_NEG else '+', *_position(code_obj, pc))
+
+                    elif op == BUILD_ARRAY:
+                        if arg:
+                            elements = stack[-arg:]
+                            del stack[-arg:]
+                        else:
+                            elements = []
+                        stack.append(elements)
+
+                    elif op == BUILD_OBJECT:
+                        keys = consts[arg]
+                        count = len(keys)
+                        if count:
+                            values = stack[-count:]
+                            del stack[-count:]
+                        else:
+                            values = []
+                        stack.append(dict(zip(keys, values)))
+
+                    elif op == SET_PROPERTY:
+                        value = stack.pop()
+                        obj = stack[-1]
+                        if isinstance(obj, dict):
+                            obj[names[arg]] = value
+                        elif isinstance(obj, EvilInstance):
+                            index = obj.shape.fields.get(names[arg])
+                            if index is not None:
+                                obj.values[index] = value
+                            else:
+                                obj.set(names[arg], value)
+                        else:
+                            raise TypeError("Cannot set property on non-object type", *_position(code_obj, pc))
+                        stack[-1] = value
+
+                    elif op == CHECK_INDEX:
+                        check_index_store(stack[-2], stack[-1], *_position(code_obj, pc))
+
+                    elif op == SET_INDEX:
+                        value = stack.pop()
+                        index = stack.pop()
+                        stack[-1] = store_index(stack[-1], index, value)
+
+                    elif op == PRINT:
+                        print(stack.pop())
+
+                    elif op == INPUT:
+                        stack.append(input(stack.pop() if arg else ""))
+
+                    elif op == MAKE_FUNCTION:
+                        func_node, func_code = consts[arg]
+                        interpreter.functions[func_node.name] = func_node
+                        func_ref = FuncRef(func_node, capture(frame, func_node.captures), genv)
+                        func_ref.code = func_code
+                        stack.append(func_ref)
+
+                    elif op == MAKE_CLASS:
+                        class_node = consts[arg]
+                        superclass = None
+                        if class_node.superclass:
+                            if class_node.superclass not in classes:
+                                raise NameError(f"Superclass '{class_node.superclass}' is not defined")
+                            superclass = classes[class_node.superclass]
+                        evil_class = EvilClass(class_node.name, superclass, {}, class_node.constructor,
+                                               capture(frame, class_node.captures), genv)
+                        evil_class.declare(class_node)
+                        classes[class_node.name] = evil_class
+                        stack.append(evil_class)
+
+                    elif op == SETUP_TRY:
+                        handlers.append((arg, len(stack), frame))
+
+                    elif op == POP_TRY:
+                        handlers.pop()
+
+                    elif op == ENTER_CATCH:
+                        error = _to_exception(stack.pop())
+                        frame = new_frame(frame, arg)
+                        frame[1] = error.value
+
+                    elif op == EXIT_SCOPE:
+                        frame = frame[0]
+
+                    elif op == WRAP_EXCEPTION:
+                        stack[-1] = _to_exception(stack[-1])
+
+                    elif op == RERAISE:
+                        raise stack.pop()
+
+                    elif op == THROW:
+                        raise EvilLangException(stack.pop())
+
+                    elif op == LOAD_THIS:
+                        raise RuntimeError("'this' can only be used inside a class method")
+
+                    elif op == LOAD_SUPER:
+                        if arg:
+                            raise RuntimeError("'super' can only be used inside a class method", *_position(code_obj, pc))
+                        raise RuntimeError("'super' must be called: use super(...) or super.method(...)",
+                                           *_position(code_obj, pc))
+
+                    elif op == IMPORT:
+                        interpreter.visit_ImportStmt(consts[arg])
+
+                    elif op == EXPORT:
+                        name = names[arg]
+                        if not hasattr(interpreter, 'module_exports'):
+                            interpreter.module_exports = {}
+                        if name not in gvals:
+                            raise NameError(f"Cannot export undefined variable '{name}'")
+                        interpreter.module_exports[name] = gvals[name]
+
+                    elif op == SET_RESULT:
+                        result = stack.pop()
+
+                    elif op == RETURN_RESULT:
+                        return result
+
+                    else:
+                        raise RuntimeError(f"Unknown opcode: {op}")
+
+            except Exception as error:
+                # Unwind to the innermost handler, crossing call frames if needed
+                # 展开到最内层的异常处理器，必要时跨越调用帧
+                while True:
+                    if isinstance(error, EvilLangError) and code[pc - 2] == CALL:
+                        line, column = _position(code_obj, pc)
+                        error.add_stack_frame(consts[code[pc - 1]][0], line, column)
+                    if handlers:
+                        pc, depth, frame = handlers.pop()
+                        del stack[depth:]
+                        stack.append(error)
+                        break
+                    if not callers:
+                        raise
+                    code_obj, pc, frame, stack, handlers, genv, instance = callers.pop()
+                    code = code_obj.code
+                    consts = code_obj.consts
+                    names = code_obj.names
+                    gvals = genv.values
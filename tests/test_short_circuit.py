@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 短路求值测试 / Short-circuit Evaluation Tests
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+from src.config import Config
+from src.ast import For
+
+# 记录右操作数执行次数的辅助函数 Helpers that record how often an operand runs
+PRELUDE = """
+var calls = 0;
+
+func touch(value) {
+    calls = calls + 1;
+    return value;
+}
+
+func explode() {
+    throw "skipped operand ran";
+}
+"""
+
+# (表达式, 结果, touch 的调用次数) (expression, result, calls of touch)
+CASES = [
+    ('false && touch(true)', 'False', 0),
+    ('true || touch(false)', 'True', 0),
+    ('true && touch(false)', 'False', 1),
+    ('false || touch(true)', 'True', 1),
+    ('touch(false) && touch(true) && touch(true)', 'False', 1),
+    ('touch(false) || touch(true) || touch(true)', 'True', 2),
+    ('touch(true) && touch(true) && touch(7)', '7', 3),
+    ('0 || touch("x")', 'x', 1),
+    ('1 && 2', '2', 0),
+    ('null || 0', '0', 0),
+    ('"" && touch(1)', '', 0),
+    ('false && explode()', 'False', 0),
+    ('true || explode()', 'True', 0),
+    ('(false && touch(true)) || touch(3)', '3', 1),
+]
+
+
+def run(source, engine):
+    """Interpreter and output lines of a program run on an engine / 程序在某个引擎上运行后的解释器和输出行"""
+    interpreter = Interpreter(source, '<test>', engine=engine)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        interpreter.interpret(Parser(Lexer(source)).parse())
+    return interpreter, output.getvalue().splitlines()
+
+
+class ShortCircuitTest(unittest.TestCase):
+    """&& and || skip the right operand when the left decides, on every engine
+    当左操作数已决定结果时，&& 和 || 在每个引擎上都跳过右操作数"""
+
+    def check(self, source, expected):
+        """Run a program on every engine and return the interpreters / 在每个引擎上运行程序并返回解释器"""
+        interpreters = {}
+        for engine in Interpreter.ENGINES:
+            with self.subTest(engine=engine):
+                interpreters[engine], output = run(PRELUDE + source, engine)
+                self.assertEqual(output, expected)
+        return interpreters
+
+    def test_results_and_skipped_operands(self):
+        for expression, result, calls in CASES:
+            with self.subTest(expression=expression):
+                source = f"calls = 0;\nvar result = {expression};\nprint(result);\nprint(calls);\n"
+                self.check(source, [result, str(calls)])
+
+    def test_condition_guards(self):
+        source = """
+        var user = null;
+        if (user != null && user.name == "admin") { print("admin"); } else { print("no user"); }
+        var items = [1, 2, 3];
+        var i = 5;
+        if (i < 3 && items[i] > 0) { print("positive"); } else { print("out of range"); }
+        while (touch(false) && explode()) { print("loop"); }
+        print(calls);
+        """
+        self.check(source, ['no user', 'out of range', '1'])
+
+    def test_hot_loop(self):
+        # 足够多的迭代使tree引擎将循环编译为闭包 Enough iterations for the tree engine to compile the loop
+        iterations = Config.HOT_LOOP_THRESHOLD * 2
+        source = f"""
+        var taken = 0;
+        for (var i = 0; i < {iterations}; i = i + 1) {{
+            if (i % 2 == 0 && touch(true)) {{ taken = taken + 1; }}
+            if (i < 0 || touch(false)) {{ taken = taken + 100; }}
+            var skipped = false && explode();
+        }}
+        print(taken);
+        print(calls);
+        """
+        interpreters = self.check(source, [str(iterations // 2), str(iterations + iterations // 2)])
+
+        # tree引擎确实以编译后的形式运行了循环 The tree engine did run the loop compiled
+        compiled = interpreters['tree'].tiering.compiled
+        self.assertTrue(any(isinstance(node, For) and code is not None for node, (_, code) in compiled.items()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Evil Lang - 分层执行测试 / Tiered Execution Tests
+# Author: Evil0ctal
+# Date: 2026-10-18
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+from src.ast import BinOp
+
+# 热函数和热循环 A hot function and a hot loop
+SOURCE = """
+func f(x) {
+    return x + 1;
+}
+
+var s = 0;
+for (var i = 0; i < 300; i = i + 1) {
+    s = f(s);
+}
+var j = 0;
+while (j < 3000) {
+    j = j + 1;
+}
+print(s + j);
+"""
+
+# 上面程序中 BinOp 节点的求值次数 BinOp evaluations of the program above
+BINOPS = 301 + 300 + 300 + 3001 + 3000 + 1
+
+
+def run(interpreter):
+    """Output of SOURCE on an interpreter / 在解释器上运行SOURCE的输出"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        interpreter.interpret(Parser(Lexer(SOURCE)).parse())
+    return output.getvalue()
+
+
+class TieringTest(unittest.TestCase):
+    """Hot code is promoted unless custom visitors must see every node
+    热点代码会被提升，除非自定义访问方法需要看到每个节点"""
+
+    def test_hot_code_is_compiled(self):
+        interpreter = Interpreter(SOURCE, '<test>', engine='tree')
+        self.assertEqual(run(interpreter), "3300\n")
+        self.assertTrue(interpreter.tiering.compiled)
+
+    def test_registered_handler_sees_every_node(self):
+        interpreter = Interpreter(SOURCE, '<test>', engine='tree')
+        seen = []
+        original = interpreter.dispatch[BinOp]
+
+        def counting(node):
+            seen.append(node)
+            return original(node)
+
+        interpreter.dispatch.register(BinOp, counting)
+        self.assertEqual(run(interpreter), "3300\n")
+        self.assertEqual(len(seen), BINOPS)
+        self.assertEqual(interpreter.tiering.compiled, {})
+
+    def test_overridden_visitor_sees_every_node(self):
+        class Counting(Interpreter):
+            count = 0
+
+            def visit_BinOp(self, node):
+                Counting.count += 1
+                return super().visit_BinOp(node)
+
+        interpreter = Counting(SOURCE, '<test>', engine='tree')
+        self.assertEqual(run(interpreter), "3300\n")
+        self.assertEqual(Counting.count, BINOPS)
+        self.assertEqual(interpreter.tiering.compiled, {})
+
+
+if __name__ == '__main__':
+    unittest.main()